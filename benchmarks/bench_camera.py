@@ -0,0 +1,61 @@
+import math
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import pygame
+from py2d_game import Camera, Vector2, Vector2Array, TileMap, Sprite, Color
+
+def legacy_world_to_screen(camera, world_pos):
+    screen_pos = world_pos - camera.position
+    screen_pos = screen_pos.rotate(-camera.rotation)
+    return screen_pos * camera.zoom
+
+def trig_world_to_screen(camera, world_pos):
+    # The per-call trigonometry the camera used before caching its matrix
+    dx = world_pos.x - camera.position.x
+    dy = world_pos.y - camera.position.y
+    angle = math.radians(-camera.rotation)
+    cos_a = math.cos(angle)
+    sin_a = math.sin(angle)
+    return Vector2((dx * cos_a - dy * sin_a) * camera.zoom, (dx * sin_a + dy * cos_a) * camera.zoom)
+
+def measure(label, count, func, repeat=10):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    print(f"  {label:<34} {best * 1e6 / count:9.3f} us/call   {best * 1000:8.3f} ms")
+
+def main(count=100000):
+    camera = Camera(50, 20, zoom=1.25)
+    camera.rotation = 15
+    points = [Vector2(i % 1000, i // 1000) for i in range(count)]
+    
+    print(f"{count} points, rotated and zoomed camera")
+    measure("vector operators", count, lambda: [legacy_world_to_screen(camera, p) for p in points])
+    measure("trigonometry per call", count, lambda: [trig_world_to_screen(camera, p) for p in points])
+    measure("cached matrix", count, lambda: [camera.world_to_screen(p) for p in points])
+    try:
+        array = Vector2Array(points)
+    except ImportError:
+        print("  numpy is not installed, skipping world_to_screen_array")
+    else:
+        measure("world_to_screen_array", count, lambda: camera.world_to_screen_array(array))
+        
+    pygame.init()
+    screen = pygame.Surface((800, 600))
+    tilemap = TileMap(16, 16, 200, 200, chunk_size=8)
+    tilemap.add_tile_sprite(1, Sprite(width=16, height=16, color=Color(0, 160, 0)))
+    for x in range(200):
+        for y in range(0, 200, 2):
+            tilemap.set_tile(x, y, 1)
+    camera = Camera(400, 300)
+    tilemap.render(screen, camera)
+    measure("tile map render", 1, lambda: tilemap.render(screen, camera), repeat=50)
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
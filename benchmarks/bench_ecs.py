@@ -0,0 +1,60 @@
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import numpy as np
+from py2d_game import Scene, GameObject, Vector2, World, System, MovementSystem
+
+class WrapSystem(System):
+    components = ("position",)
+    
+    def __init__(self, width, height):
+        super().__init__(priority=10)
+        self.size = np.array((width, height), dtype=np.float64)
+        
+    def process(self, archetype, delta_time):
+        position = archetype.column("position")
+        np.mod(position, self.size, out=position)
+
+class Mover(GameObject):
+    def __init__(self, x, y, velocity):
+        super().__init__(x, y)
+        self.velocity = velocity
+        
+    def update(self, delta_time):
+        self.position.add_scaled(self.velocity, delta_time)
+        self.position.x %= 800
+        self.position.y %= 600
+
+def measure(label, count, update, frames=60):
+    update(1 / 60)
+    start = time.perf_counter()
+    for _ in range(frames):
+        update(1 / 60)
+    elapsed = (time.perf_counter() - start) * 1000.0 / frames
+    print(f"  {label:<34} {count:7d} entities {elapsed:9.3f} ms/frame  {'ok' if elapsed < 1000 / 60 else 'over'} for 60 FPS")
+
+def main(count=100000):
+    rng = np.random.default_rng(1)
+    positions = rng.uniform((0, 0), (800, 600), (count, 2))
+    velocities = rng.uniform(-100, 100, (count, 2))
+    
+    world = World()
+    world.create_entities(count, position=positions, velocity=velocities)
+    world.add_system(MovementSystem())
+    world.add_system(WrapSystem(800, 600))
+    print("Update only, no rendering")
+    measure("World + MovementSystem", count, world.update)
+    
+    legacy_count = count // 10
+    scene = Scene("Legacy")
+    for (x, y), (vx, vy) in zip(positions[:legacy_count].tolist(), velocities[:legacy_count].tolist()):
+        scene.add_object(Mover(x, y, Vector2(vx, vy)))
+    measure("Scene of GameObjects", legacy_count, scene.update)
+    scene.enable_ecs()
+    measure("Same scene through the ECS bridge", legacy_count, scene.update)
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
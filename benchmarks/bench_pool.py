@@ -0,0 +1,68 @@
+import gc
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from py2d_game import Py2DEngine, Scene, GameObject, Sprite, Color, Vector2, ObjectPool
+
+class Bullet(GameObject):
+    def __init__(self, x=0, y=0, direction=None):
+        super().__init__(x, y)
+        self.sprite = Sprite(width=4, height=8, color=Color(255, 255, 0))
+        self.direction = direction or Vector2(0, -1)
+        
+    def reset(self, x=0, y=0, direction=None):
+        super().reset(x, y)
+        self.direction = direction or Vector2(0, -1)
+        
+    def update(self, delta_time):
+        self.position.add_scaled(self.direction, 600 * delta_time)
+        if self.position.y < -10:
+            self.scene.remove_object(self)
+
+class Gun(GameObject):
+    def __init__(self, x, y, rate, pool):
+        super().__init__(x, y)
+        self.rate = rate
+        self.bullet_pool = pool
+        
+    def update(self, delta_time):
+        for i in range(self.rate):
+            x = self.position.x + i % 40 * 10
+            if self.bullet_pool is None:
+                self.scene.add_object(Bullet(x, self.position.y))
+            else:
+                self.scene.spawn(self.bullet_pool, x, self.position.y)
+
+def run(engine, pool, frames, rate):
+    scene = Scene("Bench")
+    scene.update = lambda delta_time: [obj.update(delta_time) for obj in list(scene.game_objects)]
+    scene.add_object(Gun(0, 600, rate, pool))
+    engine.scenes.clear()
+    engine.add_scene(scene)
+    engine.set_scene("Bench")
+    
+    gc.collect()
+    collections = sum(stat["collections"] for stat in gc.get_stats())
+    start = time.perf_counter()
+    engine.run_for(frames, 1 / 60)
+    elapsed = (time.perf_counter() - start) * 1000.0 / frames
+    collections = sum(stat["collections"] for stat in gc.get_stats()) - collections
+    return elapsed, collections
+
+def main(rate=40, frames=600):
+    engine = Py2DEngine(800, 600, "Pool benchmark", headless=True)
+    engine.render_enabled = False
+    print(f"{rate} bullets per frame, {frames} frames")
+    elapsed, collections = run(engine, None, frames, rate)
+    print(f"  {'new Bullet per shot':<24} {elapsed:7.3f} ms/frame  {collections:5d} GC runs")
+    pool = ObjectPool(Bullet, size=rate * 70)
+    elapsed, collections = run(engine, pool, frames, rate)
+    print(f"  {'ObjectPool':<24} {elapsed:7.3f} ms/frame  {collections:5d} GC runs")
+    stats = pool.get_stats()
+    print(f"  hit rate {stats['hit_rate']:.1%}, peak {stats['peak_in_use']} of {stats['created']} created")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 40)
@@ -0,0 +1,54 @@
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from py2d_game import Py2DEngine, Scene, GameObject, Sprite, Color
+
+def build_scene(count, textures=8):
+    scene = Scene("Bench")
+    rng = random.Random(1)
+    sprites = [Sprite(width=8, height=8, color=Color(rng.randrange(256), 128, 64)) for _ in range(textures)]
+    for i in range(count):
+        obj = GameObject(rng.uniform(0, 800), rng.uniform(0, 600))
+        obj.sprite = sprites[i % textures]
+        scene.add_object(obj)
+    return scene
+
+class NullSurface:
+    # Accepts draw calls without touching pixels, leaving only the Python overhead
+    def fill(self, *args):
+        pass
+        
+    def blit(self, *args):
+        pass
+        
+    def blits(self, *args):
+        pass
+
+def time_render(scene, screen, frames):
+    scene.render(screen)
+    best = float("inf")
+    for _ in range(frames):
+        start = time.perf_counter()
+        scene.render(screen)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000.0
+
+def main(count=10000, frames=30):
+    engine = Py2DEngine(800, 600, "Render benchmark", headless=True)
+    scene = build_scene(count)
+    
+    print(f"{count} sprites, best of {frames} frames")
+    for label, screen in (("drawing", engine.screen), ("python only", NullSurface())):
+        scene.batch_rendering = False
+        immediate = time_render(scene, screen, frames)
+        scene.batch_rendering = True
+        batched = time_render(scene, screen, frames)
+        print(f"  {label:<12} per-object blit {immediate:8.3f} ms   Surface.blits {batched:8.3f} ms   "
+              f"({immediate / batched:.2f}x)")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
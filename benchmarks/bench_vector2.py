@@ -0,0 +1,82 @@
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from py2d_game import Py2DEngine, Scene, GameObject, Sprite, Color, Camera, Vector2
+
+@contextmanager
+def count_vectors():
+    # Every Vector2 (and subclass) allocation goes through __init__
+    counter = [0]
+    original = Vector2.__init__
+    
+    def counting_init(self, *args, **kwargs):
+        counter[0] += 1
+        original(self, *args, **kwargs)
+        
+    Vector2.__init__ = counting_init
+    try:
+        yield counter
+    finally:
+        Vector2.__init__ = original
+
+def legacy_world_to_screen(camera, world_pos):
+    screen_pos = world_pos - camera.position
+    screen_pos = screen_pos.rotate(-camera.rotation)
+    return screen_pos * camera.zoom
+
+def legacy_move(obj, direction, speed, delta_time):
+    # What `obj.position += direction * speed * delta_time` did without __iadd__
+    obj.position = obj.position + direction * speed * delta_time
+
+def fused_move(obj, direction, speed, delta_time):
+    obj.position.add_scaled(direction, speed * delta_time)
+
+class Mover(GameObject):
+    def __init__(self, x, y, sprite):
+        super().__init__(x, y)
+        self.sprite = sprite
+        self.direction = Vector2(1, 0.5)
+        
+    def update(self, delta_time):
+        self.position.add_scaled(self.direction, 60 * delta_time)
+
+def measure(label, count, func):
+    with count_vectors() as counter:
+        func()
+    allocations = counter[0]
+    start = time.perf_counter()
+    func()
+    elapsed = (time.perf_counter() - start) * 1000.0
+    print(f"  {label:<36} {allocations / count:5.1f} Vector2/object   {elapsed:8.3f} ms")
+
+def main(count=10000):
+    engine = Py2DEngine(800, 600, "Vector2 benchmark", headless=True)
+    camera = Camera(50, 20)
+    camera.rotation = 15
+    objects = [GameObject(i % 800, i // 800) for i in range(count)]
+    direction = Vector2(1, 0.5)
+    
+    print(f"{count} objects, one frame")
+    measure("move: position + v * speed * dt", count,
+            lambda: [legacy_move(obj, direction, 200, 1 / 60) for obj in objects])
+    measure("move: position.add_scaled(v, s)", count,
+            lambda: [fused_move(obj, direction, 200, 1 / 60) for obj in objects])
+    measure("world_to_screen: vector operators", count,
+            lambda: [legacy_world_to_screen(camera, obj.position) for obj in objects])
+    measure("world_to_screen: Camera", count,
+            lambda: [camera.world_to_screen(obj.position) for obj in objects])
+    
+    scene = Scene("Bench")
+    sprite = Sprite(width=8, height=8, color=Color(255, 128, 0))
+    for i in range(count):
+        scene.add_object(Mover(i % 800, i // 800 % 600, sprite))
+    engine.add_scene(scene)
+    engine.set_scene("Bench")
+    measure("engine frame (update + render)", count, lambda: engine.step(1 / 60))
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
@@ -34,7 +34,7 @@ class Player(GameObject):
             self.rigid_body.velocity.y = -self.jump_force
             self.on_ground = False
             
-        self.position += self.rigid_body.velocity * delta_time
+        self.position.add_scaled(self.rigid_body.velocity, delta_time)
         
         if self.position.x < 12:
             self.position.x = 12
@@ -12,7 +12,7 @@ class Player(GameObject):
         input_manager = self.scene.game_engine.input_manager
         movement = input_manager.get_movement_vector()
         
-        self.position += movement * self.speed * delta_time
+        self.position.add_scaled(movement, self.speed * delta_time)
         
         if self.position.x < 16:
             self.position.x = 16
@@ -34,7 +34,7 @@ class Enemy(GameObject):
     def update(self, delta_time):
         super().update(delta_time)
         
-        self.position += self.direction * self.speed * delta_time
+        self.position.add_scaled(self.direction, self.speed * delta_time)
         
         if self.position.x <= 12 or self.position.x >= 788:
             self.direction.x *= -1
@@ -1,10 +1,11 @@
-from py2d_game import Py2DEngine, GameObject, Scene, Sprite, Color, Vector2, Animation, AudioManager
+from py2d_game import Py2DEngine, GameObject, Scene, Sprite, Color, Vector2, Animation, AudioManager, ObjectPool
 import random
 import pygame
 
 class Player(GameObject):
-    def __init__(self, x, y):
+    def __init__(self, x, y, bullet_pool):
         super().__init__(x, y)
+        self.bullet_pool = bullet_pool
         self.sprite = Sprite(width=40, height=40, color=Color(0, 255, 255))
         self.speed = 300
         self.shoot_timer = 0
@@ -40,27 +41,32 @@ class Player(GameObject):
             self.shoot_timer = 0
 
     def shoot(self):
-        bullet = Bullet(self.position.x, self.position.y - 20, Vector2(0, -1))
-        self.scene.add_object(bullet)
+        # Bullets come back to the pool when the scene removes them
+        self.scene.spawn(self.bullet_pool, self.position.x, self.position.y - 20, Vector2(0, -1))
 
 class Bullet(GameObject):
-    def __init__(self, x, y, direction):
+    def __init__(self, x=0, y=0, direction=None):
         super().__init__(x, y)
         self.sprite = Sprite(width=4, height=8, color=Color(255, 255, 0))
-        self.direction = direction
+        self.direction = direction or Vector2(0, -1)
         self.speed = 500
         
+    def reset(self, x=0, y=0, direction=None):
+        super().reset(x, y)
+        self.direction = direction or Vector2(0, -1)
+        
     def update(self, delta_time):
         super().update(delta_time)
-        self.position += self.direction * self.speed * delta_time
+        self.position.add_scaled(self.direction, self.speed * delta_time)
         
         if (self.position.y < -10 or self.position.y > 610 or 
             self.position.x < -10 or self.position.x > 810):
             self.scene.remove_object(self)
 
 class Enemy(GameObject):
-    def __init__(self, x, y):
+    def __init__(self, x, y, bullet_pool):
         super().__init__(x, y)
+        self.bullet_pool = bullet_pool
         self.sprite = Sprite(width=30, height=30, color=Color(255, 0, 0))
         self.speed = random.uniform(50, 150)
         self.shoot_timer = 0
@@ -79,19 +85,22 @@ class Enemy(GameObject):
             self.scene.remove_object(self)
 
     def shoot(self):
-        bullet = EnemyBullet(self.position.x, self.position.y + 20, Vector2(0, 1))
-        self.scene.add_object(bullet)
+        self.scene.spawn(self.bullet_pool, self.position.x, self.position.y + 20, Vector2(0, 1))
 
 class EnemyBullet(GameObject):
-    def __init__(self, x, y, direction):
+    def __init__(self, x=0, y=0, direction=None):
         super().__init__(x, y)
         self.sprite = Sprite(width=4, height=8, color=Color(255, 100, 100))
-        self.direction = direction
+        self.direction = direction or Vector2(0, 1)
         self.speed = 300
         
+    def reset(self, x=0, y=0, direction=None):
+        super().reset(x, y)
+        self.direction = direction or Vector2(0, 1)
+        
     def update(self, delta_time):
         super().update(delta_time)
-        self.position += self.direction * self.speed * delta_time
+        self.position.add_scaled(self.direction, self.speed * delta_time)
         
         if (self.position.y < -10 or self.position.y > 610 or 
             self.position.x < -10 or self.position.x > 810):
@@ -129,7 +138,10 @@ def main():
     
     star_field = StarField(800, 600)
     
-    player = Player(400, 500)
+    bullet_pool = ObjectPool(Bullet, size=32)
+    enemy_bullet_pool = ObjectPool(EnemyBullet, size=64)
+    
+    player = Player(400, 500, bullet_pool)
     scene.add_object(player)
     
     enemy_spawn_timer = 0
@@ -138,13 +150,13 @@ def main():
     def update_scene(delta_time):
         nonlocal enemy_spawn_timer, enemy_spawn_cooldown
         
-        for obj in scene.game_objects:
+        for obj in list(scene.game_objects):
             obj.update(delta_time)
         star_field.update(delta_time)
         
         enemy_spawn_timer += delta_time
         if enemy_spawn_timer >= enemy_spawn_cooldown:
-            enemy = Enemy(random.uniform(50, 750), -30)
+            enemy = Enemy(random.uniform(50, 750), -30, enemy_bullet_pool)
             scene.add_object(enemy)
             enemy_spawn_timer = 0
             enemy_spawn_cooldown = random.uniform(0.5, 2.0)
@@ -1,10 +1,15 @@
-from .core import Py2DEngine, GameObject, Scene, Camera
-from .graphics import Sprite, Animation, Text, Shape, TileMap
+from .core import Py2DEngine, GameObject, Scene, Camera, ObjectPool
+from .graphics import Sprite, Animation, Text, Shape, TileMap, TransformCache, RotationAtlas
 from .input import InputManager
 from .audio import AudioManager
-from .physics import Physics2D, Collider2D, RigidBody2D
-from .utils import Vector2, Color, Timer, Math2D
+from .atlas import SkylinePacker, TextureAtlas
+from .tiles import TileStorage, DictTileStorage, DenseTileStorage, ChunkedTileStorage, MemoryMappedTileStorage
+from .assets import AssetRegistry, AssetManifest, AssetPreloader, asset_registry
+from .physics import Physics2D, Collider2D, RigidBody2D, RigidBodyBatch, BroadPhase, BruteForceBroadPhase, SpatialHashBroadPhase, SweepAndPruneBroadPhase, TileCollisionLayer
+from .utils import Vector2, Vector2Array, Color, Timer, Math2D, SpatialHash
 from .ui import Button, Label, Panel, UIElement
+from .profiler import FrameProfiler, ObjectProfiler
+from .ecs import World, Component, Archetype, System, MovementSystem, SpriteRenderSystem, GameObjectSystem, TransformSyncSystem
 
 __version__ = "1.0.0-beta"
 __author__ = "En-Hussain"
@@ -15,22 +20,54 @@ __all__ = [
     "GameObject", 
     "Scene",
     "Camera",
+    "ObjectPool",
     "Sprite",
     "Animation",
     "Text",
     "Shape",
     "TileMap",
+    "TransformCache",
+    "RotationAtlas",
+    "SkylinePacker",
+    "TextureAtlas",
+    "TileStorage",
+    "DictTileStorage",
+    "DenseTileStorage",
+    "ChunkedTileStorage",
+    "MemoryMappedTileStorage",
     "InputManager",
     "AudioManager", 
+    "AssetRegistry",
+    "AssetManifest",
+    "AssetPreloader",
+    "asset_registry",
     "Physics2D",
     "Collider2D",
     "RigidBody2D",
+    "RigidBodyBatch",
+    "BroadPhase",
+    "BruteForceBroadPhase",
+    "SpatialHashBroadPhase",
+    "SweepAndPruneBroadPhase",
+    "TileCollisionLayer",
     "Vector2",
+    "Vector2Array",
     "Color",
     "Timer",
     "Math2D",
+    "SpatialHash",
     "Button",
     "Label", 
     "Panel",
-    "UIElement"
+    "UIElement",
+    "FrameProfiler",
+    "ObjectProfiler",
+    "World",
+    "Component",
+    "Archetype",
+    "System",
+    "MovementSystem",
+    "SpriteRenderSystem",
+    "GameObjectSystem",
+    "TransformSyncSystem"
 ]
@@ -0,0 +1,215 @@
+import io
+import json
+import os
+import queue
+import pygame
+from concurrent.futures import Future, ThreadPoolExecutor
+from time import perf_counter, sleep
+from typing import Dict, List, Optional
+
+class AssetRegistry:
+    def __init__(self):
+        self.images: Dict[str, pygame.Surface] = {}
+        self.ref_counts: Dict[str, int] = {}
+        self.loads = 0
+        self.hits = 0
+        self.unloads = 0
+        
+    def normalize_path(self, path: str) -> str:
+        return os.path.normcase(os.path.abspath(path))
+        
+    def acquire_image(self, path: str) -> pygame.Surface:
+        key = self.normalize_path(path)
+        surface = self.images.get(key)
+        if surface is None:
+            surface = pygame.image.load(path).convert_alpha()
+            self.images[key] = surface
+            self.loads += 1
+        else:
+            self.hits += 1
+        self.ref_counts[key] = self.ref_counts.get(key, 0) + 1
+        return surface
+        
+    def add_image(self, path: str, surface: pygame.Surface):
+        key = self.normalize_path(path)
+        self.images[key] = surface
+        self.ref_counts.setdefault(key, 0)
+        
+    def release_image(self, path: str):
+        key = self.normalize_path(path)
+        count = self.ref_counts.get(key)
+        if count is None:
+            return
+        if count > 1:
+            self.ref_counts[key] = count - 1
+            return
+        del self.ref_counts[key]
+        del self.images[key]
+        self.unloads += 1
+        
+    def is_loaded(self, path: str) -> bool:
+        return self.normalize_path(path) in self.images
+        
+    def get_ref_count(self, path: str) -> int:
+        return self.ref_counts.get(self.normalize_path(path), 0)
+        
+    def unload_unused(self) -> int:
+        unused = [key for key, count in self.ref_counts.items() if count == 0]
+        for key in unused:
+            del self.ref_counts[key]
+            del self.images[key]
+        self.unloads += len(unused)
+        return len(unused)
+        
+    def clear(self):
+        self.images.clear()
+        self.ref_counts.clear()
+        
+    def get_stats(self) -> dict:
+        image_bytes = 0
+        for surface in self.images.values():
+            image_bytes += surface.get_width() * surface.get_height() * surface.get_bytesize()
+        return {
+            "images": len(self.images),
+            "references": sum(self.ref_counts.values()),
+            "bytes": image_bytes,
+            "loads": self.loads,
+            "hits": self.hits,
+            "unloads": self.unloads,
+        }
+
+asset_registry = AssetRegistry()
+
+class AssetManifest:
+    def __init__(self, images: Optional[List[str]] = None, sounds: Optional[Dict[str, str]] = None):
+        self.images: List[str] = list(images or [])
+        self.sounds: Dict[str, str] = dict(sounds or {})
+        
+    @classmethod
+    def from_file(cls, path: str) -> 'AssetManifest':
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        base = os.path.dirname(path)
+        images = [os.path.join(base, image) for image in data.get("images", [])]
+        sounds = {name: os.path.join(base, sound) for name, sound in data.get("sounds", {}).items()}
+        return cls(images, sounds)
+        
+    def add_image(self, path: str):
+        self.images.append(path)
+        
+    def add_sound(self, name: str, path: str):
+        self.sounds[name] = path
+        
+    def __len__(self) -> int:
+        return len(self.images) + len(self.sounds)
+
+class AssetPreloader:
+    def __init__(self, manifest: AssetManifest, registry: Optional[AssetRegistry] = None,
+                 audio_manager=None, max_workers: int = 4):
+        self.manifest = manifest
+        self.registry = registry or asset_registry
+        self.audio_manager = audio_manager
+        self.max_workers = max_workers
+        self.future: Future = Future()
+        self.errors: Dict[str, Exception] = {}
+        self.total = len(manifest)
+        self.completed = 0
+        self._pinned: List[str] = []
+        self._results: queue.Queue = queue.Queue()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        
+    @property
+    def progress(self) -> float:
+        if self.total == 0:
+            return 1.0
+        return self.completed / self.total
+        
+    @property
+    def is_done(self) -> bool:
+        return self.future.done()
+        
+    def start(self) -> Future:
+        if self._executor is not None or self.future.done():
+            return self.future
+            
+        sounds_enabled = self.audio_manager is not None and getattr(self.audio_manager, "enabled", True)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="py2d-preload")
+        for path in self.manifest.images:
+            if self.registry.is_loaded(path):
+                self._results.put(("image", path, None, None))
+            else:
+                self._executor.submit(self._decode_image, path)
+        for name, path in self.manifest.sounds.items():
+            if sounds_enabled:
+                self._executor.submit(self._decode_sound, name, path)
+            else:
+                self._results.put(("skip", name, None, None))
+        self._finish_if_complete()
+        return self.future
+        
+    def _decode_image(self, path: str):
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            surface = pygame.image.load(io.BytesIO(data), path)
+            self._results.put(("image", path, surface, None))
+        except Exception as e:
+            self._results.put(("image", path, None, e))
+            
+    def _decode_sound(self, name: str, path: str):
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            sound = pygame.mixer.Sound(file=io.BytesIO(data))
+            self._results.put(("sound", name, sound, None))
+        except Exception as e:
+            self._results.put(("sound", name, None, e))
+            
+    def poll(self, time_budget: Optional[float] = None) -> int:
+        # Surface conversion needs the display, so it happens here on the main thread
+        deadline = perf_counter() + time_budget if time_budget is not None else None
+        finished = 0
+        while deadline is None or perf_counter() < deadline:
+            try:
+                kind, key, payload, error = self._results.get_nowait()
+            except queue.Empty:
+                break
+                
+            if error is not None:
+                self.errors[key] = error
+            elif kind == "image":
+                if payload is not None:
+                    self.registry.add_image(key, payload.convert_alpha())
+                self.registry.acquire_image(key)
+                self._pinned.append(key)
+            elif kind == "sound":
+                self.audio_manager.sounds[key] = payload
+                
+            self.completed += 1
+            finished += 1
+            
+        self._finish_if_complete()
+        return finished
+        
+    def _finish_if_complete(self):
+        if self.completed < self.total or self.future.done():
+            return
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        self.future.set_result(self)
+        
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        self.start()
+        deadline = perf_counter() + timeout if timeout is not None else None
+        while not self.future.done():
+            if deadline is not None and perf_counter() >= deadline:
+                return False
+            if not self.poll():
+                sleep(0.002)
+        return True
+        
+    def release(self):
+        for path in self._pinned:
+            self.registry.release_image(path)
+        self._pinned.clear()
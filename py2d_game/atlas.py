@@ -0,0 +1,165 @@
+import json
+import os
+import pygame
+from typing import Dict, List, Optional, Tuple
+from .graphics import Sprite
+
+class SkylinePacker:
+    def __init__(self, width: int, height: int, padding: int = 1):
+        self.width = width
+        self.height = height
+        self.padding = padding
+        self.skyline: List[List[int]] = [[0, 0, width]]
+        
+    def _fit(self, index: int, width: int, height: int) -> Optional[int]:
+        x = self.skyline[index][0]
+        if x + width > self.width:
+            return None
+        remaining = width
+        y = 0
+        while remaining > 0:
+            if index >= len(self.skyline):
+                return None
+            segment = self.skyline[index]
+            y = max(y, segment[1])
+            if y + height > self.height:
+                return None
+            remaining -= segment[2]
+            index += 1
+        return y
+        
+    def insert(self, width: int, height: int) -> Optional[Tuple[int, int]]:
+        padded_width = width + self.padding
+        padded_height = height + self.padding
+        best = None
+        for index, segment in enumerate(self.skyline):
+            y = self._fit(index, padded_width, padded_height)
+            if y is None:
+                continue
+            score = (y + padded_height, segment[2])
+            if best is None or score < best[0]:
+                best = (score, index, segment[0], y)
+        if best is None:
+            return None
+            
+        _, index, x, y = best
+        self._add_level(index, x, y + padded_height, padded_width)
+        return (x, y)
+        
+    def _add_level(self, index: int, x: int, y: int, width: int):
+        skyline = self.skyline
+        skyline.insert(index, [x, y, width])
+        
+        # Trim the segments now covered by the new one
+        right = x + width
+        i = index + 1
+        while i < len(skyline):
+            segment = skyline[i]
+            if segment[0] >= right:
+                break
+            shrink = right - segment[0]
+            segment[0] += shrink
+            segment[2] -= shrink
+            if segment[2] <= 0:
+                del skyline[i]
+            else:
+                break
+                
+        i = 0
+        while i < len(skyline) - 1:
+            if skyline[i][1] == skyline[i + 1][1]:
+                skyline[i][2] += skyline[i + 1][2]
+                del skyline[i + 1]
+            else:
+                i += 1
+
+class TextureAtlas:
+    def __init__(self, surface: pygame.Surface, regions: Dict[str, pygame.Rect]):
+        self.surface = surface
+        self.regions = regions
+        self._subsurfaces: Dict[str, pygame.Surface] = {}
+        
+    @classmethod
+    def build(cls, images: Dict[str, pygame.Surface], max_size: int = 4096, padding: int = 1) -> 'TextureAtlas':
+        order = sorted(images, key=lambda name: (images[name].get_height(), images[name].get_width()), reverse=True)
+        area = sum((image.get_width() + padding) * (image.get_height() + padding) for image in images.values())
+        widest = max([image.get_width() + padding for image in images.values()] or [1])
+        tallest = max([image.get_height() + padding for image in images.values()] or [1])
+        
+        width = height = 1
+        while width < widest:
+            width *= 2
+        while height < tallest:
+            height *= 2
+        while width * height < area:
+            if width <= height:
+                width *= 2
+            else:
+                height *= 2
+            
+        while width <= max_size and height <= max_size:
+            packer = SkylinePacker(width, height, padding)
+            regions = {}
+            for name in order:
+                image = images[name]
+                position = packer.insert(image.get_width(), image.get_height())
+                if position is None:
+                    break
+                regions[name] = pygame.Rect(position[0], position[1], image.get_width(), image.get_height())
+            else:
+                surface = pygame.Surface((width, height), pygame.SRCALPHA)
+                for name, rect in regions.items():
+                    surface.blit(images[name], rect.topleft)
+                return cls(surface, regions)
+                
+            if width <= height:
+                width *= 2
+            else:
+                height *= 2
+                
+        raise ValueError(f"Images do not fit in a {max_size}x{max_size} atlas")
+        
+    @classmethod
+    def from_files(cls, paths: List[str], max_size: int = 4096, padding: int = 1) -> 'TextureAtlas':
+        images = {}
+        for path in paths:
+            name = os.path.splitext(os.path.basename(path))[0]
+            if name in images:
+                raise ValueError(f"Duplicate atlas region name {name!r} from {path}")
+            images[name] = pygame.image.load(path)
+        return cls.build(images, max_size, padding)
+        
+    def get_surface(self, name: str) -> pygame.Surface:
+        surface = self._subsurfaces.get(name)
+        if surface is None:
+            surface = self.surface.subsurface(self.regions[name])
+            self._subsurfaces[name] = surface
+        return surface
+        
+    def get_sprite(self, name: str) -> Sprite:
+        return Sprite(image=self.get_surface(name))
+        
+    def get_frames(self, names: List[str]) -> List[pygame.Surface]:
+        return [self.get_surface(name) for name in names]
+        
+    def save(self, image_path: str, meta_path: Optional[str] = None):
+        meta_path = meta_path or os.path.splitext(image_path)[0] + ".json"
+        pygame.image.save(self.surface, image_path)
+        meta = {
+            "image": os.path.relpath(image_path, os.path.dirname(os.path.abspath(meta_path))),
+            "size": [self.surface.get_width(), self.surface.get_height()],
+            "regions": {name: [rect.x, rect.y, rect.width, rect.height] for name, rect in self.regions.items()},
+        }
+        with open(meta_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f, indent=2)
+            
+    @classmethod
+    def load(cls, meta_path: str) -> 'TextureAtlas':
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        image_path = os.path.join(os.path.dirname(os.path.abspath(meta_path)), meta["image"])
+        surface = pygame.image.load(image_path)
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert_alpha()
+        regions = {name: pygame.Rect(*rect) for name, rect in meta["regions"].items()}
+        return cls(surface, regions)
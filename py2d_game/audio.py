@@ -3,13 +3,17 @@ import os
 from typing import Dict, Optional
 
 class AudioManager:
-    def __init__(self):
-        pygame.mixer.init(frequency=22050, size=-16, channels=2, buffer=512)
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        if enabled:
+            pygame.mixer.init(frequency=22050, size=-16, channels=2, buffer=512)
         self.sounds: Dict[str, pygame.mixer.Sound] = {}
         self.music_volume = 0.7
         self.sound_volume = 0.7
         
     def load_sound(self, name: str, file_path: str):
+        if not self.enabled:
+            return
         try:
             if os.path.exists(file_path):
                 self.sounds[name] = pygame.mixer.Sound(file_path)
@@ -19,6 +23,8 @@ class AudioManager:
             print(f"Error loading sound {name}: {e}")
             
     def play_sound(self, name: str, volume: float = 1.0):
+        if not self.enabled:
+            return
         if name in self.sounds:
             sound = self.sounds[name]
             sound.set_volume(self.sound_volume * volume)
@@ -31,9 +37,12 @@ class AudioManager:
             self.sounds[name].stop()
             
     def stop_all_sounds(self):
-        pygame.mixer.stop()
+        if self.enabled:
+            pygame.mixer.stop()
         
     def load_music(self, file_path: str):
+        if not self.enabled:
+            return
         try:
             if os.path.exists(file_path):
                 pygame.mixer.music.load(file_path)
@@ -43,27 +52,33 @@ class AudioManager:
             print(f"Error loading music: {e}")
             
     def play_music(self, loop: int = -1, fade_in: int = 0):
+        if not self.enabled:
+            return
         pygame.mixer.music.set_volume(self.music_volume)
         pygame.mixer.music.play(loop, fade_ms=fade_in)
         
     def stop_music(self, fade_out: int = 0):
-        pygame.mixer.music.fadeout(fade_out)
+        if self.enabled:
+            pygame.mixer.music.fadeout(fade_out)
         
     def pause_music(self):
-        pygame.mixer.music.pause()
+        if self.enabled:
+            pygame.mixer.music.pause()
         
     def unpause_music(self):
-        pygame.mixer.music.unpause()
+        if self.enabled:
+            pygame.mixer.music.unpause()
         
     def set_music_volume(self, volume: float):
         self.music_volume = max(0.0, min(1.0, volume))
-        pygame.mixer.music.set_volume(self.music_volume)
+        if self.enabled:
+            pygame.mixer.music.set_volume(self.music_volume)
         
     def set_sound_volume(self, volume: float):
         self.sound_volume = max(0.0, min(1.0, volume))
         
     def is_music_playing(self) -> bool:
-        return pygame.mixer.music.get_busy()
+        return self.enabled and pygame.mixer.music.get_busy()
         
     def get_music_volume(self) -> float:
         return self.music_volume
@@ -7,6 +7,7 @@ def main():
     parser.add_argument("--version", action="version", version="Py2D 1.0.0")
     parser.add_argument("--create-project", type=str, help="إنشاء مشروع جديد")
     parser.add_argument("--run-example", type=str, help="تشغيل مثال")
+    parser.add_argument("--pack-atlas", nargs=2, metavar=("IMAGES_DIR", "OUTPUT_PNG"), help="حزم الصور في أطلس نسيج")
     
     args = parser.parse_args()
     
@@ -14,6 +15,8 @@ def main():
         create_project(args.create_project)
     elif args.run_example:
         run_example(args.run_example)
+    elif args.pack_atlas:
+        pack_atlas(*args.pack_atlas)
     else:
         print("Py2D - مكتبة Python للألعاب ثنائية الأبعاد")
         print("استخدم --help لرؤية الخيارات المتاحة")
@@ -42,7 +45,7 @@ class Player(GameObject):
         
         input_manager = self.scene.game_engine.input_manager
         movement = input_manager.get_movement_vector()
-        self.position += movement * self.speed * delta_time
+        self.position.add_scaled(movement, self.speed * delta_time)
 
 def main():
     engine = Py2DEngine(800, 600, "لعبتي الجديدة")
@@ -91,5 +94,26 @@ def run_example(example_name):
     print(f"تشغيل المثال: {example_name}")
     os.system(f"python {example_file}")
 
+def pack_atlas(images_dir, output_path):
+    """حزم الصور في أطلس نسيج"""
+    from .atlas import TextureAtlas
+    
+    if not os.path.isdir(images_dir):
+        print(f"المجلد '{images_dir}' غير موجود!")
+        return
+        
+    paths = sorted(
+        os.path.join(images_dir, name) for name in os.listdir(images_dir)
+        if name.lower().endswith((".png", ".bmp", ".jpg", ".jpeg", ".gif", ".tga"))
+    )
+    if not paths:
+        print(f"لا توجد صور في المجلد '{images_dir}'")
+        return
+        
+    atlas = TextureAtlas.from_files(paths)
+    atlas.save(output_path)
+    width, height = atlas.surface.get_size()
+    print(f"تم حزم {len(paths)} صورة في '{output_path}' ({width}x{height})")
+
 if __name__ == "__main__":
     main()
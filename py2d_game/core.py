@@ -1,10 +1,15 @@
+import math
+import os
 import pygame
 import sys
-from typing import List, Optional, Callable
-from .utils import Vector2, Color
+from time import perf_counter
+from typing import List, Optional, Callable, Tuple
+from .utils import Vector2, Vector2Array, Color, SpatialHash
 from .graphics import Sprite
 from .input import InputManager
 from .audio import AudioManager
+from .profiler import FrameProfiler, ObjectProfiler
+from .ecs import World, GameObjectSystem, TransformSyncSystem
 
 class GameObject:
     def __init__(self, x: float = 0, y: float = 0):
@@ -16,6 +21,55 @@ class GameObject:
         self.sprite: Optional[Sprite] = None
         self.children: List[GameObject] = []
         self.parent: Optional[GameObject] = None
+        self.previous_position: Optional[Vector2] = None
+        self.previous_rotation = 0.0
+        self.layer = 0
+        self.static = False
+        self.screen_bounds: Optional[pygame.Rect] = None
+        self.previous_screen_bounds: Optional[pygame.Rect] = None
+        self.dirty = True
+        self._screen_key = None
+        self.entity: Optional[int] = None
+        self.pool: Optional['ObjectPool'] = None
+        self._in_pool = False
+        self._initial_state = None
+        
+    def reset(self, x: float = 0, y: float = 0):
+        # Called when a pool hands the object out again; subclasses reset their own fields too
+        if self._initial_state is not None:
+            # Only pooled objects have a snapshot of how they were created; others keep their hierarchy
+            layer, static, children = self._initial_state
+            for child in self.children:
+                if child not in children:
+                    child.parent = None
+            self.children = list(children)
+            for child in self.children:
+                child.parent = self
+            self.parent = None
+            self.layer = layer
+            self.static = static
+            
+        # Physics bodies keep no momentum or swept tile position from the previous use
+        rigid_body = getattr(self, 'rigid_body', None)
+        if rigid_body is not None:
+            rigid_body.reset()
+        collider = getattr(self, 'collider', None)
+        if collider is not None:
+            collider.tile_position = None
+        if hasattr(self, 'on_ground'):
+            self.on_ground = False
+            
+        self.position.set(x, y)
+        self.rotation = 0.0
+        self.scale.set(1.0, 1.0)
+        self.visible = True
+        self.active = True
+        self.previous_position = None
+        self.previous_rotation = 0.0
+        self.screen_bounds = None
+        self.previous_screen_bounds = None
+        self.dirty = True
+        self._screen_key = None
         
     def add_child(self, child: 'GameObject'):
         child.parent = self
@@ -43,28 +97,259 @@ class GameObject:
         for child in self.children:
             child.render(screen, camera)
             
+    def collect_render(self, buckets: dict, camera, immediate: list):
+        if not self.visible or not self.active:
+            return
+            
+        # Objects with their own render() can't be expressed as blits
+        if type(self).render is not GameObject.render:
+            immediate.append(self)
+            return
+            
+        sprite = self.sprite
+        if sprite and hasattr(sprite, "get_blit"):
+            blit = sprite.get_blit(self.position, self.rotation, self.scale, camera)
+            if blit:
+                bucket = buckets.get(self.layer)
+                if bucket is None:
+                    bucket = buckets[self.layer] = []
+                bucket.append(blit)
+                
+        for child in self.children:
+            child.collect_render(buckets, camera, immediate)
+            
+    def get_render_extent(self) -> Optional[Tuple[float, float]]:
+        sprite = self.sprite
+        if (sprite is None or self.children or not hasattr(sprite, "get_blit")
+                or type(self).render is not GameObject.render):
+            return None
+            
+        width = sprite.width * abs(self.scale.x)
+        height = sprite.height * abs(self.scale.y)
+        if self.rotation % 360 == 0:
+            return (width / 2 + 1, height / 2 + 1)
+            
+        rotation = self.rotation
+        atlas = getattr(sprite, "rotation_atlas", None)
+        if atlas is not None and self.scale.x == 1 and self.scale.y == 1:
+            # The atlas draws the nearest pre-rotated frame
+            rotation = atlas.frame_index(rotation) * atlas.angle_step
+        angle = math.radians(rotation)
+        cos_a = abs(math.cos(angle))
+        sin_a = abs(math.sin(angle))
+        rotated_width = math.ceil(width * cos_a + height * sin_a)
+        rotated_height = math.ceil(width * sin_a + height * cos_a)
+        # The rotated image is still offset by half the unrotated size, so it can reach further on either side
+        return (max(width / 2, rotated_width - width / 2) + 1,
+                max(height / 2, rotated_height - height / 2) + 1)
+        
+    def get_screen_bounds(self, camera) -> Optional[pygame.Rect]:
+        # None means the area can't be known, e.g. a custom render()
+        if type(self).render is not GameObject.render:
+            return None
+            
+        bounds = pygame.Rect(0, 0, 0, 0)
+        sprite = self.sprite
+        if sprite and hasattr(sprite, "get_blit"):
+            blit = sprite.get_blit(self.position, self.rotation, self.scale, camera)
+            if blit:
+                surface, (x, y) = blit
+                # One pixel of slack for blit positions that pygame truncates
+                bounds = pygame.Rect(math.floor(x), math.floor(y), surface.get_width() + 1, surface.get_height() + 1)
+                
+        for child in self.children:
+            if not child.visible or not child.active:
+                continue
+            child_bounds = child.get_screen_bounds(camera)
+            if child_bounds is None:
+                return None
+            if child_bounds.width and child_bounds.height:
+                bounds = child_bounds if not (bounds.width and bounds.height) else bounds.union(child_bounds)
+        return bounds
+        
+    def mark_dirty(self):
+        self.dirty = True
+        if hasattr(self.sprite, "mark_dirty"):
+            self.sprite.mark_dirty()
+        
+    def has_pending_activity(self) -> bool:
+        # Subclasses with their own update() are assumed busy unless they say otherwise
+        if not self.active:
+            return False
+        if type(self).update is not GameObject.update:
+            return True
+        return any(child.has_pending_activity() for child in self.children)
+        
     def get_world_position(self) -> Vector2:
         if self.parent:
             return self.parent.get_world_position() + self.position
         return self.position
+        
+    def save_state(self):
+        if self.previous_position is None:
+            self.previous_position = Vector2(self.position.x, self.position.y)
+        else:
+            self.previous_position.x = self.position.x
+            self.previous_position.y = self.position.y
+        self.previous_rotation = self.rotation
+        
+        for child in self.children:
+            child.save_state()
+            
+    def apply_interpolation(self, alpha: float, saved: list):
+        previous = self.previous_position
+        if previous is not None:
+            position = self.position
+            saved.append((self, position.x, position.y, self.rotation))
+            position.x = previous.x + (position.x - previous.x) * alpha
+            position.y = previous.y + (position.y - previous.y) * alpha
+            self.rotation = self.previous_rotation + (self.rotation - self.previous_rotation) * alpha
+            
+        for child in self.children:
+            child.apply_interpolation(alpha, saved)
+
+class ObjectPool:
+    def __init__(self, factory: Callable[[], GameObject], size: int = 0, max_size: Optional[int] = None):
+        self.factory = factory
+        self.max_size = max_size
+        self.available: List[GameObject] = []
+        self.in_use = 0
+        self.peak_in_use = 0
+        self.created = 0
+        self.hits = 0
+        self.misses = 0
+        self.preallocate(size)
+        
+    def _create(self) -> GameObject:
+        obj = self.factory()
+        obj.pool = self
+        # What reset() restores: the parts of a fresh object that GameObject can't know
+        obj._initial_state = (obj.layer, obj.static, tuple(obj.children))
+        self.created += 1
+        return obj
+        
+    def preallocate(self, size: int):
+        # Tops the pool up so that `size` objects exist in total
+        while self.in_use + len(self.available) < size:
+            obj = self._create()
+            obj._in_pool = True
+            self.available.append(obj)
+            
+    def acquire(self, *args, **kwargs) -> GameObject:
+        if self.available:
+            obj = self.available.pop()
+            self.hits += 1
+        else:
+            obj = self._create()
+            self.misses += 1
+        obj.reset(*args, **kwargs)
+        self._take(obj)
+        return obj
+        
+    def _take(self, obj: GameObject):
+        obj._in_pool = False
+        self.in_use += 1
+        self.peak_in_use = max(self.peak_in_use, self.in_use)
+        
+    def reclaim(self, obj: GameObject):
+        # An idle object put back into use directly, e.g. added to another scene
+        if obj.pool is not self or not obj._in_pool:
+            return
+        if obj in self.available:
+            self.available.remove(obj)
+        self._take(obj)
+        
+    def release(self, obj: GameObject):
+        if obj.pool is not self:
+            raise ValueError("Object does not belong to this pool")
+        if obj._in_pool:
+            return
+        obj._in_pool = True
+        self.in_use -= 1
+        if self.max_size is None or len(self.available) < self.max_size:
+            self.available.append(obj)
+        else:
+            obj.pool = None
+            obj._in_pool = False
+            
+    def get_stats(self) -> dict:
+        requests = self.hits + self.misses
+        return {
+            'available': len(self.available),
+            'in_use': self.in_use,
+            'peak_in_use': self.peak_in_use,
+            'created': self.created,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / requests if requests else 0.0,
+        }
 
 class Camera:
     def __init__(self, x: float = 0, y: float = 0, zoom: float = 1.0):
         self.position = Vector2(x, y)
         self.zoom = zoom
         self.rotation = 0.0
+        self.matrix_rebuilds = 0
+        self._matrix = None
+        self._inverse = None
+        self._matrix_key = None
+        
+    def get_matrix(self) -> Tuple[float, float, float, float, float, float]:
+        # (a, b, tx, c, d, ty): screen = (a * x + b * y + tx, c * x + d * y + ty)
+        position = self.position
+        key = (position.x, position.y, self.zoom, self.rotation)
+        if key == self._matrix_key:
+            return self._matrix
+        x, y, zoom, rotation = key
+        if rotation == 0:
+            a, b, c, d = zoom, 0.0, 0.0, zoom
+        else:
+            angle = math.radians(-rotation)
+            a = d = math.cos(angle) * zoom
+            c = math.sin(angle) * zoom
+            b = -c
+        self._matrix = (a, b, -(a * x + b * y), c, d, -(c * x + d * y))
+        self._inverse = None
+        self._matrix_key = key
+        self.matrix_rebuilds += 1
+        return self._matrix
+        
+    def get_inverse_matrix(self) -> Tuple[float, float, float, float, float, float]:
+        matrix = self.get_matrix()
+        if self._inverse is None:
+            if self.zoom == 0:
+                raise ValueError("Camera zoom must be non-zero to map screen to world")
+            a, b, tx, c, d, ty = matrix
+            det = a * d - b * c
+            ia, ib, ic, id_ = d / det, -b / det, -c / det, a / det
+            self._inverse = (ia, ib, -(ia * tx + ib * ty), ic, id_, -(ic * tx + id_ * ty))
+        return self._inverse
         
     def world_to_screen(self, world_pos: Vector2) -> Vector2:
-        screen_pos = world_pos - self.position
-        screen_pos = screen_pos.rotate(-self.rotation)
-        screen_pos = screen_pos * self.zoom
-        return screen_pos
+        a, b, tx, c, d, ty = self.get_matrix()
+        x = world_pos.x
+        y = world_pos.y
+        return Vector2(a * x + b * y + tx, c * x + d * y + ty)
+        
+    def world_to_screen_array(self, points) -> Vector2Array:
+        # Accepts a Vector2Array or an (N, 2) array and maps every point with one matrix product
+        a, b, tx, c, d, ty = self.get_matrix()
+        data = points.data if isinstance(points, Vector2Array) else Vector2Array(points).data
+        screen = data @ ((a, c), (b, d))
+        screen += (tx, ty)
+        return Vector2Array(screen)
         
     def screen_to_world(self, screen_pos: Vector2) -> Vector2:
-        world_pos = screen_pos / self.zoom
-        world_pos = world_pos.rotate(self.rotation)
-        world_pos = world_pos + self.position
-        return world_pos
+        a, b, tx, c, d, ty = self.get_inverse_matrix()
+        x = screen_pos.x
+        y = screen_pos.y
+        return Vector2(a * x + b * y + tx, c * x + d * y + ty)
+        
+    def get_visible_rect(self, width: float, height: float, margin: float = 0) -> Tuple[float, float, float, float]:
+        corners = [self.screen_to_world(Vector2(x, y))
+                   for x in (-margin, width + margin) for y in (-margin, height + margin)]
+        return (min(c.x for c in corners), min(c.y for c in corners),
+                max(c.x for c in corners), max(c.y for c in corners))
 
 class Scene:
     def __init__(self, name: str):
@@ -72,31 +357,466 @@ class Scene:
         self.game_objects: List[GameObject] = []
         self.camera = Camera()
         self.background_color = Color(0, 0, 0)
+        self.object_profiler: Optional[ObjectProfiler] = None
+        self.batch_rendering = False
+        self.culling = False
+        self.spatial_index: Optional[SpatialHash] = None
+        self.render_stats = {'drawn': 0, 'culled': 0}
+        self._dynamic_objects: List[GameObject] = []
+        self._static_extent = 0.0
+        self._draw_order = {}
+        self._next_draw_order = 0
+        self.dirty_rendering = False
+        self.background: Optional[pygame.Surface] = None
+        self.damaged_rects: List[pygame.Rect] = []
+        self.full_redraw_ratio = 0.5
+        self._owns_background = False
+        self._full_redraw = True
+        self._camera_key = None
+        self._pending_damage: List[pygame.Rect] = []
+        self._dirty_drawn: List[GameObject] = []
+        self.pending_frames = 0
+        self.world: Optional[World] = None
+        self._bridge_systems = []
         
     def add_object(self, obj: GameObject):
+        if obj._in_pool:
+            obj.pool.reclaim(obj)
         obj.scene = self
         self.game_objects.append(obj)
+        self._draw_order[obj] = self._next_draw_order
+        self._next_draw_order += 1
+        if self.spatial_index is not None:
+            self._index_object(obj)
+        if self.world is not None:
+            obj.entity = self.world.create_entity(game_object=obj, position=obj.position)
         
     def remove_object(self, obj: GameObject):
         if obj in self.game_objects:
             self.game_objects.remove(obj)
+            self._draw_order.pop(obj, None)
+            if self.world is not None and obj.entity is not None:
+                self.world.destroy_entity(obj.entity)
+            obj.entity = None
+            if self.dirty_rendering and obj.screen_bounds is not None:
+                self._pending_damage.append(obj.screen_bounds)
+            obj.screen_bounds = None
+            obj._screen_key = None
+            if self.spatial_index is not None:
+                if obj in self.spatial_index:
+                    self.spatial_index.remove(obj)
+                elif obj in self._dynamic_objects:
+                    self._dynamic_objects.remove(obj)
+            if obj.pool is not None:
+                obj.pool.release(obj)
+                
+    def spawn(self, pool: ObjectPool, *args, **kwargs) -> GameObject:
+        obj = pool.acquire(*args, **kwargs)
+        self.add_object(obj)
+        return obj
+        
+    def enable_ecs(self, world: Optional[World] = None) -> World:
+        # GameObjects become entities with "game_object" and "position" components
+        if self.world is not None:
+            self.disable_ecs()
+        world = World() if world is None else world
+        world.register_component("game_object")
+        self._bridge_systems = [world.add_system(GameObjectSystem(self)), world.add_system(TransformSyncSystem())]
+        self.world = world
+        for obj in self.game_objects:
+            obj.entity = world.create_entity(game_object=obj, position=obj.position)
+        return world
+        
+    def disable_ecs(self):
+        world = self.world
+        if world is None:
+            return
+        for obj in self.game_objects:
+            if obj.entity is not None:
+                world.destroy_entity(obj.entity)
+                obj.entity = None
+        for system in self._bridge_systems:
+            world.remove_system(system)
+        self._bridge_systems = []
+        self.world = None
+        
+    def enable_dirty_rendering(self, background: Optional[pygame.Surface] = None):
+        self.dirty_rendering = True
+        self.background = background
+        self._owns_background = background is None
+        self.invalidate()
+        
+    def disable_dirty_rendering(self):
+        self.dirty_rendering = False
+        self.damaged_rects = []
+        if self._owns_background:
+            self.background = None
+            
+    def invalidate(self):
+        self._full_redraw = True
+        if self._owns_background:
+            self.background = None
+            
+    def enable_culling(self, cell_size: Optional[float] = 256.0):
+        self.culling = True
+        self.spatial_index = SpatialHash(cell_size) if cell_size else None
+        self._dynamic_objects = []
+        self._static_extent = 0.0
+        if self.spatial_index is not None:
+            for obj in self.game_objects:
+                self._draw_order.setdefault(obj, self._next_draw_order)
+                self._next_draw_order += 1
+                self._index_object(obj)
+                
+    def disable_culling(self):
+        self.culling = False
+        self.spatial_index = None
+        self._dynamic_objects = []
+        
+    def update_static_object(self, obj: GameObject):
+        if self.spatial_index is None:
+            return
+        if obj in self.spatial_index:
+            self.spatial_index.remove(obj)
+        elif obj in self._dynamic_objects:
+            self._dynamic_objects.remove(obj)
+        self._index_object(obj)
+        
+    def _index_object(self, obj: GameObject):
+        # Static objects are indexed by position; their extent widens the query instead
+        extent = obj.get_render_extent() if obj.static else None
+        if extent is None:
+            self._dynamic_objects.append(obj)
+            return
+        self._static_extent = max(self._static_extent, extent[0], extent[1])
+        x, y = obj.position.x, obj.position.y
+        self.spatial_index.update(obj, x, y, x, y)
+        
+    def get_visible_objects(self, view_width: float, view_height: float) -> List[GameObject]:
+        camera = self.camera
+        a, b, tx, c, d, ty = camera.get_matrix()
+        index = self.spatial_index
+        candidates = self.game_objects if index is None else self._dynamic_objects
+        if index is not None:
+            left, top, right, bottom = camera.get_visible_rect(view_width, view_height, self._static_extent)
+            candidates = candidates + list(index.query(left, top, right, bottom))
             
+        visible = []
+        for obj in candidates:
+            if not obj.visible or not obj.active:
+                continue
+            extent = obj.get_render_extent()
+            if extent is not None:
+                x = obj.position.x
+                y = obj.position.y
+                screen_x = a * x + b * y + tx
+                screen_y = c * x + d * y + ty
+                if (screen_x + extent[0] < 0 or screen_x - extent[0] > view_width
+                        or screen_y + extent[1] < 0 or screen_y - extent[1] > view_height):
+                    continue
+            visible.append(obj)
+            
+        if index is not None:
+            visible.sort(key=self._draw_order.get)
+        self.render_stats = {'drawn': len(visible), 'culled': len(self.game_objects) - len(visible)}
+        return visible
+        
+    def request_frames(self, count: int = 1):
+        self.pending_frames = max(self.pending_frames, count)
+        
+    def has_pending_activity(self) -> bool:
+        if self.pending_frames > 0:
+            return True
+        if self.world is not None and self.world.has_pending_activity():
+            return True
+        return any(obj.has_pending_activity() for obj in self.game_objects)
+        
     def get_objects_by_name(self, name: str) -> List[GameObject]:
         return [obj for obj in self.game_objects if hasattr(obj, 'name') and obj.name == name]
         
+    def enable_object_profiling(self, sample_every: int = 1) -> ObjectProfiler:
+        self.object_profiler = ObjectProfiler(sample_every)
+        return self.object_profiler
+        
+    def disable_object_profiling(self):
+        self.object_profiler = None
+        
     def update(self, delta_time: float):
+        if self.world is not None:
+            self.world.update(delta_time)
+        else:
+            self.update_objects(delta_time)
+            
+    def update_objects(self, delta_time: float):
+        profiler = self.object_profiler
+        if profiler is not None and profiler.begin_frame():
+            self._update_profiled(delta_time, profiler)
+            return
+            
         for obj in self.game_objects:
             obj.update(delta_time)
             
     def render(self, screen):
-        screen.fill(self.background_color.rgba)
+        world = self.world
+        if world is not None and not world.has_render_systems():
+            world = None
+        object_profiler = self.object_profiler
+        profiler = object_profiler if object_profiler is not None and object_profiler.begin_frame() else None
+        frame_start = perf_counter() if profiler is not None else 0.0
         
+        if self.culling:
+            objects = self.get_visible_objects(*screen.get_size())
+        else:
+            objects = self.game_objects
+            
+        if self.dirty_rendering:
+            if world is not None:
+                damage = world.get_damage(screen, self.camera)
+                if damage is None:
+                    # A system that can't say what it changed needs the whole screen redrawn
+                    self._full_redraw = True
+                else:
+                    self._pending_damage.extend(damage)
+            self._render_dirty(screen, objects, world, profiler)
+        else:
+            screen.fill(self.background_color.rgba)
+            self._draw_objects(screen, objects, profiler)
+            if world is not None:
+                world.render(screen, self.camera)
+                
+        if profiler is not None:
+            profiler.record("Scene.render", "scene", frame_start, perf_counter())
+        if object_profiler is not None:
+            # Closes the frame that the updates since the last render, one per substep, belonged to
+            object_profiler.end_frame()
+            
+    def _draw_objects(self, screen, objects: List[GameObject], profiler: Optional[ObjectProfiler] = None):
+        if profiler is not None:
+            self._render_profiled(screen, profiler, objects)
+        elif self.batch_rendering:
+            self._render_batched(screen, objects)
+        else:
+            camera = self.camera
+            for obj in objects:
+                obj.render(screen, camera)
+                
+    def _update_profiled(self, delta_time: float, profiler: ObjectProfiler):
+        frame_start = perf_counter()
         for obj in self.game_objects:
+            start = perf_counter()
+            obj.update(delta_time)
+            profiler.record(type(obj).__name__ + ".update", "update", start, perf_counter())
+        profiler.record("Scene.update", "scene", frame_start, perf_counter())
+        profiler.updates_sampled += 1
+        
+    def _render_profiled(self, screen, profiler: ObjectProfiler, objects: List[GameObject]):
+        for obj in objects:
+            start = perf_counter()
             obj.render(screen, self.camera)
+            profiler.record(type(obj).__name__ + ".render", "render", start, perf_counter())
+        
+    def build_render_queue(self, objects: Optional[List[GameObject]] = None):
+        camera = self.camera
+        buckets = {}
+        immediate = []
+        
+        # Same arithmetic as Camera.world_to_screen, hoisted out of the loop
+        a, b, tx, c, d, ty = camera.get_matrix()
+        base_render = GameObject.render
+        plain_classes = {}
+        # (layer, sprite) -> (bucket append, half width, half height) for the fast path
+        sprites = {}
+        
+        for obj in self.game_objects if objects is None else objects:
+            if not obj.visible or not obj.active:
+                continue
+            cls = obj.__class__
+            plain = plain_classes.get(cls)
+            if plain is None:
+                plain = plain_classes[cls] = cls.render is base_render
+            sprite = obj.sprite
+            scale = obj.scale
+            if (plain and sprite.__class__ is Sprite and not obj.children
+                    and obj.rotation == 0 and scale.x == 1 and scale.y == 1):
+                image = sprite.image
+                if not image:
+                    continue
+                entry = sprites.get((obj.layer, sprite))
+                if entry is None:
+                    bucket = buckets.get(obj.layer)
+                    if bucket is None:
+                        bucket = buckets[obj.layer] = []
+                    entry = sprites[(obj.layer, sprite)] = (bucket.append, sprite.width // 2, sprite.height // 2)
+                append, half_width, half_height = entry
+                position = obj.position
+                x = position.x
+                y = position.y
+                append((image, (a * x + b * y + tx - half_width, c * x + d * y + ty - half_height)))
+            else:
+                obj.collect_render(buckets, camera, immediate)
+                
+        # Blits keep their insertion order within a layer, so overlapping sprites stack exactly as with
+        # per-object rendering; software blitting has no texture switches worth reordering for
+        return [(layer, buckets[layer]) for layer in sorted(buckets)], immediate
+        
+    def _render_batched(self, screen, objects: List[GameObject]):
+        layers, immediate = self.build_render_queue(objects)
+        
+        if not immediate:
+            if len(layers) == 1:
+                screen.blits(layers[0][1], False)
+            else:
+                screen.blits([blit for _, blits in layers for blit in blits], False)
+            return
+            
+        # Custom renderers draw after the batched blits of their layer
+        immediate.sort(key=lambda obj: obj.layer)
+        batched = dict(layers)
+        next_immediate = 0
+        for layer in sorted(set(batched) | {obj.layer for obj in immediate}):
+            if layer in batched:
+                screen.blits(batched[layer], False)
+            while next_immediate < len(immediate) and immediate[next_immediate].layer == layer:
+                immediate[next_immediate].render(screen, self.camera)
+                next_immediate += 1
+                
+    def _render_dirty(self, screen, objects: List[GameObject], world: Optional[World] = None,
+                      profiler: Optional[ObjectProfiler] = None):
+        camera = self.camera
+        screen_rect = screen.get_rect()
+        background = self.background
+        if background is None or (self._owns_background and background.get_size() != screen_rect.size):
+            background = self.background = pygame.Surface(screen_rect.size)
+            background.fill(self.background_color.rgba)
+            self._owns_background = True
+            self._full_redraw = True
+            
+        camera_key = (camera.position.x, camera.position.y, camera.zoom, camera.rotation)
+        camera_moved = camera_key != self._camera_key
+        full_redraw = self._full_redraw or camera_moved
+        self._camera_key = camera_key
+        damaged = self._pending_damage
+        self._pending_damage = []
+        
+        drawn = []
+        for obj in objects:
+            shown = obj.visible and obj.active
+            position = obj.position
+            key = (shown, position.x, position.y, obj.rotation, obj.scale.x, obj.scale.y,
+                   id(getattr(obj.sprite, "image", None)))
+            if key == obj._screen_key and not obj.dirty and not camera_moved and not obj.children:
+                # Nothing that affects its bounds changed since the last frame
+                if shown:
+                    drawn.append((obj, obj.screen_bounds))
+                obj.previous_screen_bounds = obj.screen_bounds
+                continue
+                
+            bounds = None
+            if shown:
+                bounds = obj.get_screen_bounds(camera)
+                if bounds is None:
+                    # Unknown area: redraw everything, and check again next frame
+                    full_redraw = True
+                    bounds = screen_rect
+                    key = None
+                drawn.append((obj, bounds))
+                
+            if obj.dirty or bounds != obj.screen_bounds or key is None or key != obj._screen_key:
+                if obj.screen_bounds is not None:
+                    damaged.append(obj.screen_bounds)
+                if bounds is not None:
+                    damaged.append(bounds)
+                obj.dirty = False
+            obj.previous_screen_bounds = obj.screen_bounds
+            obj.screen_bounds = bounds
+            obj._screen_key = key
+            
+        if objects is not self.game_objects:
+            # Objects culled since the last frame leave their old area behind
+            current = {obj for obj, _ in drawn}
+            for obj in self._dirty_drawn:
+                if obj not in current and obj.scene is self and obj.screen_bounds is not None:
+                    damaged.append(obj.screen_bounds)
+                    obj.previous_screen_bounds = obj.screen_bounds
+                    obj.screen_bounds = None
+                    obj._screen_key = None
+        self._dirty_drawn = [obj for obj, _ in drawn]
+        
+        merged = []
+        if not full_redraw:
+            for rect in damaged:
+                rect = rect.clip(screen_rect)
+                if not rect.width or not rect.height:
+                    continue
+                index = rect.collidelist(merged)
+                while index != -1:
+                    rect.union_ip(merged.pop(index))
+                    index = rect.collidelist(merged)
+                merged.append(rect)
+            area = sum(rect.width * rect.height for rect in merged)
+            full_redraw = area > screen_rect.width * screen_rect.height * self.full_redraw_ratio
+            
+        if full_redraw:
+            screen.blit(background, (0, 0))
+            self._draw_objects(screen, self._dirty_drawn, profiler)
+            if world is not None:
+                world.render(screen, camera)
+            self.damaged_rects = [screen_rect]
+            self._full_redraw = False
+            return
+            
+        # Restore the background under each damaged rect and redraw what overlaps it, in order
+        for rect in merged:
+            screen.set_clip(rect)
+            screen.blit(background, rect, rect)
+            self._draw_objects(screen, [obj for obj, bounds in drawn if bounds.colliderect(rect)], profiler)
+            if world is not None:
+                world.render(screen, camera)
+        screen.set_clip(None)
+        self.damaged_rects = merged
+        
+    def save_state(self):
+        for obj in self.game_objects:
+            obj.save_state()
+            
+    def render_interpolated(self, screen, alpha: float):
+        saved = []
+        for obj in self.game_objects:
+            obj.apply_interpolation(alpha, saved)
+        try:
+            self.render(screen)
+        finally:
+            for obj, x, y, rotation in saved:
+                obj.position.x = x
+                obj.position.y = y
+                obj.rotation = rotation
 
 class Py2DEngine:
-    def __init__(self, width: int = 800, height: int = 600, title: str = "Py2D Game"):
-        pygame.init()
+    def __init__(self, width: int = 800, height: int = 600, title: str = "Py2D Game", headless: bool = False):
+        self.headless = headless
+        if headless:
+            # No window or audio device: the dummy drivers still give convert_alpha a video mode.
+            # SDL only reads the variables while initialising, so the process environment is restored.
+            saved = {name: os.environ.get(name) for name in ("SDL_VIDEODRIVER", "SDL_AUDIODRIVER")}
+            os.environ["SDL_VIDEODRIVER"] = "dummy"
+            os.environ["SDL_AUDIODRIVER"] = "dummy"
+            try:
+                if pygame.display.get_init() and pygame.display.get_driver() != "dummy":
+                    pygame.display.quit()
+                pygame.display.init()
+                pygame.font.init()
+            finally:
+                for name, value in saved.items():
+                    if value is None:
+                        os.environ.pop(name, None)
+                    else:
+                        os.environ[name] = value
+        else:
+            # A headless engine earlier in the process may have left the dummy video driver running
+            if (pygame.display.get_init() and pygame.display.get_driver() == "dummy"
+                    and os.environ.get("SDL_VIDEODRIVER") != "dummy"):
+                pygame.display.quit()
+            pygame.init()
         self.width = width
         self.height = height
         self.title = title
@@ -106,14 +826,33 @@ class Py2DEngine:
         self.clock = pygame.time.Clock()
         self.running = False
         self.fps = 60
+        self.uncapped = headless
+        self.simulated_clock = headless
+        self.render_enabled = True
         
         self.current_scene: Optional[Scene] = None
         self.scenes: dict = {}
         
         self.input_manager = InputManager()
-        self.audio_manager = AudioManager()
+        self.audio_manager = AudioManager(enabled=not headless)
         
         self.delta_time = 0.0
+        self.frame_count = 0
+        self.elapsed_time = 0.0
+        
+        self.profiler: Optional[FrameProfiler] = None
+        self.profiler_overlay = False
+        
+        self.fixed_timestep: Optional[float] = None
+        self.max_substeps = 5
+        self.interpolate = True
+        self.interpolation_alpha = 1.0
+        self._accumulator = 0.0
+        
+        self.adaptive_pacing = False
+        self.idle_fps = 0.0
+        self.idle = False
+        self.idle_frames = 0
         
     def add_scene(self, scene: Scene):
         scene.game_engine = self
@@ -122,30 +861,177 @@ class Py2DEngine:
     def set_scene(self, scene_name: str):
         if scene_name in self.scenes:
             self.current_scene = self.scenes[scene_name]
+            self.current_scene.invalidate()
+            
+    def set_fixed_timestep(self, rate: Optional[float] = 120, max_substeps: int = 5, interpolate: bool = True):
+        self.fixed_timestep = 1.0 / rate if rate else None
+        self.max_substeps = max(1, max_substeps)
+        self.interpolate = interpolate
+        self.interpolation_alpha = 1.0
+        self._accumulator = 0.0
+        
+    def enable_adaptive_pacing(self, idle_fps: float = 0):
+        self.adaptive_pacing = True
+        self.idle_fps = idle_fps
+        
+    def disable_adaptive_pacing(self):
+        self.adaptive_pacing = False
+        self.idle = False
+        
+    def is_scene_idle(self) -> bool:
+        scene = self.current_scene
+        if self.input_manager.has_active_input() or pygame.event.peek():
+            return False
+        return scene is None or not scene.has_pending_activity()
+        
+    def _idle_step(self) -> bool:
+        # Sleep until input arrives, or until the next idle tick when idle_fps is set
+        if self.headless:
+            event = pygame.event.poll()
+        else:
+            event = pygame.event.wait(int(1000 / self.idle_fps) if self.idle_fps else 0)
+        self.clock.tick()
+        if event.type != pygame.NOEVENT:
+            pygame.event.post(event)
+            return False
+            
+        self.idle = True
+        self.idle_frames += 1
+        self._poll_events()
+        self.input_manager.update()
+        return True
+        
+    def _update_scene(self, scene: Scene, delta_time: float):
+        step = self.fixed_timestep
+        if step is None:
+            scene.update(delta_time)
+            return
             
+        self._accumulator += delta_time
+        substeps = 0
+        while self._accumulator >= step and substeps < self.max_substeps:
+            scene.save_state()
+            scene.update(step)
+            self._accumulator -= step
+            substeps += 1
+            
+        # Drop the backlog instead of spiralling when updates can't keep up
+        if self._accumulator >= step:
+            self._accumulator %= step
+        self.interpolation_alpha = self._accumulator / step
+        
+    def _render_scene(self, scene: Scene):
+        if self.fixed_timestep is not None and self.interpolate:
+            scene.render_interpolated(self.screen, self.interpolation_alpha)
+        else:
+            scene.render(self.screen)
+            
+    def _handle_event(self, event):
+        if event.type == pygame.QUIT:
+            self.running = False
+        elif event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_ESCAPE:
+                self.running = False
+                
+    def _tick(self) -> float:
+        if self.simulated_clock:
+            if not self.uncapped:
+                self.clock.tick(self.fps)
+            return 1.0 / self.fps
+        return self.clock.tick(0 if self.uncapped else self.fps) / 1000.0
+        
+    def enable_profiler(self, window: int = 300, overlay: bool = False) -> FrameProfiler:
+        self.profiler = FrameProfiler(window)
+        self.profiler_overlay = overlay
+        return self.profiler
+        
+    def disable_profiler(self):
+        self.profiler = None
+        self.profiler_overlay = False
+        
+    def get_frame_stats(self) -> dict:
+        return self.profiler.get_stats() if self.profiler else {}
+        
+    def _poll_events(self):
+        for event in pygame.event.get():
+            self._handle_event(event)
+            
+    def _present(self):
+        if self.headless:
+            return
+        scene = self.current_scene
+        overlay = self.profiler is not None and self.profiler_overlay
+        if scene is not None and scene.dirty_rendering and self.render_enabled and not overlay:
+            if scene.damaged_rects:
+                pygame.display.update(scene.damaged_rects)
+        else:
+            pygame.display.flip()
+            
+    def step(self, delta_time: Optional[float] = None):
+        if self.adaptive_pacing and delta_time is None and self.is_scene_idle():
+            if self._idle_step():
+                return
+            # Woken by input: the time spent asleep is not simulated
+            delta_time = 1.0 / self.fps
+            
+        self.idle = False
+        self.delta_time = self._tick() if delta_time is None else delta_time
+        if self.current_scene and self.current_scene.pending_frames > 0:
+            self.current_scene.pending_frames -= 1
+        
+        if self.profiler is not None:
+            self._step_profiled(self.profiler)
+        else:
+            for _, phase in self._frame_phases():
+                phase()
+                
+        self.frame_count += 1
+        self.elapsed_time += self.delta_time
+        
+    def _frame_phases(self):
+        return (
+            ("events", self._poll_events),          # معالجة الأحداث
+            ("input", self.input_manager.update),   # تحديث الإدخال
+            ("update", self._update_phase),         # تحديث وعرض المشهد
+            ("render", self._render_phase),
+            ("flip", self._present),
+        )
+        
+    def _update_phase(self):
+        if self.current_scene:
+            self._update_scene(self.current_scene, self.delta_time)
+            
+    def _render_phase(self):
+        scene = self.current_scene
+        if scene and self.render_enabled:
+            self._render_scene(scene)
+        elif scene and scene.object_profiler is not None:
+            scene.object_profiler.end_frame()
+            
+    def _step_profiled(self, profiler: FrameProfiler):
+        # Same phases as an unprofiled step, each one timed
+        timings = {}
+        for name, phase in self._frame_phases():
+            if name == "flip" and self.profiler_overlay:
+                profiler.render_overlay(self.screen)
+            start = perf_counter()
+            phase()
+            timings[name] = perf_counter() - start
+        profiler.record_frame(timings)
+        
+    def run_for(self, frames: int, delta_time: Optional[float] = None) -> int:
+        self.running = True
+        completed = 0
+        while completed < frames and self.running:
+            self.step(delta_time)
+            completed += 1
+        return completed
+        
     def run(self):
         self.running = True
         
         while self.running:
-            self.delta_time = self.clock.tick(self.fps) / 1000.0
-            
-            # معالجة الأحداث
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    self.running = False
-                elif event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_ESCAPE:
-                        self.running = False
-                        
-            # تحديث الإدخال
-            self.input_manager.update()
-            
-            # تحديث وعرض المشهد
-            if self.current_scene:
-                self.current_scene.update(self.delta_time)
-                self.current_scene.render(self.screen)
-                
-            pygame.display.flip()
+            self.step()
             
         pygame.quit()
         sys.exit()
@@ -0,0 +1,463 @@
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+import pygame
+from .utils import Vector2, Vector2Array
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+class Component:
+    def __init__(self, name: str, fields: Optional[Tuple[str, ...]] = None, dtype=None):
+        # fields=None stores any Python value per entity; otherwise one numeric column per field
+        if fields is not None and not fields:
+            raise ValueError("Numeric components need at least one field, use fields=None for object components")
+        self.name = name
+        self.fields = tuple(fields) if fields is not None else None
+        self.dtype = dtype
+        
+    @property
+    def is_object(self) -> bool:
+        return self.fields is None
+        
+    def __eq__(self, other) -> bool:
+        return (isinstance(other, Component) and self.name == other.name
+                and self.fields == other.fields and self.dtype == other.dtype)
+                
+    def __hash__(self) -> int:
+        return hash((self.name, self.fields))
+        
+    def __repr__(self) -> str:
+        return f"Component({self.name!r}, {self.fields!r})"
+
+class Archetype:
+    def __init__(self, components: Iterable[Component], capacity: int = 64):
+        self.components: Dict[str, Component] = {component.name: component for component in components}
+        self.key: FrozenSet[str] = frozenset(self.components)
+        self.entities: List[int] = []
+        self.capacity = max(1, capacity)
+        self.columns = {}
+        for name, component in self.components.items():
+            if component.is_object:
+                self.columns[name] = []
+            else:
+                self.columns[name] = np.zeros(self._shape(component, self.capacity), dtype=component.dtype)
+                
+    @staticmethod
+    def _shape(component: Component, capacity: int) -> Tuple[int, ...]:
+        # Single-field components are flat so they read like plain arrays
+        if len(component.fields) == 1:
+            return (capacity,)
+        return (capacity, len(component.fields))
+        
+    def __len__(self) -> int:
+        return len(self.entities)
+        
+    def __contains__(self, name: str) -> bool:
+        return name in self.key
+        
+    def column(self, name: str):
+        # Numeric columns are views of the live rows: writes go straight to the entities
+        column = self.columns[name]
+        if isinstance(column, list):
+            return column
+        return column[:len(self.entities)]
+        
+    def field(self, name: str, field: str):
+        fields = self.components[name].fields
+        if fields is None or field not in fields:
+            raise ValueError(f"Component '{name}' has no field '{field}'")
+        column = self.column(name)
+        return column if len(fields) == 1 else column[:, fields.index(field)]
+        
+    def vectors(self, name: str) -> Vector2Array:
+        return Vector2Array(self.column(name))
+        
+    def _reserve(self, count: int):
+        needed = len(self.entities) + count
+        if needed <= self.capacity:
+            return
+        capacity = self.capacity
+        while capacity < needed:
+            capacity *= 2
+        for name, component in self.components.items():
+            if component.is_object:
+                continue
+            old = self.columns[name]
+            new = np.zeros(self._shape(component, capacity), dtype=old.dtype)
+            new[:len(old)] = old
+            self.columns[name] = new
+        self.capacity = capacity
+        
+    def _append(self, entity: int, values: dict) -> int:
+        self._reserve(1)
+        row = len(self.entities)
+        for name, column in self.columns.items():
+            value = values.get(name)
+            if isinstance(column, list):
+                column.append(value)
+            else:
+                # Rows are reused after removals, so missing values still have to be written
+                column[row] = 0 if value is None else (value.x, value.y) if isinstance(value, Vector2) else value
+        self.entities.append(entity)
+        return row
+        
+    def _extend(self, entities: range, values: dict) -> int:
+        count = len(entities)
+        self._reserve(count)
+        start = len(self.entities)
+        for name, column in self.columns.items():
+            value = values.get(name)
+            if isinstance(column, list):
+                # A list of the right length holds one value per entity, anything else is shared
+                column.extend(value if isinstance(value, list) and len(value) == count else [value] * count)
+            else:
+                if value is None:
+                    value = 0
+                elif isinstance(value, Vector2):
+                    value = (value.x, value.y)
+                elif isinstance(value, Vector2Array):
+                    value = value.data
+                column[start:start + count] = value
+        self.entities.extend(entities)
+        return start
+        
+    def _row_values(self, row: int) -> dict:
+        values = {}
+        for name, column in self.columns.items():
+            value = column[row]
+            values[name] = value.copy() if isinstance(value, np.ndarray) else value
+        return values
+        
+    def _remove(self, row: int) -> Optional[int]:
+        # Swap-remove keeps the columns packed; returns the entity moved into `row`
+        last = len(self.entities) - 1
+        moved = self.entities.pop()
+        for column in self.columns.values():
+            if isinstance(column, list):
+                value = column.pop()
+                if row != last:
+                    column[row] = value
+            elif row != last:
+                column[row] = column[last]
+        if row == last:
+            return None
+        self.entities[row] = moved
+        return moved
+
+class System:
+    components: Tuple[str, ...] = ()
+    exclude: Tuple[str, ...] = ()
+    
+    def __init__(self, priority: int = 0):
+        self.priority = priority
+        self.enabled = True
+        
+    def update(self, world: 'World', delta_time: float):
+        for archetype in world.query(*self.components, exclude=self.exclude):
+            self.process(archetype, delta_time)
+            
+    def process(self, archetype: Archetype, delta_time: float):
+        pass
+        
+    def render(self, world: 'World', screen, camera):
+        pass
+        
+    def get_damage(self, world: 'World', screen, camera) -> Optional[List[pygame.Rect]]:
+        # Screen rects whose content this system changes since the last call; None means unknown
+        return None
+        
+    def has_pending_activity(self) -> bool:
+        return True
+
+class MovementSystem(System):
+    components = ("position", "velocity")
+    
+    def process(self, archetype: Archetype, delta_time: float):
+        position = archetype.column("position")
+        position += archetype.column("velocity") * delta_time
+
+class SpriteRenderSystem(System):
+    components = ("position", "sprite")
+    
+    def __init__(self, priority: int = 0, margin: float = 128):
+        super().__init__(priority)
+        self.margin = margin
+        self._drawn = {}
+        
+    def update(self, world: 'World', delta_time: float):
+        pass
+        
+    def _collect(self, world: 'World', camera, area: pygame.Rect) -> list:
+        margin = self.margin
+        left = area.left - margin
+        top = area.top - margin
+        right = area.right + margin
+        bottom = area.bottom + margin
+        blits = []
+        for archetype in world.query(*self.components, exclude=self.exclude):
+            points = camera.world_to_screen_array(archetype.column("position")).data
+            x = points[:, 0]
+            y = points[:, 1]
+            visible = np.flatnonzero((x > left) & (x < right) & (y > top) & (y < bottom))
+            sprites = archetype.column("sprite")
+            for row, screen_x, screen_y in zip(visible.tolist(), x[visible].tolist(), y[visible].tolist()):
+                sprite = sprites[row]
+                if sprite is not None and sprite.image:
+                    blits.append((sprite.image, (screen_x - sprite.width // 2, screen_y - sprite.height // 2)))
+        return blits
+        
+    def render(self, world: 'World', screen, camera):
+        # Only entities near the clip area are drawn, so dirty-rect redraws of small regions stay cheap
+        screen.blits(self._collect(world, camera, screen.get_clip()), False)
+        
+    def get_damage(self, world: 'World', screen, camera) -> Optional[List[pygame.Rect]]:
+        drawn = {}
+        for image, (x, y) in self._collect(world, camera, screen.get_rect()):
+            # blits truncates float positions
+            drawn[(id(image), int(x), int(y))] = image
+        previous = self._drawn
+        self._drawn = drawn
+        damage = [image.get_rect(topleft=key[1:]) for key, image in previous.items() if key not in drawn]
+        damage.extend(image.get_rect(topleft=key[1:]) for key, image in drawn.items() if key not in previous)
+        return damage
+        
+    def has_pending_activity(self) -> bool:
+        return False
+
+class GameObjectSystem(System):
+    # Runs the scene's GameObject updates, then copies their positions into the "position" column
+    components = ("game_object", "position")
+    
+    def __init__(self, scene, priority: int = -1000):
+        super().__init__(priority)
+        self.scene = scene
+        
+    def update(self, world: 'World', delta_time: float):
+        self.scene.update_objects(delta_time)
+        for archetype in _synced_archetypes(world):
+            objects = archetype.column("game_object")
+            position = archetype.column("position")
+            position[:, 0] = [obj.position.x for obj in objects]
+            position[:, 1] = [obj.position.y for obj in objects]
+            
+    def has_pending_activity(self) -> bool:
+        # GameObjects report their own activity through the scene
+        return False
+
+class TransformSyncSystem(System):
+    # Writes the "position" column back so systems can move GameObjects in bulk
+    components = ("game_object", "position")
+    
+    def __init__(self, priority: int = 1000):
+        super().__init__(priority)
+        
+    def update(self, world: 'World', delta_time: float):
+        for archetype in _synced_archetypes(world):
+            for obj, (x, y) in zip(archetype.column("game_object"), archetype.column("position").tolist()):
+                position = obj.position
+                position.x = x
+                position.y = y
+                
+    def has_pending_activity(self) -> bool:
+        return False
+
+def _synced_archetypes(world: 'World') -> List[Archetype]:
+    # Only GameObjects that some other system can see need their positions copied each frame
+    others = [system for system in world.systems
+              if system.enabled and not isinstance(system, (GameObjectSystem, TransformSyncSystem))]
+    return [archetype for archetype in world.query("game_object", "position")
+            if any(archetype.key.issuperset(system.components) and archetype.key.isdisjoint(system.exclude)
+                   for system in others)]
+
+class World:
+    def __init__(self, capacity: int = 64):
+        if np is None:
+            raise ImportError("World requires numpy (pip install py2d-game[numpy])")
+        self.capacity = capacity
+        self.component_types: Dict[str, Component] = {}
+        self.archetypes: Dict[FrozenSet[str], Archetype] = {}
+        self.systems: List[System] = []
+        self._locations: Dict[int, list] = {}
+        self._next_entity = 0
+        self._queries: Dict[tuple, List[Archetype]] = {}
+        self._deferred: Optional[list] = None
+        
+        self.register_component("position", ("x", "y"))
+        self.register_component("velocity", ("x", "y"))
+        self.register_component("sprite")
+        
+    def register_component(self, name: str, fields: Optional[Tuple[str, ...]] = None, dtype=None) -> Component:
+        component = Component(name, fields, np.float64 if fields is not None and dtype is None else dtype)
+        existing = self.component_types.get(name)
+        if existing is not None:
+            if existing != component:
+                raise ValueError(f"Component '{name}' is already registered with different fields")
+            return existing
+        self.component_types[name] = component
+        return component
+        
+    def _get_archetype(self, key: FrozenSet[str]) -> Archetype:
+        archetype = self.archetypes.get(key)
+        if archetype is None:
+            for name in key:
+                if name not in self.component_types:
+                    raise ValueError(f"Unknown component '{name}', register it first")
+            archetype = Archetype([self.component_types[name] for name in sorted(key)], self.capacity)
+            self.archetypes[key] = archetype
+            self._queries.clear()
+        return archetype
+        
+    def _location(self, entity: int) -> list:
+        location = self._locations.get(entity)
+        if location is None:
+            raise ValueError(f"Entity {entity} does not exist")
+        return location
+        
+    def __len__(self) -> int:
+        return len(self._locations)
+        
+    def is_alive(self, entity: int) -> bool:
+        return entity in self._locations
+        
+    def create_entity(self, **components) -> int:
+        entity = self._next_entity
+        self._next_entity += 1
+        if self._deferred is not None:
+            self._deferred.append((self._insert, (entity, components)))
+        else:
+            self._insert(entity, components)
+        return entity
+        
+    def _insert(self, entity: int, components: dict):
+        archetype = self._get_archetype(frozenset(components))
+        self._locations[entity] = [archetype, archetype._append(entity, components)]
+        
+    def create_entities(self, count: int, **components) -> range:
+        entities = range(self._next_entity, self._next_entity + count)
+        self._next_entity += count
+        if self._deferred is not None:
+            self._deferred.append((self._insert_many, (entities, components)))
+        else:
+            self._insert_many(entities, components)
+        return entities
+        
+    def _insert_many(self, entities: range, components: dict):
+        archetype = self._get_archetype(frozenset(components))
+        start = archetype._extend(entities, components)
+        self._locations.update((entity, [archetype, start + i]) for i, entity in enumerate(entities))
+        
+    def destroy_entity(self, entity: int) -> bool:
+        if self._deferred is not None:
+            self._deferred.append((self.destroy_entity, (entity,)))
+            return entity in self._locations
+        location = self._locations.pop(entity, None)
+        if location is None:
+            return False
+        archetype, row = location
+        moved = archetype._remove(row)
+        if moved is not None:
+            self._locations[moved][1] = row
+        return True
+        
+    def has_component(self, entity: int, name: str) -> bool:
+        return name in self._location(entity)[0].key
+        
+    def get_component(self, entity: int, name: str):
+        archetype, row = self._location(entity)
+        if name not in archetype.key:
+            raise ValueError(f"Entity {entity} has no component '{name}'")
+        return archetype.columns[name][row]
+        
+    def set_component(self, entity: int, name: str, value):
+        archetype, row = self._location(entity)
+        if name not in archetype.key:
+            raise ValueError(f"Entity {entity} has no component '{name}'")
+        archetype.columns[name][row] = (value.x, value.y) if isinstance(value, Vector2) else value
+        
+    def add_component(self, entity: int, name: str, value=None):
+        if self._deferred is not None:
+            self._deferred.append((self.add_component, (entity, name, value)))
+            return
+        archetype, row = self._location(entity)
+        if name in archetype.key:
+            self.set_component(entity, name, value)
+            return
+        self._move(entity, archetype.key | {name}, {name: value})
+        
+    def remove_component(self, entity: int, name: str):
+        if self._deferred is not None:
+            self._deferred.append((self.remove_component, (entity, name)))
+            return
+        archetype, row = self._location(entity)
+        if name in archetype.key:
+            self._move(entity, archetype.key - {name}, {})
+            
+    def _move(self, entity: int, key: FrozenSet[str], changes: dict):
+        archetype, row = self._locations[entity]
+        target = self._get_archetype(key)
+        values = archetype._row_values(row)
+        values.update(changes)
+        self.destroy_entity(entity)
+        self._locations[entity] = [target, target._append(entity, values)]
+        
+    def query(self, *names: str, exclude: Tuple[str, ...] = ()) -> List[Archetype]:
+        key = (frozenset(names), frozenset(exclude))
+        matches = self._queries.get(key)
+        if matches is None:
+            include, skip = key
+            matches = self._queries[key] = [archetype for archetype in self.archetypes.values()
+                                            if include <= archetype.key and not (skip & archetype.key)]
+        return [archetype for archetype in matches if archetype.entities]
+        
+    def add_system(self, system: System) -> System:
+        self.systems.append(system)
+        # Stable, so systems with equal priority run in the order they were added
+        self.systems.sort(key=lambda item: item.priority)
+        return system
+        
+    def remove_system(self, system: System):
+        if system in self.systems:
+            self.systems.remove(system)
+            
+    def has_render_systems(self) -> bool:
+        return any(type(system).render is not System.render for system in self.systems if system.enabled)
+        
+    def has_pending_activity(self) -> bool:
+        return any(system.enabled and system.has_pending_activity() for system in self.systems)
+        
+    def update(self, delta_time: float):
+        for system in list(self.systems):
+            if not system.enabled:
+                continue
+            # Structural changes made by a system are applied once it returns, so its column views stay valid
+            self._deferred = []
+            try:
+                system.update(self, delta_time)
+            finally:
+                deferred = self._deferred
+                self._deferred = None
+                for operation, args in deferred:
+                    operation(*args)
+                    
+    def render(self, screen, camera):
+        for system in self.systems:
+            if system.enabled:
+                system.render(self, screen, camera)
+                
+    def get_damage(self, screen, camera) -> Optional[List[pygame.Rect]]:
+        damage = []
+        for system in self.systems:
+            if system.enabled and type(system).render is not System.render:
+                rects = system.get_damage(self, screen, camera)
+                if rects is None:
+                    return None
+                damage.extend(rects)
+        return damage
+                
+    def get_stats(self) -> dict:
+        return {
+            'entities': len(self._locations),
+            'archetypes': sum(1 for archetype in self.archetypes.values() if archetype.entities),
+            'systems': len(self.systems),
+        }
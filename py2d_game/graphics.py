@@ -1,34 +1,256 @@
 import pygame
-from typing import List, Optional, Tuple
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
 from .utils import Vector2, Color
+from .assets import AssetRegistry, asset_registry
+from .tiles import DictTileStorage
+
+class TransformCache:
+    def __init__(self, max_bytes: int = 32 * 1024 * 1024, angle_step: float = 1.0):
+        self.max_bytes = max_bytes
+        self.angle_step = angle_step
+        self.entries: OrderedDict = OrderedDict()
+        self.bytes_used = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # Entries are keyed by id(source) so the cache never keeps a dropped image alive;
+        # a finalizer per source queues its entries for removal once it is collected
+        self._sources: Dict[int, weakref.finalize] = {}
+        self._collected: List[int] = []
+        
+    def quantize_angle(self, rotation: float) -> float:
+        if self.angle_step:
+            rotation = round(rotation / self.angle_step) * self.angle_step
+        return rotation % 360
+        
+    def get(self, surface: pygame.Surface, width: int, height: int, rotation: float = 0) -> pygame.Surface:
+        if self._collected:
+            self._drop_collected()
+        angle = self.quantize_angle(rotation)
+        source = id(surface)
+        key = (source, width, height, angle)
+        entries = self.entries
+        cached = entries.get(key)
+        if cached is not None:
+            entries.move_to_end(key)
+            self.hits += 1
+            return cached[0]
+            
+        self.misses += 1
+        result = surface
+        if (width, height) != surface.get_size():
+            result = pygame.transform.scale(result, (width, height))
+        if angle != 0:
+            result = pygame.transform.rotate(result, angle)
+            
+        size = result.get_width() * result.get_height() * result.get_bytesize()
+        if size <= self.max_bytes:
+            if source not in self._sources:
+                self._sources[source] = weakref.finalize(surface, self._collected.append, source)
+            entries[key] = (result, size)
+            self.bytes_used += size
+            self._evict()
+        return result
+        
+    def _drop_collected(self):
+        # Runs outside the finalizers, which can fire in the middle of any dict operation
+        collected = set()
+        while self._collected:
+            collected.add(self._collected.pop())
+        for source in collected:
+            self._sources.pop(source, None)
+        self._remove(key for key in self.entries if key[0] in collected)
+        
+    def _remove(self, keys):
+        for key in list(keys):
+            _, size = self.entries.pop(key)
+            self.bytes_used -= size
+        
+    def _evict(self):
+        entries = self.entries
+        while self.bytes_used > self.max_bytes and entries:
+            _, (_, size) = entries.popitem(last=False)
+            self.bytes_used -= size
+            self.evictions += 1
+            
+    def set_budget(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._evict()
+        
+    def invalidate(self, surface: pygame.Surface):
+        source = id(surface)
+        self._remove(key for key in self.entries if key[0] == source)
+        
+    def clear(self):
+        self.entries.clear()
+        self.bytes_used = 0
+        for finalizer in self._sources.values():
+            finalizer.detach()
+        self._sources.clear()
+        self._collected.clear()
+        
+    def get_stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": len(self.entries),
+            "bytes_used": self.bytes_used,
+            "max_bytes": self.max_bytes,
+        }
+
+_shared_transform_cache = TransformCache()
+
+class RotationAtlas:
+    _shared: 'weakref.WeakValueDictionary' = weakref.WeakValueDictionary()
+    
+    def __init__(self, surface: pygame.Surface, steps: int = 64):
+        if steps < 1:
+            raise ValueError("steps must be at least 1")
+        self.surface = surface
+        self.steps = steps
+        self.angle_step = 360.0 / steps
+        self.frames: List[Optional[pygame.Surface]] = [None] * steps
+        self.frames[0] = surface
+        self._thread: Optional[threading.Thread] = None
+        
+    @classmethod
+    def shared(cls, key, surface: pygame.Surface, steps: int = 64) -> 'RotationAtlas':
+        atlas = cls._shared.get((key, steps))
+        if atlas is None:
+            atlas = cls(surface, steps)
+            cls._shared[(key, steps)] = atlas
+        return atlas
+        
+    def invalidate(self):
+        # The source changed: keep it as frame 0 and rebuild the rest on demand
+        self.frames = [self.surface] + [None] * (self.steps - 1)
+        
+    def frame_index(self, rotation: float) -> int:
+        return int(round((rotation % 360) / self.angle_step)) % self.steps
+        
+    def get_frame(self, rotation: float) -> pygame.Surface:
+        index = self.frame_index(rotation)
+        frame = self.frames[index]
+        if frame is None:
+            frame = self._build_frame(index)
+        return frame
+        
+    def _build_frame(self, index: int, source: Optional[pygame.Surface] = None) -> pygame.Surface:
+        frame = pygame.transform.rotate(self.surface if source is None else source, index * self.angle_step)
+        self.frames[index] = frame
+        return frame
+        
+    def build_all(self, source: Optional[pygame.Surface] = None):
+        for index in range(self.steps):
+            if self.frames[index] is None:
+                self._build_frame(index, source)
+                
+    def build_in_background(self) -> threading.Thread:
+        if self._thread is None:
+            # rotate locks its source, and the main thread keeps blitting self.surface meanwhile
+            source = self.surface.copy()
+            self._thread = threading.Thread(target=self.build_all, args=(source,), name="py2d-rotation-atlas",
+                                            daemon=True)
+            self._thread.start()
+        return self._thread
+        
+    @property
+    def is_complete(self) -> bool:
+        return all(frame is not None for frame in self.frames)
 
 class Sprite:
-    def __init__(self, image_path: str = None, width: int = 32, height: int = 32, color: Color = None):
+    transform_cache: Optional[TransformCache] = _shared_transform_cache
+    asset_registry: Optional[AssetRegistry] = asset_registry
+    
+    def __init__(self, image_path: str = None, width: int = 32, height: int = 32, color: Color = None,
+                 image: pygame.Surface = None):
         self.image = None
+        self.image_path: Optional[str] = None
         self.width = width
         self.height = height
         self.color = color or Color(255, 255, 255)
+        self.rotation_atlas: Optional[RotationAtlas] = None
+        self._atlas_image = None
+        self._image_release: Optional[weakref.finalize] = None
         
-        if image_path:
+        if image is not None:
+            self.image = image
+            self.width = image.get_width()
+            self.height = image.get_height()
+        elif image_path:
             self.load_image(image_path)
         else:
             self.create_colored_surface()
             
     def load_image(self, image_path: str):
+        self.release_image()
         try:
-            self.image = pygame.image.load(image_path).convert_alpha()
+            registry = self.asset_registry
+            if registry is not None:
+                self.image = registry.acquire_image(image_path)
+                # Drop the shared reference once this sprite is garbage collected
+                self._image_release = weakref.finalize(self, registry.release_image, image_path)
+            else:
+                self.image = pygame.image.load(image_path).convert_alpha()
+            self.image_path = image_path
             self.width = self.image.get_width()
             self.height = self.image.get_height()
         except pygame.error:
+            # Undecodable data falls back as before; missing or unreadable files still raise OSError
             self.create_colored_surface()
             
+    def release_image(self):
+        if self._image_release is not None:
+            self._image_release()
+            self._image_release = None
+            
     def create_colored_surface(self):
+        self.release_image()
         self.image = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
         self.image.fill(self.color.rgba)
+        self.image_path = None
         
-    def render(self, screen, position: Vector2, rotation: float = 0, scale: Vector2 = None, camera=None):
+    def set_image(self, image: pygame.Surface):
+        self.release_image()
+        self.image = image
+        self.image_path = None
+        self.width = image.get_width()
+        self.height = image.get_height()
+        self.mark_dirty()
+        
+    def mark_dirty(self):
+        # Call after drawing into image in place, so no stale scaled or rotated copy is drawn
         if not self.image:
             return
+        if self.transform_cache is not None:
+            self.transform_cache.invalidate(self.image)
+        if self.rotation_atlas is not None and self._atlas_image is self.image:
+            self.rotation_atlas.invalidate()
+            
+    def enable_rotation_atlas(self, steps: int = 64, eager: bool = False) -> Optional[RotationAtlas]:
+        if not self.image:
+            return None
+        # Sprites loaded from the same file share one atlas
+        key = self.image_path or self.image
+        self.rotation_atlas = RotationAtlas.shared(key, self.image, steps)
+        self._atlas_image = self.image
+        if eager:
+            self.rotation_atlas.build_in_background()
+        return self.rotation_atlas
+        
+    def disable_rotation_atlas(self):
+        self.rotation_atlas = None
+        self._atlas_image = None
+        
+    def get_blit(self, position: Vector2, rotation: float = 0, scale: Vector2 = None, camera=None):
+        if not self.image:
+            return None
             
         scale = scale or Vector2(1, 1)
         
@@ -41,13 +263,25 @@ class Sprite:
             scaled_width = int(self.width * scale.x)
             scaled_height = int(self.height * scale.y)
             
-            if scaled_width > 0 and scaled_height > 0:
+            if scaled_width <= 0 or scaled_height <= 0:
+                return None
+                
+            atlas = self.rotation_atlas
+            if atlas is not None and scale.x == 1 and scale.y == 1 and self._atlas_image is self.image:
+                scaled_image = atlas.get_frame(rotation)
+            elif self.transform_cache is not None:
+                scaled_image = self.transform_cache.get(self.image, scaled_width, scaled_height, rotation)
+            else:
                 scaled_image = pygame.transform.scale(self.image, (scaled_width, scaled_height))
                 if rotation != 0:
                     scaled_image = pygame.transform.rotate(scaled_image, rotation)
-                screen.blit(scaled_image, (screen_pos.x - scaled_width//2, screen_pos.y - scaled_height//2))
-        else:
-            screen.blit(self.image, (screen_pos.x - self.width//2, screen_pos.y - self.height//2))
+            return scaled_image, (screen_pos.x - scaled_width//2, screen_pos.y - scaled_height//2)
+        return self.image, (screen_pos.x - self.width//2, screen_pos.y - self.height//2)
+        
+    def render(self, screen, position: Vector2, rotation: float = 0, scale: Vector2 = None, camera=None):
+        blit = self.get_blit(position, rotation, scale, camera)
+        if blit:
+            screen.blit(*blit)
 
 class Animation:
     def __init__(self, frames: List[pygame.Surface], frame_duration: float = 0.1):
@@ -143,6 +377,8 @@ class Text:
         screen.blit(self.surface, (screen_pos.x, screen_pos.y))
 
 class Shape:
+    transform_cache: Optional[TransformCache] = _shared_transform_cache
+    
     def __init__(self, shape_type: str, width: int, height: int, color: Color = Color(255, 255, 255)):
         self.shape_type = shape_type
         self.width = width
@@ -163,9 +399,9 @@ class Shape:
         elif self.shape_type == "ellipse":
             pygame.draw.ellipse(self.surface, self.color.rgba, (0, 0, self.width, self.height))
             
-    def render(self, screen, position: Vector2, rotation: float = 0, scale: Vector2 = None, camera=None):
+    def get_blit(self, position: Vector2, rotation: float = 0, scale: Vector2 = None, camera=None):
         if not self.surface:
-            return
+            return None
             
         scale = scale or Vector2(1, 1)
         
@@ -178,45 +414,181 @@ class Shape:
             scaled_width = int(self.width * scale.x)
             scaled_height = int(self.height * scale.y)
             
-            if scaled_width > 0 and scaled_height > 0:
+            if scaled_width <= 0 or scaled_height <= 0:
+                return None
+                
+            if self.transform_cache is not None:
+                scaled_surface = self.transform_cache.get(self.surface, scaled_width, scaled_height, rotation)
+            else:
                 scaled_surface = pygame.transform.scale(self.surface, (scaled_width, scaled_height))
                 if rotation != 0:
                     scaled_surface = pygame.transform.rotate(scaled_surface, rotation)
-                screen.blit(scaled_surface, (screen_pos.x - scaled_width//2, screen_pos.y - scaled_height//2))
-        else:
-            screen.blit(self.surface, (screen_pos.x - self.width//2, screen_pos.y - self.height//2))
+            return scaled_surface, (screen_pos.x - scaled_width//2, screen_pos.y - scaled_height//2)
+        return self.surface, (screen_pos.x - self.width//2, screen_pos.y - self.height//2)
+        
+    def render(self, screen, position: Vector2, rotation: float = 0, scale: Vector2 = None, camera=None):
+        blit = self.get_blit(position, rotation, scale, camera)
+        if blit:
+            screen.blit(*blit)
 
 class TileMap:
-    def __init__(self, tile_width: int, tile_height: int, map_width: int, map_height: int):
+    def __init__(self, tile_width: int, tile_height: int, map_width: int, map_height: int,
+                 chunk_size: int = 16, max_cached_chunks: int = 64, storage=None):
+        if chunk_size <= 0 or max_cached_chunks <= 0:
+            raise ValueError("chunk_size and max_cached_chunks must be positive")
         self.tile_width = tile_width
         self.tile_height = tile_height
         self.map_width = map_width
         self.map_height = map_height
-        self.tiles = {}
+        # Any object with get_tile/set_tile; see py2d_game.tiles for compact backends
+        self.tiles = storage if storage is not None else DictTileStorage()
         self.tile_sprites = {}
+        self.chunk_size = chunk_size
+        self.max_cached_chunks = max_cached_chunks
+        # Margin around each chunk surface for tile sprites that overhang their cell
+        self.chunk_padding = (0, 0)
+        # (cx, cy) -> pre-rendered surface, or None for a chunk with nothing to draw
+        self.chunks: OrderedDict = OrderedDict()
+        self.dirty_chunks = set()
+        self.chunk_redraws = 0
+        self.change_callbacks: List = []
         
     def set_tile(self, x: int, y: int, tile_id: int):
         if 0 <= x < self.map_width and 0 <= y < self.map_height:
-            self.tiles[(x, y)] = tile_id
+            self.tiles.set_tile(x, y, tile_id)
+            key = (x // self.chunk_size, y // self.chunk_size)
+            if key in self.chunks:
+                self.dirty_chunks.add(key)
+            for callback in self.change_callbacks:
+                callback(x, y, tile_id)
+                
+    def add_change_callback(self, callback):
+        self.change_callbacks.append(callback)
+        
+    def remove_change_callback(self, callback):
+        if callback in self.change_callbacks:
+            self.change_callbacks.remove(callback)
             
     def get_tile(self, x: int, y: int) -> int:
-        return self.tiles.get((x, y), 0)
+        return self.tiles.get_tile(x, y)
         
     def add_tile_sprite(self, tile_id: int, sprite: Sprite):
         self.tile_sprites[tile_id] = sprite
+        self.update_chunk_padding()
+        self.invalidate_chunks()
+        
+    def update_chunk_padding(self):
+        pad_x = pad_y = 0
+        for sprite in self.tile_sprites.values():
+            # Sprites are centred on the cell, so odd sizes can overhang one side by a pixel more
+            pad_x = max(pad_x, sprite.width // 2 - self.tile_width // 2,
+                        sprite.width - sprite.width // 2 - (self.tile_width - self.tile_width // 2))
+            pad_y = max(pad_y, sprite.height // 2 - self.tile_height // 2,
+                        sprite.height - sprite.height // 2 - (self.tile_height - self.tile_height // 2))
+        self.chunk_padding = (pad_x, pad_y)
+        
+    def invalidate_chunks(self):
+        self.dirty_chunks.update(self.chunks)
+        
+    def get_chunk_surface(self, cx: int, cy: int) -> Optional[pygame.Surface]:
+        key = (cx, cy)
+        chunks = self.chunks
+        if key in chunks:
+            chunks.move_to_end(key)
+            if key not in self.dirty_chunks:
+                return chunks[key]
+            self.dirty_chunks.discard(key)
+            surface = chunks[key]
+            if surface is not None and Sprite.transform_cache is not None:
+                Sprite.transform_cache.invalidate(surface)
+        else:
+            surface = None
+            
+        chunks[key] = surface = self._draw_chunk(cx, cy, surface)
+        while len(chunks) > self.max_cached_chunks:
+            old_key, old_surface = chunks.popitem(last=False)
+            self.dirty_chunks.discard(old_key)
+            if old_surface is not None and Sprite.transform_cache is not None:
+                Sprite.transform_cache.invalidate(old_surface)
+        return surface
+        
+    def _draw_chunk(self, cx: int, cy: int, surface: Optional[pygame.Surface]) -> Optional[pygame.Surface]:
+        self.chunk_redraws += 1
+        size = self.chunk_size
+        tile_width = self.tile_width
+        tile_height = self.tile_height
+        tile_sprites = self.tile_sprites
+        get_tile = self.tiles.get_tile
+        start_x = cx * size
+        start_y = cy * size
+        pad_x, pad_y = self.chunk_padding
+        
+        blits = []
+        for y in range(start_y, min(start_y + size, self.map_height)):
+            top = (y - start_y) * tile_height + tile_height // 2 + pad_y
+            for x in range(start_x, min(start_x + size, self.map_width)):
+                sprite = tile_sprites.get(get_tile(x, y))
+                if sprite is not None and sprite.image:
+                    blits.append((sprite.image, ((x - start_x) * tile_width + tile_width // 2 - sprite.width // 2 + pad_x,
+                                                 top - sprite.height // 2)))
+        if not blits:
+            return None
+            
+        surface_size = (size * tile_width + 2 * pad_x, size * tile_height + 2 * pad_y)
+        if surface is None or surface.get_size() != surface_size:
+            surface = pygame.Surface(surface_size, pygame.SRCALPHA)
+        else:
+            surface.fill((0, 0, 0, 0))
+        surface.blits(blits, False)
+        return surface
+        
+    def render(self, screen, camera, offset: Optional[Vector2] = None):
+        if offset is None:
+            offset = Vector2(0, 0)
+        chunk_width = self.chunk_size * self.tile_width
+        chunk_height = self.chunk_size * self.tile_height
+        pad_x, pad_y = self.chunk_padding
+        left, top, right, bottom = camera.get_visible_rect(*screen.get_size(), max(pad_x, pad_y) * camera.zoom)
+        start_cx = max(0, int((left - offset.x) // chunk_width))
+        start_cy = max(0, int((top - offset.y) // chunk_height))
+        end_cx = min(-(-self.map_width // self.chunk_size), int((right - offset.x) // chunk_width) + 1)
+        end_cy = min(-(-self.map_height // self.chunk_size), int((bottom - offset.y) // chunk_height) + 1)
+        
+        zoom = camera.zoom
+        rotation = camera.rotation % 360
+        transformed = zoom != 1 or rotation != 0
+        width = int((chunk_width + 2 * pad_x) * zoom + 0.999)
+        height = int((chunk_height + 2 * pad_y) * zoom + 0.999)
+        cache = Sprite.transform_cache
+        a, b, tx, c, d, ty = camera.get_matrix()
+        
+        blits = []
+        for cy in range(start_cy, end_cy):
+            for cx in range(start_cx, end_cx):
+                surface = self.get_chunk_surface(cx, cy)
+                if surface is None:
+                    continue
+                if not transformed:
+                    x = cx * chunk_width + offset.x - pad_x
+                    y = cy * chunk_height + offset.y - pad_y
+                    blits.append((surface, (a * x + b * y + tx, c * x + d * y + ty)))
+                    continue
+                    
+                # Scale and rotate the chunk about its centre to follow the camera
+                if cache is not None:
+                    image = cache.get(surface, width, height, rotation)
+                else:
+                    image = pygame.transform.rotate(pygame.transform.scale(surface, (width, height)), rotation)
+                x = (cx + 0.5) * chunk_width + offset.x
+                y = (cy + 0.5) * chunk_height + offset.y
+                blits.append((image, (a * x + b * y + tx - image.get_width() / 2,
+                                      c * x + d * y + ty - image.get_height() / 2)))
+        screen.blits(blits, False)
         
-    def render(self, screen, camera, offset: Vector2 = Vector2(0, 0)):
-        start_x = max(0, int((camera.position.x - offset.x - camera.width/2) // self.tile_width))
-        start_y = max(0, int((camera.position.y - offset.y - camera.height/2) // self.tile_height))
-        end_x = min(self.map_width, int((camera.position.x - offset.x + camera.width/2) // self.tile_width) + 1)
-        end_y = min(self.map_height, int((camera.position.y - offset.y + camera.height/2) // self.tile_height) + 1)
-        
-        for y in range(start_y, end_y):
-            for x in range(start_x, end_x):
-                tile_id = self.get_tile(x, y)
-                if tile_id in self.tile_sprites:
-                    world_pos = Vector2(
-                        x * self.tile_width + self.tile_width // 2 + offset.x,
-                        y * self.tile_height + self.tile_height // 2 + offset.y
-                    )
-                    self.tile_sprites[tile_id].render(screen, world_pos, 0, Vector2(1, 1), camera)
+    def get_stats(self) -> dict:
+        return {
+            'cached_chunks': len(self.chunks),
+            'dirty_chunks': len(self.dirty_chunks),
+            'chunk_redraws': self.chunk_redraws,
+            'chunk_padding': self.chunk_padding,
+        }
@@ -67,6 +67,10 @@ class InputManager:
         self.mouse_position = Vector2(mouse_pos[0], mouse_pos[1])
         self.mouse_delta = self.mouse_position - old_pos
                 
+    def has_active_input(self) -> bool:
+        return bool(self.keys_pressed or self.keys_just_released or self.mouse_buttons_pressed
+                    or self.mouse_buttons_just_released or self.mouse_wheel)
+        
     def is_key_pressed(self, key) -> bool:
         if isinstance(key, str):
             key = self.key_mappings.get(key, key)
@@ -1,6 +1,14 @@
 import pygame
-from typing import List, Optional, Callable
-from .utils import Vector2, Math2D
+from typing import Dict, Iterable, List, Optional, Callable, Tuple
+from .utils import Vector2, Vector2Array, Math2D, SpatialHash
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Edges closer than this only touch; resting contacts drift by float rounding, not by real penetration
+_TILE_CONTACT_EPSILON = 1e-6
 
 class Collider2D:
     def __init__(self, width: float, height: float, is_trigger: bool = False):
@@ -9,6 +17,13 @@ class Collider2D:
         self.is_trigger = is_trigger
         self.offset = Vector2(0, 0)
         self.game_object = None
+        # Position at the end of the last tile collision pass, for the swept query
+        self.tile_position: Optional[Tuple[float, float]] = None
+        
+    def reset_tile_position(self):
+        # Call after teleporting so the next tile pass doesn't sweep from the old position
+        obj = self.game_object
+        self.tile_position = (obj.position.x, obj.position.y) if obj is not None else None
         
     def get_bounds(self, position: Vector2) -> pygame.Rect:
         return pygame.Rect(
@@ -44,8 +59,62 @@ class Collider2D:
             else:
                 return Vector2(0, 1)   # obj1 is below
 
+class _BatchField:
+    def __init__(self, cast: type = float):
+        self.cast = cast
+        
+    def __set_name__(self, owner, name):
+        self.name = name
+        
+    def __get__(self, body, owner=None):
+        if body is None:
+            return self
+        return self.cast(getattr(body._batch, self.name)[body._row])
+        
+    def __set__(self, body, value):
+        getattr(body._batch, self.name)[body._row] = value
+
+class _BatchVelocity(_BatchField):
+    def __get__(self, body, owner=None):
+        if body is None:
+            return self
+        return _VelocityView(body)
+        
+    def __set__(self, body, value):
+        row = body._batch.velocity[body._row]
+        row[0] = value.x
+        row[1] = value.y
+
+class _VelocityView(Vector2):
+    __slots__ = ('_body',)
+    
+    def __init__(self, body: 'RigidBody2D'):
+        self._body = body
+        
+    @property
+    def x(self) -> float:
+        body = self._body
+        return float(body._batch.velocity[body._row, 0])
+        
+    @x.setter
+    def x(self, value: float):
+        body = self._body
+        body._batch.velocity[body._row, 0] = value
+        
+    @property
+    def y(self) -> float:
+        body = self._body
+        return float(body._batch.velocity[body._row, 1])
+        
+    @y.setter
+    def y(self, value: float):
+        body = self._body
+        body._batch.velocity[body._row, 1] = value
+
 class RigidBody2D:
     def __init__(self, mass: float = 1.0, gravity_scale: float = 1.0):
+        self._batch: Optional['RigidBodyBatch'] = None
+        self._row = -1
         self.mass = mass
         self.velocity = Vector2(0, 0)
         self.angular_velocity = 0.0
@@ -59,31 +128,456 @@ class RigidBody2D:
         
     def add_force(self, force: Vector2):
         if not self.is_kinematic:
-            self.velocity += force / self.mass
+            self.velocity.add_scaled(force, 1 / self.mass)
             
     def add_impulse(self, impulse: Vector2):
         if not self.is_kinematic:
             self.velocity += impulse
             
     def set_velocity(self, velocity: Vector2):
-        self.velocity = velocity
+        # Copied: the integrator scales velocity in place
+        self.velocity = Vector2(velocity.x, velocity.y)
         
     def set_angular_velocity(self, angular_velocity: float):
         self.angular_velocity = angular_velocity
+        
+    def reset(self):
+        self.velocity = Vector2(0, 0)
+        self.angular_velocity = 0.0
+
+_batched_classes: Dict[type, type] = {}
+
+def _batched_class(cls: type) -> type:
+    # While a body is in a batch its class is swapped for one whose fields read and write the
+    # batch row, so bodies outside a batch keep plain attribute access
+    batched = _batched_classes.get(cls)
+    if batched is None:
+        namespace = {"velocity": _BatchVelocity(), "_unbatched_class": cls}
+        for name, cast in RigidBodyBatch._SCALAR_FIELDS.items():
+            namespace[name] = _BatchField(cast)
+        batched = _batched_classes[cls] = type(cls.__name__, (cls,), namespace)
+    return batched
+
+class RigidBodyBatch:
+    _SCALAR_FIELDS = {
+        "angular_velocity": float, "gravity_scale": float, "drag": float, "angular_drag": float,
+        "is_kinematic": bool, "freeze_position_x": bool, "freeze_position_y": bool, "freeze_rotation": bool,
+    }
+    
+    def __init__(self, capacity: int = 64):
+        if np is None:
+            raise ImportError("RigidBodyBatch requires numpy (pip install py2d-game[numpy])")
+        capacity = max(1, capacity)
+        self.bodies: List[RigidBody2D] = []
+        self.velocity = np.zeros((capacity, 2))
+        self.angular_velocity = np.zeros(capacity)
+        self.gravity_scale = np.zeros(capacity)
+        self.drag = np.zeros(capacity)
+        self.angular_drag = np.zeros(capacity)
+        self.is_kinematic = np.zeros(capacity, dtype=bool)
+        self.freeze_position_x = np.zeros(capacity, dtype=bool)
+        self.freeze_position_y = np.zeros(capacity, dtype=bool)
+        self.freeze_rotation = np.zeros(capacity, dtype=bool)
+        
+    @property
+    def capacity(self) -> int:
+        return len(self.velocity)
+        
+    def __len__(self) -> int:
+        return len(self.bodies)
+        
+    def velocity_array(self) -> Vector2Array:
+        # A view: writes go straight to the bodies, until the batch grows
+        return Vector2Array(self.velocity[:len(self.bodies)])
+        
+    def _grow(self):
+        capacity = self.capacity * 2
+        for name in ("velocity",) + tuple(self._SCALAR_FIELDS):
+            old = getattr(self, name)
+            new = np.zeros((capacity,) + old.shape[1:], dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, name, new)
+            
+    def add(self, body: RigidBody2D):
+        if body._batch is not None:
+            raise ValueError("RigidBody2D already belongs to a batch")
+        if len(self.bodies) == self.capacity:
+            self._grow()
+            
+        row = len(self.bodies)
+        values = body.__dict__
+        velocity = values["velocity"]
+        self.velocity[row, 0] = velocity.x
+        self.velocity[row, 1] = velocity.y
+        for name in self._SCALAR_FIELDS:
+            getattr(self, name)[row] = values[name]
+            
+        self.bodies.append(body)
+        body._batch = self
+        body._row = row
+        body.__class__ = _batched_class(type(body))
+        
+    def remove(self, body: RigidBody2D):
+        if body._batch is not self:
+            return
+            
+        row = body._row
+        values = body.__dict__
+        values["velocity"] = Vector2(float(self.velocity[row, 0]), float(self.velocity[row, 1]))
+        for name, cast in self._SCALAR_FIELDS.items():
+            values[name] = cast(getattr(self, name)[row])
+        body.__class__ = body._unbatched_class
+        body._batch = None
+        body._row = -1
+        
+        last = len(self.bodies) - 1
+        moved = self.bodies.pop()
+        if row != last:
+            self.velocity[row] = self.velocity[last]
+            for name in self._SCALAR_FIELDS:
+                column = getattr(self, name)
+                column[row] = column[last]
+            self.bodies[row] = moved
+            moved._row = row
+            
+    def step(self, gravity: Vector2, delta_time: float):
+        count = len(self.bodies)
+        if count == 0:
+            return
+            
+        velocity = self.velocity[:count]
+        dynamic = ~self.is_kinematic[:count]
+        gravity_scale = self.gravity_scale[:count]
+        
+        # Same operation order as the scalar path so both modes agree bit for bit
+        move_x = dynamic & ~self.freeze_position_x[:count]
+        move_y = dynamic & ~self.freeze_position_y[:count]
+        velocity[:, 0] += np.where(move_x, gravity.x * gravity_scale * delta_time, 0.0)
+        velocity[:, 1] += np.where(move_y, gravity.y * gravity_scale * delta_time, 0.0)
+        
+        drag_factor = np.where(dynamic, 1 - self.drag[:count] * delta_time, 1.0)
+        velocity *= drag_factor[:, None]
+        
+        angular_factor = np.where(dynamic, 1 - self.angular_drag[:count] * delta_time, 1.0)
+        self.angular_velocity[:count] *= angular_factor
+
+def collider_bounds_array(colliders: List[Collider2D]):
+    if np is None:
+        raise ImportError("collider_bounds_array requires numpy (pip install py2d-game[numpy])")
+    count = len(colliders)
+    values = np.zeros((count, 6))
+    for i, collider in enumerate(colliders):
+        if not collider.game_object:
+            continue
+        position = collider.game_object.position
+        values[i] = (position.x, position.y, collider.offset.x, collider.offset.y, collider.width, collider.height)
+        
+    # Mirrors Collider2D.get_bounds, including pygame.Rect truncating toward zero
+    bounds = np.empty((count, 4), dtype=np.int64)
+    bounds[:, 0] = np.trunc(values[:, 0] + values[:, 2] - values[:, 4] / 2)
+    bounds[:, 1] = np.trunc(values[:, 1] + values[:, 3] - values[:, 5] / 2)
+    bounds[:, 2] = np.trunc(values[:, 4])
+    bounds[:, 3] = np.trunc(values[:, 5])
+    return bounds
+
+def aabb_overlaps(bounds, first, second):
+    if np is None:
+        raise ImportError("aabb_overlaps requires numpy (pip install py2d-game[numpy])")
+    first = np.asarray(first, dtype=np.intp)
+    second = np.asarray(second, dtype=np.intp)
+    a = bounds[first]
+    b = bounds[second]
+    a_left, a_top, a_width, a_height = a[:, 0], a[:, 1], a[:, 2], a[:, 3]
+    b_left, b_top, b_width, b_height = b[:, 0], b[:, 1], b[:, 2], b[:, 3]
+    a_right = a_left + a_width
+    a_bottom = a_top + a_height
+    b_right = b_left + b_width
+    b_bottom = b_top + b_height
+    
+    # Same test as pygame.Rect.colliderect
+    overlaps = (
+        (a_width != 0) & (a_height != 0) & (b_width != 0) & (b_height != 0)
+        & (np.minimum(a_left, a_right) < np.maximum(b_left, b_right))
+        & (np.minimum(a_top, a_bottom) < np.maximum(b_top, b_bottom))
+        & (np.maximum(a_left, a_right) > np.minimum(b_left, b_right))
+        & (np.maximum(a_top, a_bottom) > np.minimum(b_top, b_bottom))
+    )
+    
+    depths = np.empty((len(first), 2), dtype=np.int64)
+    depths[:, 0] = np.minimum(a_right, b_right) - np.maximum(a_left, b_left)
+    depths[:, 1] = np.minimum(a_bottom, b_bottom) - np.maximum(a_top, b_top)
+    
+    # Same rules as Collider2D.get_collision_normal
+    horizontal = depths[:, 0] < depths[:, 1]
+    normals = np.zeros((len(first), 2), dtype=np.int64)
+    normals[:, 0] = np.where(horizontal, np.where(a_left + a_width // 2 < b_left + b_width // 2, -1, 1), 0)
+    normals[:, 1] = np.where(horizontal, 0, np.where(a_top + a_height // 2 < b_top + b_height // 2, -1, 1))
+    return overlaps, depths, normals
+
+class BroadPhase:
+    def find_pairs(self, colliders: List[Collider2D]) -> Iterable[Tuple[int, int]]:
+        raise NotImplementedError
+        
+    def clear(self):
+        pass
+
+class BruteForceBroadPhase(BroadPhase):
+    def find_pairs(self, colliders: List[Collider2D]) -> Iterable[Tuple[int, int]]:
+        count = len(colliders)
+        for i in range(count):
+            for j in range(i + 1, count):
+                yield (i, j)
+
+class SpatialHashBroadPhase(BroadPhase):
+    def __init__(self, cell_size: float = 64.0):
+        self.grid = SpatialHash(cell_size)
+        self._last_keys: Dict[Collider2D, Tuple[float, ...]] = {}
+        self.relinked_count = 0
+        
+    @property
+    def cell_size(self) -> float:
+        return self.grid.cell_size
+        
+    def find_pairs(self, colliders: List[Collider2D]) -> Iterable[Tuple[int, int]]:
+        grid = self.grid
+        last_keys = self._last_keys
+        index: Dict[Collider2D, int] = {}
+        relinked = 0
+        
+        for i, collider in enumerate(colliders):
+            if not collider.game_object:
+                continue
+            index[collider] = i
+            position = collider.game_object.position
+            key = (position.x, position.y, collider.offset.x, collider.offset.y, collider.width, collider.height)
+            if last_keys.get(collider) == key:
+                continue
+            last_keys[collider] = key
+            bounds = collider.get_bounds(position)
+            if grid.update(collider, bounds.left, bounds.top, bounds.right, bounds.bottom):
+                relinked += 1
+                
+        if len(last_keys) != len(index):
+            for stale in [collider for collider in last_keys if collider not in index]:
+                del last_keys[stale]
+                grid.remove(stale)
+                
+        self.relinked_count = relinked
+        
+        pairs = set()
+        for members in grid.cells.values():
+            if len(members) < 2:
+                continue
+            ids = sorted(index[collider] for collider in members)
+            for a in range(len(ids)):
+                first = ids[a]
+                for b in range(a + 1, len(ids)):
+                    pairs.add((first, ids[b]))
+        return sorted(pairs)
+        
+    def clear(self):
+        self.grid.clear()
+        self._last_keys.clear()
+
+class SweepAndPruneBroadPhase(BroadPhase):
+    def __init__(self):
+        self.endpoints: List[list] = []
+        self._entries: Dict[Collider2D, list] = {}
+        self.swap_count = 0
+        
+    def _refresh(self, colliders: List[Collider2D]) -> Dict[Collider2D, int]:
+        entries = self._entries
+        endpoints = self.endpoints
+        index: Dict[Collider2D, int] = {}
+        
+        for i, collider in enumerate(colliders):
+            if not collider.game_object:
+                continue
+            index[collider] = i
+            bounds = collider.get_bounds(collider.game_object.position)
+            entry = entries.get(collider)
+            if entry is None:
+                entry = [collider, bounds.left, bounds.right, bounds.top, bounds.bottom]
+                entries[collider] = entry
+                endpoints.append([bounds.left, 0, entry])
+                endpoints.append([bounds.right, 1, entry])
+            else:
+                entry[1] = bounds.left
+                entry[2] = bounds.right
+                entry[3] = bounds.top
+                entry[4] = bounds.bottom
+                
+        if len(entries) != len(index):
+            stale = [collider for collider in entries if collider not in index]
+            for collider in stale:
+                del entries[collider]
+            self.endpoints = endpoints = [endpoint for endpoint in endpoints if endpoint[2][0] in index]
+            
+        for endpoint in endpoints:
+            entry = endpoint[2]
+            endpoint[0] = entry[2] if endpoint[1] else entry[1]
+        return index
+        
+    def _sort_endpoints(self):
+        # Insertion sort: nearly linear when objects move coherently between frames
+        endpoints = self.endpoints
+        swaps = 0
+        for i in range(1, len(endpoints)):
+            item = endpoints[i]
+            value = item[0]
+            is_max = item[1]
+            j = i - 1
+            while j >= 0:
+                previous = endpoints[j]
+                if previous[0] < value or (previous[0] == value and previous[1] <= is_max):
+                    break
+                endpoints[j + 1] = previous
+                j -= 1
+                swaps += 1
+            endpoints[j + 1] = item
+        self.swap_count = swaps
+        
+    def find_pairs(self, colliders: List[Collider2D]) -> Iterable[Tuple[int, int]]:
+        index = self._refresh(colliders)
+        self._sort_endpoints()
+        
+        active: Dict[Collider2D, list] = {}
+        pairs = []
+        for _, is_max, entry in self.endpoints:
+            collider = entry[0]
+            if is_max:
+                del active[collider]
+                continue
+                
+            top = entry[3]
+            bottom = entry[4]
+            i = index[collider]
+            for other in active.values():
+                if other[3] <= bottom and top <= other[4]:
+                    j = index[other[0]]
+                    pairs.append((i, j) if i < j else (j, i))
+            active[collider] = entry
+            
+        pairs.sort()
+        return pairs
+        
+    def clear(self):
+        self.endpoints = []
+        self._entries.clear()
+
+class TileCollisionLayer:
+    def __init__(self, tilemap, solid_tiles: Optional[Iterable[int]] = None, offset: Vector2 = None,
+                 chunk_size: int = 32):
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be positive")
+        self.tilemap = tilemap
+        self.solid_tiles = set(solid_tiles) if solid_tiles is not None else None
+        self.offset = offset or Vector2(0, 0)
+        self.chunk_size = chunk_size
+        # (cx, cy) -> merged solid rects (left, top, right, bottom) in world space
+        self.chunk_rects: Dict[Tuple[int, int], List[Tuple[float, float, float, float]]] = {}
+        tilemap.add_change_callback(self._tile_changed)
+        
+    def is_solid(self, tile_id: int) -> bool:
+        if self.solid_tiles is None:
+            return tile_id != 0
+        return tile_id in self.solid_tiles
+        
+    def _tile_changed(self, x: int, y: int, tile_id: int):
+        self.chunk_rects.pop((x // self.chunk_size, y // self.chunk_size), None)
+        
+    def invalidate(self):
+        self.chunk_rects.clear()
+        
+    def detach(self):
+        self.tilemap.remove_change_callback(self._tile_changed)
+        
+    def _merge_chunk(self, cx: int, cy: int) -> List[Tuple[float, float, float, float]]:
+        tilemap = self.tilemap
+        get_tile = tilemap.get_tile
+        is_solid = self.is_solid
+        size = self.chunk_size
+        start_x = cx * size
+        end_x = min(start_x + size, tilemap.map_width)
+        end_y = min(cy * size + size, tilemap.map_height)
+        
+        # Runs of solid tiles per row, grown downwards while the next row has the same run
+        open_runs: Dict[Tuple[int, int], int] = {}
+        merged = []
+        for y in range(cy * size, end_y + 1):
+            runs = []
+            x = start_x
+            while y < end_y and x < end_x:
+                if is_solid(get_tile(x, y)):
+                    run_start = x
+                    while x < end_x and is_solid(get_tile(x, y)):
+                        x += 1
+                    runs.append((run_start, x))
+                else:
+                    x += 1
+            next_runs = {run: open_runs.pop(run, y) for run in runs}
+            for (run_start, run_end), top in open_runs.items():
+                merged.append((run_start, top, run_end, y))
+            open_runs = next_runs
+            
+        tile_width = tilemap.tile_width
+        tile_height = tilemap.tile_height
+        offset_x = self.offset.x
+        offset_y = self.offset.y
+        return [(left * tile_width + offset_x, top * tile_height + offset_y,
+                 right * tile_width + offset_x, bottom * tile_height + offset_y)
+                for left, top, right, bottom in merged]
+        
+    def query(self, left: float, top: float, right: float, bottom: float) -> List[Tuple[float, float, float, float]]:
+        tilemap = self.tilemap
+        chunk_width = self.chunk_size * tilemap.tile_width
+        chunk_height = self.chunk_size * tilemap.tile_height
+        start_cx = max(0, int((left - self.offset.x) // chunk_width))
+        start_cy = max(0, int((top - self.offset.y) // chunk_height))
+        end_cx = min(-(-tilemap.map_width // self.chunk_size) - 1, int((right - self.offset.x) // chunk_width))
+        end_cy = min(-(-tilemap.map_height // self.chunk_size) - 1, int((bottom - self.offset.y) // chunk_height))
+        
+        found = []
+        chunk_rects = self.chunk_rects
+        for cy in range(start_cy, end_cy + 1):
+            for cx in range(start_cx, end_cx + 1):
+                rects = chunk_rects.get((cx, cy))
+                if rects is None:
+                    rects = chunk_rects[(cx, cy)] = self._merge_chunk(cx, cy)
+                for rect in rects:
+                    if rect[0] < right and rect[2] > left and rect[1] < bottom and rect[3] > top:
+                        found.append(rect)
+        return found
 
 class Physics2D:
-    def __init__(self, gravity: Vector2 = Vector2(0, 9.81)):
-        self.gravity = gravity
+    def __init__(self, gravity: Optional[Vector2] = None, broad_phase: Optional[BroadPhase] = None,
+                 batched: bool = False, batched_narrow_phase: bool = False):
+        if (batched or batched_narrow_phase) and np is None:
+            raise ImportError("Physics2D batched modes require numpy (pip install py2d-game[numpy])")
+        # A fresh default per world: the in-place vector operators would change a shared one
+        self.gravity = Vector2(0, 9.81) if gravity is None else gravity
         self.rigid_bodies: List[RigidBody2D] = []
+        self.body_batch: Optional[RigidBodyBatch] = RigidBodyBatch() if batched else None
         self.colliders: List[Collider2D] = []
         self.collision_callbacks: List[Callable] = []
+        self.broad_phase = broad_phase or BruteForceBroadPhase()
+        self.batched_narrow_phase = batched_narrow_phase
+        self.pairs_tested = 0
+        self.pairs_collided = 0
+        self.tile_layers: List[TileCollisionLayer] = []
+        self.tile_collision_callbacks: List[Callable] = []
+        self.tile_rects_tested = 0
         
     def add_rigid_body(self, rigid_body: RigidBody2D):
+        if self.body_batch is not None:
+            self.body_batch.add(rigid_body)
         self.rigid_bodies.append(rigid_body)
         
     def remove_rigid_body(self, rigid_body: RigidBody2D):
         if rigid_body in self.rigid_bodies:
             self.rigid_bodies.remove(rigid_body)
+            if self.body_batch is not None:
+                self.body_batch.remove(rigid_body)
             
     def add_collider(self, collider: Collider2D):
         self.colliders.append(collider)
@@ -91,11 +585,43 @@ class Physics2D:
     def remove_collider(self, collider: Collider2D):
         if collider in self.colliders:
             self.colliders.remove(collider)
+            collider.tile_position = None
+            
+    def add_tilemap(self, tilemap, solid_tiles: Optional[Iterable[int]] = None,
+                    offset: Vector2 = None) -> TileCollisionLayer:
+        layer = TileCollisionLayer(tilemap, solid_tiles, offset)
+        self.tile_layers.append(layer)
+        return layer
+        
+    def remove_tilemap(self, tilemap):
+        for layer in [layer for layer in self.tile_layers if layer.tilemap is tilemap]:
+            layer.detach()
+            self.tile_layers.remove(layer)
             
+    def add_tile_collision_callback(self, callback: Callable):
+        self.tile_collision_callbacks.append(callback)
+        
     def add_collision_callback(self, callback: Callable):
         self.collision_callbacks.append(callback)
         
+    def set_broad_phase(self, broad_phase: BroadPhase):
+        self.broad_phase.clear()
+        self.broad_phase = broad_phase
+        
+    def get_collision_stats(self) -> dict:
+        return {
+            "pairs_tested": self.pairs_tested,
+            "pairs_collided": self.pairs_collided,
+            "tile_rects_tested": self.tile_rects_tested,
+        }
+        
     def update(self, delta_time: float, game_objects: List):
+        if self.body_batch is not None:
+            self.body_batch.step(self.gravity, delta_time)
+            self.collide_tilemaps(delta_time)
+            self.check_collisions(game_objects)
+            return
+            
         for i, rigid_body in enumerate(self.rigid_bodies):
             if rigid_body.is_kinematic:
                 continue
@@ -108,24 +634,191 @@ class Physics2D:
             rigid_body.velocity *= (1 - rigid_body.drag * delta_time)
             rigid_body.angular_velocity *= (1 - rigid_body.angular_drag * delta_time)
             
+        self.collide_tilemaps(delta_time)
         self.check_collisions(game_objects)
         
-    def check_collisions(self, game_objects: List):
-        for i in range(len(self.colliders)):
-            for j in range(i + 1, len(self.colliders)):
-                collider1 = self.colliders[i]
-                collider2 = self.colliders[j]
+    def collide_tilemaps(self, delta_time: float):
+        self.tile_rects_tested = 0
+        if not self.tile_layers:
+            return
+            
+        for collider in self.colliders:
+            obj = collider.game_object
+            if collider.is_trigger or obj is None:
+                continue
+            rigid_body = getattr(obj, 'rigid_body', None)
+            if rigid_body is None or rigid_body.is_kinematic:
+                continue
                 
-                if not collider1.game_object or not collider2.game_object:
-                    continue
+            position = obj.position
+            previous = collider.tile_position
+            if previous is None:
+                velocity = rigid_body.velocity
+                previous = (position.x - velocity.x * delta_time, position.y - velocity.y * delta_time)
+            self._resolve_tile_collisions(collider, rigid_body, previous)
+            collider.tile_position = (position.x, position.y)
+            
+    def _resolve_tile_collisions(self, collider: Collider2D, rigid_body: RigidBody2D, previous: Tuple[float, float]):
+        obj = collider.game_object
+        position = obj.position
+        half_width = collider.width / 2
+        half_height = collider.height / 2
+        center_x = position.x + collider.offset.x
+        center_y = position.y + collider.offset.y
+        old_x = previous[0] + collider.offset.x
+        old_y = previous[1] + collider.offset.y
+        
+        # Only the tiles under the swept box can be hit this step
+        rects = []
+        for layer in self.tile_layers:
+            rects.extend(layer.query(min(old_x, center_x) - half_width, min(old_y, center_y) - half_height,
+                                     max(old_x, center_x) + half_width, max(old_y, center_y) + half_height))
+        self.tile_rects_tested += len(rects)
+        if not rects:
+            return
+            
+        # Resolve x at the old height, then y, so sliding along a floor never catches on rect seams.
+        # Each axis is clamped against the first rect its swept edge crosses, so fast bodies
+        # can't step over a wall thinner than their movement.
+        epsilon = _TILE_CONTACT_EPSILON
+        normal_x = 0
+        for rect_left, rect_top, rect_right, rect_bottom in rects:
+            if old_y - half_height >= rect_bottom - epsilon or old_y + half_height <= rect_top + epsilon:
+                continue
+            if old_x + half_width <= rect_left + epsilon and rect_left < center_x + half_width:
+                center_x = rect_left - half_width
+                normal_x = -1
+            elif center_x - half_width < rect_right and rect_right - epsilon <= old_x - half_width:
+                center_x = rect_right + half_width
+                normal_x = 1
+            elif center_x - half_width < rect_right - epsilon and center_x + half_width > rect_left + epsilon:
+                # Already overlapping, e.g. spawned inside: push out the way it came
+                if center_x != old_x:
+                    moving_right = center_x > old_x
+                else:
+                    moving_right = center_x < (rect_left + rect_right) / 2
+                if moving_right:
+                    center_x = rect_left - half_width
+                    normal_x = -1
+                else:
+                    center_x = rect_right + half_width
+                    normal_x = 1
                     
-                pos1 = collider1.game_object.position
-                pos2 = collider2.game_object.position
-                
-                if collider1.check_collision(collider2, pos1, pos2):
-                    self.handle_collision(collider1, collider2, pos1, pos2)
+        normal_y = 0
+        for rect_left, rect_top, rect_right, rect_bottom in rects:
+            if center_x - half_width >= rect_right - epsilon or center_x + half_width <= rect_left + epsilon:
+                continue
+            if old_y + half_height <= rect_top + epsilon and rect_top < center_y + half_height:
+                center_y = rect_top - half_height
+                normal_y = -1
+            elif center_y - half_height < rect_bottom and rect_bottom - epsilon <= old_y - half_height:
+                center_y = rect_bottom + half_height
+                normal_y = 1
+            elif center_y - half_height < rect_bottom - epsilon and center_y + half_height > rect_top + epsilon:
+                if center_y != old_y:
+                    moving_down = center_y > old_y
+                else:
+                    moving_down = center_y < (rect_top + rect_bottom) / 2
+                if moving_down:
+                    center_y = rect_top - half_height
+                    normal_y = -1
+                else:
+                    center_y = rect_bottom + half_height
+                    normal_y = 1
                     
-    def handle_collision(self, collider1: Collider2D, collider2: Collider2D, pos1: Vector2, pos2: Vector2):
+        if normal_x:
+            position.x = center_x - collider.offset.x
+            if rigid_body.velocity.x * normal_x < 0:
+                rigid_body.velocity.x = 0
+        if normal_y:
+            position.y = center_y - collider.offset.y
+            if rigid_body.velocity.y * normal_y < 0:
+                rigid_body.velocity.y = 0
+            if normal_y < 0 and hasattr(obj, 'on_ground'):
+                obj.on_ground = True
+        if normal_x or normal_y:
+            for callback in self.tile_collision_callbacks:
+                callback(collider, Vector2(normal_x, normal_y))
+        
+    def check_collisions(self, game_objects: List):
+        if self.batched_narrow_phase:
+            self._check_collisions_batched()
+            return
+            
+        colliders = self.colliders
+        tested = 0
+        collided = 0
+        
+        for i, j in self.broad_phase.find_pairs(colliders):
+            collider1 = colliders[i]
+            collider2 = colliders[j]
+            
+            if not collider1.game_object or not collider2.game_object:
+                continue
+                
+            pos1 = collider1.game_object.position
+            pos2 = collider2.game_object.position
+            
+            tested += 1
+            if collider1.check_collision(collider2, pos1, pos2):
+                collided += 1
+                self.handle_collision(collider1, collider2, pos1, pos2)
+                
+        self.pairs_tested = tested
+        self.pairs_collided = collided
+        
+    def _check_collisions_batched(self):
+        colliders = self.colliders
+        pairs = [
+            (i, j) for i, j in self.broad_phase.find_pairs(colliders)
+            if colliders[i].game_object and colliders[j].game_object
+        ]
+        self.pairs_tested = len(pairs)
+        self.pairs_collided = 0
+        if not pairs:
+            return
+            
+        indices = np.array(pairs, dtype=np.intp)
+        overlaps, _, normals = aabb_overlaps(collider_bounds_array(colliders), indices[:, 0], indices[:, 1])
+        
+        # Responses move objects, and the scalar path sees those moves in later pairs. Pairs that
+        # involve an object moved since the kernel ran are re-tested one by one, so results match.
+        owners = {}
+        pair_owners = np.array([[owners.setdefault(id(colliders[i].game_object), len(owners)),
+                                 owners.setdefault(id(colliders[j].game_object), len(owners))]
+                                for i, j in pairs], dtype=np.intp)
+        stale = np.zeros(len(pairs), dtype=bool)
+        candidates = np.flatnonzero(overlaps).tolist()
+        collided = 0
+        index = 0
+        while index < len(candidates):
+            k = candidates[index]
+            index += 1
+            collider1 = colliders[pairs[k][0]]
+            collider2 = colliders[pairs[k][1]]
+            pos1 = collider1.game_object.position
+            pos2 = collider2.game_object.position
+            if stale[k]:
+                if not collider1.check_collision(collider2, pos1, pos2):
+                    continue
+                normal = None
+            else:
+                normal = Vector2(int(normals[k, 0]), int(normals[k, 1]))
+            collided += 1
+            before = (pos1.x, pos1.y, pos2.x, pos2.y)
+            self.handle_collision(collider1, collider2, pos1, pos2, normal)
+            
+            moved = [pair_owners[k, 0]] if (pos1.x, pos1.y) != before[:2] else []
+            if (pos2.x, pos2.y) != before[2:]:
+                moved.append(pair_owners[k, 1])
+            if moved:
+                rest = pair_owners[k + 1:]
+                stale[k + 1:] |= np.isin(rest[:, 0], moved) | np.isin(rest[:, 1], moved)
+                candidates = candidates[:index] + (np.flatnonzero(overlaps[k + 1:] | stale[k + 1:]) + k + 1).tolist()
+        self.pairs_collided = collided
+            
+    def handle_collision(self, collider1: Collider2D, collider2: Collider2D, pos1: Vector2, pos2: Vector2,
+                         normal: Optional[Vector2] = None):
         if collider1.is_trigger or collider2.is_trigger:
             for callback in self.collision_callbacks:
                 callback(collider1, collider2, pos1, pos2)
@@ -145,7 +838,8 @@ class Physics2D:
             if rigid_body1.is_kinematic and rigid_body2.is_kinematic:
                 return
                 
-            normal = collider1.get_collision_normal(collider2, pos1, pos2)
+            if normal is None:
+                normal = collider1.get_collision_normal(collider2, pos1, pos2)
             
             # Better collision response (no shaking)
             if abs(normal.y) > abs(normal.x):  # Vertical collision
@@ -0,0 +1,175 @@
+import json
+import pygame
+from collections import deque
+from time import perf_counter
+from typing import Dict, List, Optional, Tuple
+
+def _percentile(ordered: List[float], percent: float) -> float:
+    # Nearest-rank on already sorted samples
+    rank = int(round(percent / 100.0 * (len(ordered) - 1)))
+    return ordered[max(0, min(len(ordered) - 1, rank))]
+
+class FrameProfiler:
+    PHASES = ("events", "input", "update", "render", "flip", "frame")
+    
+    def __init__(self, window: int = 300):
+        self.window = window
+        self.samples: Dict[str, deque] = {phase: deque(maxlen=window) for phase in self.PHASES}
+        self.frames_recorded = 0
+        self._font = None
+        
+    def record(self, phase: str, seconds: float):
+        samples = self.samples.get(phase)
+        if samples is None:
+            samples = self.samples[phase] = deque(maxlen=self.window)
+        samples.append(seconds)
+        
+    def record_frame(self, timings: Dict[str, float]):
+        total = 0.0
+        for phase, seconds in timings.items():
+            self.record(phase, seconds)
+            total += seconds
+        self.record("frame", total)
+        self.frames_recorded += 1
+        
+    def percentile(self, phase: str, percent: float) -> float:
+        samples = self.samples.get(phase)
+        if not samples:
+            return 0.0
+        return _percentile(sorted(samples), percent)
+        
+    def get_stats(self) -> Dict[str, Dict[str, float]]:
+        stats = {}
+        for phase, samples in self.samples.items():
+            if not samples:
+                continue
+            ordered = sorted(samples)
+            stats[phase] = {
+                "last_ms": samples[-1] * 1000.0,
+                "mean_ms": sum(ordered) / len(ordered) * 1000.0,
+                "p50_ms": _percentile(ordered, 50) * 1000.0,
+                "p95_ms": _percentile(ordered, 95) * 1000.0,
+                "p99_ms": _percentile(ordered, 99) * 1000.0,
+                "samples": len(ordered),
+            }
+        return stats
+        
+    def reset(self):
+        for samples in self.samples.values():
+            samples.clear()
+        self.frames_recorded = 0
+        
+    def get_overlay_lines(self) -> List[str]:
+        lines = ["phase     p50    p95    p99 ms"]
+        for phase, values in self.get_stats().items():
+            lines.append(f"{phase:<7}{values['p50_ms']:>6.2f} {values['p95_ms']:>6.2f} {values['p99_ms']:>6.2f}")
+        return lines
+        
+    def render_overlay(self, screen, position: Tuple[int, int] = (8, 8)):
+        if self._font is None:
+            if not pygame.font.get_init():
+                pygame.font.init()
+            self._font = pygame.font.Font(None, 18)
+            
+        lines = self.get_overlay_lines()
+        line_height = self._font.get_linesize()
+        width = max(self._font.size(line)[0] for line in lines) + 8
+        panel = pygame.Surface((width, line_height * len(lines) + 8), pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 160))
+        for i, line in enumerate(lines):
+            panel.blit(self._font.render(line, True, (255, 255, 255)), (4, 4 + i * line_height))
+        screen.blit(panel, position)
+
+class ObjectProfiler:
+    SORT_KEYS = ("name", "calls", "total_ms", "mean_ms", "max_ms")
+    
+    def __init__(self, sample_every: int = 1, max_trace_events: int = 200000):
+        self.sample_every = max(1, sample_every)
+        self.stats: Dict[str, list] = {}
+        self.trace_events: deque = deque(maxlen=max_trace_events)
+        self.sampling = False
+        self.frames_seen = 0
+        self.frames_sampled = 0
+        self.updates_sampled = 0
+        self._in_frame = False
+        self._origin = perf_counter()
+        
+    def begin_frame(self) -> bool:
+        # Fixed-timestep substeps run inside one frame and share its sampling decision
+        if not self._in_frame:
+            self._in_frame = True
+            self.sampling = self.frames_seen % self.sample_every == 0
+            self.frames_seen += 1
+            if self.sampling:
+                self.frames_sampled += 1
+        return self.sampling
+        
+    def end_frame(self):
+        self._in_frame = False
+        
+    def record(self, name: str, category: str, start: float, end: float):
+        duration = end - start
+        entry = self.stats.get(name)
+        if entry is None:
+            self.stats[name] = [1, duration, duration]
+        else:
+            entry[0] += 1
+            entry[1] += duration
+            if duration > entry[2]:
+                entry[2] = duration
+        self.trace_events.append((name, category, start, duration))
+        
+    def get_table(self, sort_by: str = "total_ms", descending: bool = True) -> List[dict]:
+        if sort_by not in self.SORT_KEYS:
+            raise ValueError(f"sort_by must be one of {', '.join(self.SORT_KEYS)}")
+        rows = []
+        for name, (calls, total, longest) in self.stats.items():
+            rows.append({
+                "name": name,
+                "calls": calls,
+                "total_ms": total * 1000.0,
+                "mean_ms": total / calls * 1000.0,
+                "max_ms": longest * 1000.0,
+            })
+        rows.sort(key=lambda row: row[sort_by], reverse=descending)
+        return rows
+        
+    def format_table(self, sort_by: str = "total_ms", limit: Optional[int] = 20) -> str:
+        rows = self.get_table(sort_by)
+        if limit is not None:
+            rows = rows[:limit]
+        width = max([len("name")] + [len(row["name"]) for row in rows])
+        lines = [f"{'name':<{width}} {'calls':>8} {'total ms':>10} {'mean ms':>9} {'max ms':>9}"]
+        for row in rows:
+            lines.append(
+                f"{row['name']:<{width}} {row['calls']:>8} {row['total_ms']:>10.3f} "
+                f"{row['mean_ms']:>9.4f} {row['max_ms']:>9.4f}"
+            )
+        return "\n".join(lines)
+        
+    def get_chrome_trace(self) -> dict:
+        origin = self._origin
+        events = []
+        for name, category, start, duration in self.trace_events:
+            events.append({
+                "name": name,
+                "cat": category,
+                "ph": "X",
+                "ts": (start - origin) * 1000000.0,
+                "dur": duration * 1000000.0,
+                "pid": 0,
+                "tid": 0,
+            })
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+        
+    def export_chrome_trace(self, path: str):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.get_chrome_trace(), f)
+            
+    def reset(self):
+        self.stats.clear()
+        self.trace_events.clear()
+        self.frames_seen = 0
+        self.frames_sampled = 0
+        self.updates_sampled = 0
+        self._in_frame = False
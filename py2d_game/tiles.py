@@ -0,0 +1,199 @@
+import mmap
+import struct
+import sys
+from array import array
+from typing import Dict, Iterator, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+MAP_MAGIC = b"P2DT"
+MAP_VERSION = 1
+# magic, version, reserved, width, height - little-endian, followed by uint16 tile ids row by row
+MAP_HEADER = struct.Struct("<4sHHII")
+
+class TileStorage:
+    width = 0
+    height = 0
+    
+    def get_tile(self, x: int, y: int) -> int:
+        raise NotImplementedError
+        
+    def set_tile(self, x: int, y: int, tile_id: int):
+        raise NotImplementedError
+        
+    def items(self) -> Iterator[Tuple[Tuple[int, int], int]]:
+        raise NotImplementedError
+        
+    def get(self, key: Tuple[int, int], default: int = 0) -> int:
+        return self.get_tile(*key) or default
+        
+    def __getitem__(self, key: Tuple[int, int]) -> int:
+        return self.get_tile(*key)
+        
+    def __setitem__(self, key: Tuple[int, int], tile_id: int):
+        self.set_tile(key[0], key[1], tile_id)
+        
+    def __contains__(self, key: Tuple[int, int]) -> bool:
+        return self.get_tile(*key) != 0
+        
+    def __len__(self) -> int:
+        return sum(1 for _ in self.items())
+
+class DictTileStorage(dict):
+    def get_tile(self, x: int, y: int) -> int:
+        return dict.get(self, (x, y), 0)
+        
+    def set_tile(self, x: int, y: int, tile_id: int):
+        self[(x, y)] = tile_id
+        
+    def get_memory_usage(self) -> int:
+        return sys.getsizeof(self) + sum(sys.getsizeof(key) for key in self)
+
+class DenseTileStorage(TileStorage):
+    def __init__(self, width: int, height: int):
+        self.width = width
+        self.height = height
+        self.data = array('H', bytes(2 * width * height))
+        
+    def get_tile(self, x: int, y: int) -> int:
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return self.data[y * self.width + x]
+        return 0
+        
+    def set_tile(self, x: int, y: int, tile_id: int):
+        if 0 <= x < self.width and 0 <= y < self.height:
+            self.data[y * self.width + x] = tile_id
+            
+    def items(self) -> Iterator[Tuple[Tuple[int, int], int]]:
+        width = self.width
+        for index, tile_id in enumerate(self.data):
+            if tile_id:
+                yield (index % width, index // width), tile_id
+                
+    def as_array(self):
+        if np is None:
+            raise ImportError("DenseTileStorage.as_array requires numpy (pip install py2d-game[numpy])")
+        return np.frombuffer(self.data, dtype=np.uint16).reshape(self.height, self.width)
+        
+    def get_memory_usage(self) -> int:
+        return self.data.itemsize * len(self.data)
+
+class ChunkedTileStorage(TileStorage):
+    def __init__(self, width: int, height: int, chunk_size: int = 32):
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be positive")
+        self.width = width
+        self.height = height
+        self.chunk_size = chunk_size
+        # Only chunks holding at least one non-empty tile are allocated
+        self.chunks: Dict[Tuple[int, int], array] = {}
+        self.chunk_counts: Dict[Tuple[int, int], int] = {}
+        
+    def get_tile(self, x: int, y: int) -> int:
+        size = self.chunk_size
+        chunk = self.chunks.get((x // size, y // size))
+        if chunk is None or not (0 <= x < self.width and 0 <= y < self.height):
+            return 0
+        return chunk[(y % size) * size + x % size]
+        
+    def set_tile(self, x: int, y: int, tile_id: int):
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return
+        size = self.chunk_size
+        key = (x // size, y // size)
+        chunk = self.chunks.get(key)
+        if chunk is None:
+            if not tile_id:
+                return
+            chunk = self.chunks[key] = array('H', bytes(2 * size * size))
+            self.chunk_counts[key] = 0
+            
+        index = (y % size) * size + x % size
+        previous = chunk[index]
+        chunk[index] = tile_id
+        count = self.chunk_counts[key] + (tile_id != 0) - (previous != 0)
+        if count:
+            self.chunk_counts[key] = count
+        else:
+            del self.chunks[key]
+            del self.chunk_counts[key]
+            
+    def items(self) -> Iterator[Tuple[Tuple[int, int], int]]:
+        size = self.chunk_size
+        for (cx, cy), chunk in self.chunks.items():
+            for index, tile_id in enumerate(chunk):
+                if tile_id:
+                    yield (cx * size + index % size, cy * size + index // size), tile_id
+                    
+    def __len__(self) -> int:
+        return sum(self.chunk_counts.values())
+        
+    def get_memory_usage(self) -> int:
+        return 2 * self.chunk_size * self.chunk_size * len(self.chunks)
+
+class MemoryMappedTileStorage(DenseTileStorage):
+    def __init__(self, path: str, writable: bool = True):
+        if sys.byteorder != "little":
+            raise ValueError("Memory-mapped tile maps are only supported on little-endian machines")
+        self.path = path
+        self.file = open(path, "r+b" if writable else "rb")
+        try:
+            header = self.file.read(MAP_HEADER.size)
+            if len(header) < MAP_HEADER.size:
+                raise ValueError(f"{path} is not a tile map file")
+            magic, version, _, width, height = MAP_HEADER.unpack(header)
+            if magic != MAP_MAGIC or version != MAP_VERSION:
+                raise ValueError(f"{path} is not a tile map file")
+            self.width = width
+            self.height = height
+            self.mmap = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_WRITE if writable else mmap.ACCESS_READ)
+        except Exception:
+            self.file.close()
+            raise
+        # Pages are only read from disk when a tile on them is touched
+        self.data = memoryview(self.mmap)[MAP_HEADER.size:MAP_HEADER.size + 2 * width * height].cast('H')
+        
+    @classmethod
+    def create(cls, path: str, width: int, height: int) -> 'MemoryMappedTileStorage':
+        with open(path, "wb") as file:
+            file.write(MAP_HEADER.pack(MAP_MAGIC, MAP_VERSION, 0, width, height))
+            # Extending with truncate leaves a sparse, zero-filled file on most filesystems
+            file.truncate(MAP_HEADER.size + 2 * width * height)
+        return cls(path)
+        
+    @classmethod
+    def from_storage(cls, storage: TileStorage, path: str) -> 'MemoryMappedTileStorage':
+        mapped = cls.create(path, storage.width, storage.height)
+        for (x, y), tile_id in storage.items():
+            mapped.set_tile(x, y, tile_id)
+        mapped.flush()
+        return mapped
+        
+    def as_array(self):
+        if np is None:
+            raise ImportError("MemoryMappedTileStorage.as_array requires numpy (pip install py2d-game[numpy])")
+        return np.frombuffer(self.mmap, dtype=np.uint16, count=self.width * self.height,
+                             offset=MAP_HEADER.size).reshape(self.height, self.width)
+        
+    def get_memory_usage(self) -> int:
+        return 0
+        
+    def flush(self):
+        if not self.mmap.closed:
+            self.mmap.flush()
+            
+    def close(self):
+        if self.mmap.closed:
+            return
+        self.data.release()
+        self.mmap.close()
+        self.file.close()
+        
+    def __enter__(self):
+        return self
+        
+    def __exit__(self, *exc_info):
+        self.close()
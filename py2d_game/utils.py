@@ -1,8 +1,15 @@
 import math
 import pygame
-from typing import Tuple
+from typing import Dict, Iterable, List, Set, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 class Vector2:
+    __slots__ = ('x', 'y')
+    
     def __init__(self, x: float = 0.0, y: float = 0.0):
         self.x = x
         self.y = y
@@ -19,6 +26,40 @@ class Vector2:
     def __truediv__(self, scalar: float) -> 'Vector2':
         return Vector2(self.x / scalar, self.y / scalar)
         
+    # In-place operators mutate this vector instead of allocating a new one
+    def __iadd__(self, other: 'Vector2') -> 'Vector2':
+        self.x += other.x
+        self.y += other.y
+        return self
+        
+    def __isub__(self, other: 'Vector2') -> 'Vector2':
+        self.x -= other.x
+        self.y -= other.y
+        return self
+        
+    def __imul__(self, scalar: float) -> 'Vector2':
+        self.x *= scalar
+        self.y *= scalar
+        return self
+        
+    def __itruediv__(self, scalar: float) -> 'Vector2':
+        self.x /= scalar
+        self.y /= scalar
+        return self
+        
+    def add_scaled(self, other: 'Vector2', scalar: float) -> 'Vector2':
+        self.x += other.x * scalar
+        self.y += other.y * scalar
+        return self
+        
+    def set(self, x: float, y: float) -> 'Vector2':
+        self.x = x
+        self.y = y
+        return self
+        
+    def copy(self) -> 'Vector2':
+        return Vector2(self.x, self.y)
+        
     def __eq__(self, other: 'Vector2') -> bool:
         return abs(self.x - other.x) < 0.001 and abs(self.y - other.y) < 0.001
         
@@ -44,7 +85,9 @@ class Vector2:
         return self.x * other.x + self.y * other.y
         
     def distance_to(self, other: 'Vector2') -> float:
-        return (self - other).magnitude()
+        dx = self.x - other.x
+        dy = self.y - other.y
+        return math.sqrt(dx * dx + dy * dy)
         
     def to_tuple(self) -> Tuple[float, float]:
         return (self.x, self.y)
@@ -52,6 +95,148 @@ class Vector2:
     def __str__(self) -> str:
         return f"Vector2({self.x}, {self.y})"
 
+class Vector2Array:
+    def __init__(self, data=0):
+        if np is None:
+            raise ImportError("Vector2Array requires numpy (pip install py2d-game[numpy])")
+        if isinstance(data, int):
+            self.data = np.zeros((data, 2))
+        elif isinstance(data, np.ndarray):
+            # Wraps float64 (N, 2) arrays without copying, e.g. RigidBodyBatch.velocity
+            if data.ndim != 2 or data.shape[1] != 2:
+                raise ValueError("Vector2Array data must have shape (N, 2)")
+            self.data = data if data.dtype == np.float64 else data.astype(np.float64)
+        else:
+            self.data = np.array([(v.x, v.y) if isinstance(v, Vector2) else tuple(v) for v in data],
+                                 dtype=np.float64).reshape(-1, 2)
+            
+    @classmethod
+    def _wrap(cls, data) -> 'Vector2Array':
+        array = cls.__new__(cls)
+        array.data = data
+        return array
+        
+    @staticmethod
+    def _operand(other):
+        if isinstance(other, Vector2Array):
+            return other.data
+        if isinstance(other, Vector2):
+            return np.array((other.x, other.y))
+        return other
+        
+    @staticmethod
+    def _scalar(scalar):
+        # Per-element scalars broadcast across both components
+        if isinstance(scalar, np.ndarray) and scalar.ndim == 1:
+            return scalar[:, None]
+        return scalar
+        
+    @property
+    def x(self):
+        return self.data[:, 0]
+        
+    @property
+    def y(self):
+        return self.data[:, 1]
+        
+    def __len__(self) -> int:
+        return len(self.data)
+        
+    def __getitem__(self, index):
+        if isinstance(index, (int, np.integer)):
+            row = self.data[index]
+            return Vector2(float(row[0]), float(row[1]))
+        return Vector2Array._wrap(self.data[index])
+        
+    def __setitem__(self, index, value):
+        if isinstance(value, Vector2):
+            self.data[index] = (value.x, value.y)
+        else:
+            self.data[index] = self._operand(value)
+            
+    def __iter__(self):
+        for x, y in self.data.tolist():
+            yield Vector2(x, y)
+            
+    def __array__(self, dtype=None, copy=None):
+        return self.data if dtype is None else self.data.astype(dtype)
+        
+    def __add__(self, other) -> 'Vector2Array':
+        return Vector2Array._wrap(self.data + self._operand(other))
+        
+    def __sub__(self, other) -> 'Vector2Array':
+        return Vector2Array._wrap(self.data - self._operand(other))
+        
+    def __mul__(self, scalar) -> 'Vector2Array':
+        return Vector2Array._wrap(self.data * self._scalar(scalar))
+        
+    def __truediv__(self, scalar) -> 'Vector2Array':
+        return Vector2Array._wrap(self.data / self._scalar(scalar))
+        
+    def __iadd__(self, other) -> 'Vector2Array':
+        self.data += self._operand(other)
+        return self
+        
+    def __isub__(self, other) -> 'Vector2Array':
+        self.data -= self._operand(other)
+        return self
+        
+    def __imul__(self, scalar) -> 'Vector2Array':
+        self.data *= self._scalar(scalar)
+        return self
+        
+    def __itruediv__(self, scalar) -> 'Vector2Array':
+        self.data /= self._scalar(scalar)
+        return self
+        
+    def add_scaled(self, other, scalar) -> 'Vector2Array':
+        self.data += self._operand(other) * self._scalar(scalar)
+        return self
+        
+    def magnitude(self):
+        return np.hypot(self.data[:, 0], self.data[:, 1])
+        
+    def normalized(self) -> 'Vector2Array':
+        magnitude = self.magnitude()
+        # Zero vectors stay zero, as with Vector2.normalized
+        safe = np.where(magnitude == 0, 1.0, magnitude)
+        return Vector2Array._wrap(self.data / safe[:, None])
+        
+    def rotate(self, angle_degrees) -> 'Vector2Array':
+        angle = np.radians(angle_degrees)
+        cos_a = np.cos(angle)
+        sin_a = np.sin(angle)
+        x = self.data[:, 0]
+        y = self.data[:, 1]
+        return Vector2Array._wrap(np.stack((x * cos_a - y * sin_a, x * sin_a + y * cos_a), axis=1))
+        
+    def dot(self, other):
+        other = self._operand(other)
+        return self.data[:, 0] * other[..., 0] + self.data[:, 1] * other[..., 1]
+        
+    def distance_to(self, other):
+        delta = self.data - self._operand(other)
+        return np.hypot(delta[:, 0], delta[:, 1])
+        
+    def copy(self) -> 'Vector2Array':
+        return Vector2Array._wrap(self.data.copy())
+        
+    def to_vectors(self) -> List[Vector2]:
+        return list(self)
+        
+    @classmethod
+    def from_positions(cls, objects: Iterable) -> 'Vector2Array':
+        return cls([obj.position for obj in objects])
+        
+    def write_positions(self, objects: Iterable):
+        for obj, (x, y) in zip(objects, self.data.tolist()):
+            position = obj.position
+            position.x = x
+            position.y = y
+            
+    def __str__(self) -> str:
+        return f"Vector2Array({len(self.data)})"
+
 class Color:
     def __init__(self, r: int = 0, g: int = 0, b: int = 0, a: int = 255):
         self.r = max(0, min(255, r))
@@ -143,3 +328,73 @@ class Math2D:
         t = max(0, min(1, point_vec.dot(line_vec) / (line_vec.magnitude() ** 2)))
         projection = line_start + line_vec * t
         return point.distance_to(projection)
+
+class SpatialHash:
+    def __init__(self, cell_size: float = 64.0):
+        if cell_size <= 0:
+            raise ValueError("cell_size must be positive")
+        self.cell_size = cell_size
+        self.cells: Dict[Tuple[int, int], Set] = {}
+        self.item_cells: Dict[object, Tuple[int, int, int, int]] = {}
+        
+    def _cell_range(self, left: float, top: float, right: float, bottom: float) -> Tuple[int, int, int, int]:
+        size = self.cell_size
+        return (int(left // size), int(top // size), int(right // size), int(bottom // size))
+        
+    def _link(self, item, cell_range: Tuple[int, int, int, int]):
+        min_x, min_y, max_x, max_y = cell_range
+        cells = self.cells
+        for cx in range(min_x, max_x + 1):
+            for cy in range(min_y, max_y + 1):
+                bucket = cells.get((cx, cy))
+                if bucket is None:
+                    bucket = cells[(cx, cy)] = set()
+                bucket.add(item)
+                
+    def _unlink(self, item, cell_range: Tuple[int, int, int, int]):
+        min_x, min_y, max_x, max_y = cell_range
+        cells = self.cells
+        for cx in range(min_x, max_x + 1):
+            for cy in range(min_y, max_y + 1):
+                bucket = cells.get((cx, cy))
+                if bucket is not None:
+                    bucket.discard(item)
+                    if not bucket:
+                        del cells[(cx, cy)]
+                        
+    def update(self, item, left: float, top: float, right: float, bottom: float) -> bool:
+        cell_range = self._cell_range(left, top, right, bottom)
+        old_range = self.item_cells.get(item)
+        if old_range == cell_range:
+            return False
+        if old_range is not None:
+            self._unlink(item, old_range)
+        self._link(item, cell_range)
+        self.item_cells[item] = cell_range
+        return True
+        
+    def remove(self, item):
+        cell_range = self.item_cells.pop(item, None)
+        if cell_range is not None:
+            self._unlink(item, cell_range)
+            
+    def query(self, left: float, top: float, right: float, bottom: float) -> Set:
+        min_x, min_y, max_x, max_y = self._cell_range(left, top, right, bottom)
+        cells = self.cells
+        found = set()
+        for cx in range(min_x, max_x + 1):
+            for cy in range(min_y, max_y + 1):
+                bucket = cells.get((cx, cy))
+                if bucket:
+                    found.update(bucket)
+        return found
+        
+    def clear(self):
+        self.cells.clear()
+        self.item_cells.clear()
+        
+    def __contains__(self, item) -> bool:
+        return item in self.item_cells
+        
+    def __len__(self) -> int:
+        return len(self.item_cells)
@@ -30,6 +30,9 @@ setup(
         "pygame>=2.0.0",
     ],
     extras_require={
+        "numpy": [
+            "numpy>=1.17",
+        ],
         "dev": [
             "pytest>=6.0",
             "pytest-cov>=2.0",
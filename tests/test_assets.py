@@ -0,0 +1,90 @@
+import gc
+import os
+import shutil
+import tempfile
+import unittest
+import pygame
+from py2d_game import Py2DEngine, Sprite, AssetRegistry, AssetManifest, AssetPreloader
+
+class TestAssetRegistry(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.engine = Py2DEngine(64, 64, "Assets", headless=True)
+        cls.directory = tempfile.mkdtemp()
+        cls.image_path = os.path.join(cls.directory, "enemy.png")
+        surface = pygame.Surface((8, 4), pygame.SRCALPHA)
+        surface.fill((255, 0, 0, 255))
+        pygame.image.save(surface, cls.image_path)
+        
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.directory)
+        
+    def setUp(self):
+        self.registry = AssetRegistry()
+        self.original_registry = Sprite.asset_registry
+        Sprite.asset_registry = self.registry
+        
+    def tearDown(self):
+        Sprite.asset_registry = self.original_registry
+        
+    def test_decodes_each_path_once(self):
+        sprites = [Sprite(self.image_path) for _ in range(50)]
+        self.assertTrue(all(sprite.image is sprites[0].image for sprite in sprites))
+        stats = self.registry.get_stats()
+        self.assertEqual(stats["loads"], 1)
+        self.assertEqual(stats["references"], 50)
+        self.assertEqual(stats["bytes"], 8 * 4 * sprites[0].image.get_bytesize())
+        
+    def test_unloads_when_unused(self):
+        sprites = [Sprite(self.image_path) for _ in range(3)]
+        sprites[0].create_colored_surface()
+        self.assertEqual(self.registry.get_ref_count(self.image_path), 2)
+        del sprites
+        gc.collect()
+        self.assertFalse(self.registry.is_loaded(self.image_path))
+        self.assertEqual(self.registry.unloads, 1)
+        
+    def test_missing_file_raises(self):
+        with self.assertRaises(FileNotFoundError):
+            Sprite(os.path.join(self.directory, "missing.png"), width=5, height=6)
+        self.assertEqual(self.registry.get_stats()["images"], 0)
+        
+    def test_undecodable_file_falls_back_to_colored_surface(self):
+        path = os.path.join(self.directory, "broken.png")
+        with open(path, "wb") as f:
+            f.write(b"not a png")
+        sprite = Sprite(path, width=5, height=6)
+        self.assertEqual(sprite.image.get_size(), (5, 6))
+        self.assertEqual(self.registry.get_stats()["images"], 0)
+
+    def test_preloader_streams_images_into_registry(self):
+        missing = os.path.join(self.directory, "missing.png")
+        manifest = AssetManifest(images=[self.image_path, missing], sounds={"boom": "boom.wav"})
+        preloader = AssetPreloader(manifest, registry=self.registry,
+                                   audio_manager=self.engine.audio_manager)
+        self.assertEqual(preloader.progress, 0.0)
+        future = preloader.start()
+        self.assertTrue(preloader.wait(timeout=5))
+        self.assertTrue(future.done())
+        self.assertEqual(preloader.progress, 1.0)
+        self.assertIn(missing, preloader.errors)
+        
+        sprite = Sprite(self.image_path)
+        self.assertEqual(self.registry.loads, 0)
+        self.assertEqual(self.registry.get_ref_count(self.image_path), 2)
+        del sprite
+        gc.collect()
+        preloader.release()
+        self.assertFalse(self.registry.is_loaded(self.image_path))
+        
+    def test_manifest_from_file(self):
+        path = os.path.join(self.directory, "level.json")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write('{"images": ["enemy.png"], "sounds": {"jump": "jump.wav"}}')
+        manifest = AssetManifest.from_file(path)
+        self.assertEqual(manifest.images, [self.image_path])
+        self.assertEqual(len(manifest), 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import os
+import shutil
+import tempfile
+import unittest
+import pygame
+from py2d_game import Animation, Vector2, SkylinePacker, TextureAtlas
+
+def make_images(count):
+    images = {}
+    for i in range(count):
+        surface = pygame.Surface((8 + i % 5 * 6, 6 + i % 3 * 9), pygame.SRCALPHA)
+        surface.fill((i * 10 % 256, 100, 200, 255))
+        images[f"image_{i}"] = surface
+    return images
+
+class TestSkylinePacker(unittest.TestCase):
+    def test_rects_do_not_overlap(self):
+        packer = SkylinePacker(128, 128, padding=0)
+        rects = []
+        for i in range(40):
+            position = packer.insert(10 + i % 4, 12 + i % 3)
+            self.assertIsNotNone(position)
+            rects.append(pygame.Rect(position, (10 + i % 4, 12 + i % 3)))
+        for i, rect in enumerate(rects):
+            self.assertTrue(pygame.Rect(0, 0, 128, 128).contains(rect))
+            self.assertEqual(rect.collidelist(rects[i + 1:]), -1)
+            
+    def test_rejects_when_full(self):
+        packer = SkylinePacker(16, 16, padding=0)
+        self.assertEqual(packer.insert(16, 16), (0, 0))
+        self.assertIsNone(packer.insert(1, 1))
+
+class TestTextureAtlas(unittest.TestCase):
+    def setUp(self):
+        self.images = make_images(30)
+        self.atlas = TextureAtlas.build(self.images)
+        
+    def test_regions_hold_original_pixels(self):
+        for name, image in self.images.items():
+            region = self.atlas.get_surface(name)
+            self.assertEqual(region.get_size(), image.get_size())
+            self.assertEqual(region.get_at((0, 0)), image.get_at((0, 0)))
+            self.assertIs(region.get_parent(), self.atlas.surface)
+            
+    def test_sprites_and_animation_frames(self):
+        sprite = self.atlas.get_sprite("image_3")
+        self.assertEqual((sprite.width, sprite.height), self.images["image_3"].get_size())
+        sprite.render(pygame.Surface((64, 64)), Vector2(32, 32), 30)
+        
+        animation = Animation(self.atlas.get_frames(["image_0", "image_1"]))
+        self.assertIs(animation.get_current_frame(), self.atlas.get_surface("image_0"))
+        
+    def test_save_and_load(self):
+        directory = tempfile.mkdtemp()
+        try:
+            self.atlas.save(os.path.join(directory, "sheet.png"))
+            loaded = TextureAtlas.load(os.path.join(directory, "sheet.json"))
+        finally:
+            shutil.rmtree(directory)
+        self.assertEqual(loaded.regions, self.atlas.regions)
+        self.assertEqual(loaded.get_surface("image_7").get_at((1, 1)), self.images["image_7"].get_at((1, 1)))
+        
+    def test_from_files_rejects_duplicate_names(self):
+        directory = tempfile.mkdtemp()
+        try:
+            paths = []
+            for folder in ("player", "enemy"):
+                os.mkdir(os.path.join(directory, folder))
+                paths.append(os.path.join(directory, folder, "idle.png"))
+                pygame.image.save(self.images["image_0"], paths[-1])
+            with self.assertRaises(ValueError):
+                TextureAtlas.from_files(paths)
+            self.assertEqual(list(TextureAtlas.from_files(paths[:1]).regions), ["idle"])
+        finally:
+            shutil.rmtree(directory)
+            
+    def test_too_large(self):
+        with self.assertRaises(ValueError):
+            TextureAtlas.build({"big": pygame.Surface((300, 10))}, max_size=256)
+
+if __name__ == '__main__':
+    unittest.main()
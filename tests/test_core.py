@@ -1,5 +1,13 @@
+import os
 import unittest
-from py2d_game import Py2DEngine, GameObject, Scene, Vector2, Color
+from unittest import mock
+import pygame
+from py2d_game import Py2DEngine, GameObject, Scene, Vector2, Color, Sprite, Shape, Camera, ObjectPool
+from py2d_game.physics import RigidBody2D, Collider2D
+
+# Windowed engines in these tests still need drivers that work without a display or sound card
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
 
 class TestGameObject(unittest.TestCase):
     def setUp(self):
@@ -51,5 +59,476 @@ class TestPy2DEngine(unittest.TestCase):
         self.assertIn("Test Scene", self.engine.scenes)
         self.assertEqual(scene.game_engine, self.engine)
 
+class Mover(GameObject):
+    def __init__(self):
+        super().__init__(0, 0)
+        self.steps = []
+        self.rendered_x = []
+        
+    def update(self, delta_time):
+        super().update(delta_time)
+        self.steps.append(delta_time)
+        self.position.x += 100 * delta_time
+        
+    def render(self, screen, camera):
+        self.rendered_x.append(self.position.x)
+
+class TestFixedTimestep(unittest.TestCase):
+    def setUp(self):
+        self.engine = Py2DEngine(320, 240, "Fixed Step")
+        self.engine.set_fixed_timestep(120, max_substeps=4)
+        self.scene = Scene("Fixed")
+        self.mover = Mover()
+        self.scene.add_object(self.mover)
+        
+    def test_runs_fixed_steps(self):
+        self.engine._update_scene(self.scene, 1 / 40)
+        self.assertEqual(self.mover.steps, [1 / 120] * 3)
+        
+    def test_caps_catch_up_steps(self):
+        self.engine._update_scene(self.scene, 1.0)
+        self.assertEqual(len(self.mover.steps), 4)
+        self.assertLess(self.engine._accumulator, 1 / 120)
+        
+    def test_render_interpolates_between_states(self):
+        self.engine._update_scene(self.scene, 1.5 / 120)
+        self.assertAlmostEqual(self.engine.interpolation_alpha, 0.5)
+        self.engine._render_scene(self.scene)
+        self.assertAlmostEqual(self.mover.rendered_x[-1], 100 / 120 * 0.5)
+        self.assertAlmostEqual(self.mover.position.x, 100 / 120)
+
+class TestHeadlessEngine(unittest.TestCase):
+    def setUp(self):
+        self.engine = Py2DEngine(320, 240, "Headless", headless=True)
+        self.scene = Scene("Simulation")
+        self.mover = Mover()
+        self.scene.add_object(self.mover)
+        self.engine.add_scene(self.scene)
+        self.engine.set_scene("Simulation")
+        
+    def test_no_audio_device(self):
+        self.assertFalse(self.engine.audio_manager.enabled)
+        self.assertFalse(self.engine.audio_manager.is_music_playing())
+        
+    def test_run_for_returns_control(self):
+        frames = self.engine.run_for(30)
+        self.assertEqual(frames, 30)
+        self.assertEqual(self.engine.frame_count, 30)
+        self.assertEqual(self.mover.steps, [1 / 60] * 30)
+        self.assertAlmostEqual(self.mover.position.x, 50)
+        
+    def test_step_with_explicit_delta(self):
+        self.engine.step(0.25)
+        self.assertEqual(self.mover.steps, [0.25])
+        self.assertEqual(self.engine.elapsed_time, 0.25)
+        
+    def test_quit_stops_run_for(self):
+        self.mover.update = lambda delta_time: self.engine.quit()
+        self.assertEqual(self.engine.run_for(10), 1)
+        
+    def test_environment_is_restored(self):
+        with mock.patch.dict(os.environ, {"SDL_VIDEODRIVER": "custom"}):
+            os.environ.pop("SDL_AUDIODRIVER", None)
+            Py2DEngine(64, 64, "Second", headless=True)
+            self.assertEqual(os.environ["SDL_VIDEODRIVER"], "custom")
+            self.assertNotIn("SDL_AUDIODRIVER", os.environ)
+
+class Blinker(GameObject):
+    def __init__(self):
+        super().__init__(0, 0)
+        self.busy = False
+        self.updates = 0
+        
+    def update(self, delta_time):
+        self.updates += 1
+        
+    def has_pending_activity(self):
+        return self.busy
+
+class TestAdaptivePacing(unittest.TestCase):
+    def setUp(self):
+        self.engine = Py2DEngine(320, 240, "Pacing", headless=True)
+        self.scene = Scene("Menu")
+        self.blinker = Blinker()
+        self.scene.add_object(self.blinker)
+        self.engine.add_scene(self.scene)
+        self.engine.set_scene("Menu")
+        self.engine.enable_adaptive_pacing()
+        pygame.event.clear()
+        
+    def test_scene_activity(self):
+        scene = Scene("Static")
+        scene.add_object(GameObject(1, 1))
+        self.assertFalse(scene.has_pending_activity())
+        scene.add_object(Mover())
+        self.assertTrue(scene.has_pending_activity())
+        
+    def test_idle_frames_skip_update(self):
+        self.engine.run_for(5)
+        self.assertEqual(self.blinker.updates, 0)
+        self.assertEqual(self.engine.idle_frames, 5)
+        self.assertTrue(self.engine.idle)
+        
+        self.blinker.busy = True
+        self.engine.run_for(3)
+        self.assertEqual(self.blinker.updates, 3)
+        self.assertFalse(self.engine.idle)
+        
+    def test_input_wakes_engine(self):
+        self.engine.step()
+        pygame.event.post(pygame.event.Event(pygame.MOUSEMOTION, pos=(5, 5), rel=(1, 1), buttons=(0, 0, 0)))
+        self.engine.step()
+        self.assertEqual(self.blinker.updates, 1)
+        self.assertEqual(self.engine.delta_time, 1 / 60)
+        self.engine.step()
+        self.assertEqual(self.blinker.updates, 1)
+        
+    def test_requested_frames(self):
+        self.scene.request_frames(2)
+        self.engine.run_for(4)
+        self.assertEqual(self.blinker.updates, 2)
+        self.assertEqual(self.engine.idle_frames, 2)
+
+class Marker(GameObject):
+    def render(self, screen, camera):
+        pygame.draw.rect(screen, (0, 0, 255), (self.position.x, self.position.y, 4, 4))
+
+class TestBatchedRendering(unittest.TestCase):
+    def build_scene(self):
+        scene = Scene("Batched")
+        scene.camera.position = Vector2(-10, 5)
+        red = Sprite(width=6, height=6, color=Color(255, 0, 0))
+        for i in range(20):
+            obj = GameObject(10 + i * 9, 20)
+            obj.sprite = red if i % 2 else Sprite(width=4, height=8, color=Color(0, 255, i * 10))
+            scene.add_object(obj)
+        rotated = GameObject(60, 60)
+        rotated.sprite = Shape("rectangle", 10, 6, Color(255, 255, 0))
+        rotated.rotation = 30
+        rotated.scale = Vector2(2, 1)
+        rotated.add_child(GameObject(90, 60))
+        rotated.children[0].sprite = red
+        scene.add_object(rotated)
+        scene.add_object(Marker(120, 60))
+        return scene
+        
+    def render(self, scene, batched):
+        screen = pygame.Surface((200, 100))
+        scene.batch_rendering = batched
+        scene.render(screen)
+        return pygame.image.tobytes(screen, "RGB")
+        
+    def test_matches_immediate_rendering(self):
+        scene = self.build_scene()
+        self.assertEqual(self.render(scene, True), self.render(scene, False))
+        
+    def test_layers_draw_in_order(self):
+        scene = Scene("Layers")
+        top = GameObject(10, 10)
+        top.sprite = Sprite(width=8, height=8, color=Color(0, 255, 0))
+        top.layer = 1
+        bottom = GameObject(10, 10)
+        bottom.sprite = Sprite(width=8, height=8, color=Color(255, 0, 0))
+        scene.add_object(top)
+        scene.add_object(bottom)
+        screen = pygame.Surface((20, 20))
+        scene.batch_rendering = True
+        scene.render(screen)
+        self.assertEqual(screen.get_at((10, 10))[:3], (0, 255, 0))
+        
+        layers, immediate = scene.build_render_queue()
+        self.assertEqual([layer for layer, _ in layers], [0, 1])
+        self.assertEqual(immediate, [])
+        
+    def test_overlapping_textures_keep_insertion_order(self):
+        red = Sprite(width=8, height=8, color=Color(255, 0, 0))
+        green = Sprite(width=8, height=8, color=Color(0, 255, 0))
+        # Both orders, so the result can't depend on which surface has the lower address
+        for first, second in ((red, green), (green, red)):
+            scene = Scene("Overlap")
+            for sprite in (first, second, first):
+                obj = GameObject(10, 10)
+                obj.sprite = sprite
+                scene.add_object(obj)
+            self.assertEqual(self.render(scene, True), self.render(scene, False))
+            layers, _ = scene.build_render_queue()
+            self.assertEqual([image for image, _ in layers[0][1]], [first.image, second.image, first.image])
+
+class TestCulling(unittest.TestCase):
+    def build_scene(self):
+        scene = Scene("Culling")
+        red = Sprite(width=10, height=10, color=Color(255, 0, 0))
+        for x in range(-200, 400, 20):
+            for y in range(-200, 400, 20):
+                obj = GameObject(x, y)
+                obj.sprite = red
+                obj.static = (x // 20) % 2 == 0
+                scene.add_object(obj)
+        spinner = GameObject(50, 50)
+        spinner.sprite = Shape("rectangle", 30, 4, Color(0, 255, 0))
+        spinner.rotation = 45
+        scene.add_object(spinner)
+        scene.add_object(Marker(500, 500))
+        return scene
+        
+    def render(self, scene):
+        screen = pygame.Surface((100, 80))
+        scene.render(screen)
+        return pygame.image.tobytes(screen, "RGB")
+        
+    def test_skips_offscreen_objects(self):
+        scene = self.build_scene()
+        expected = self.render(scene)
+        scene.enable_culling(cell_size=None)
+        self.assertEqual(self.render(scene), expected)
+        self.assertLess(scene.render_stats['drawn'], 60)
+        self.assertEqual(scene.render_stats['drawn'] + scene.render_stats['culled'], len(scene.game_objects))
+        
+    def test_spatial_index_matches_linear_scan(self):
+        scene = self.build_scene()
+        for position, zoom, rotation in ((Vector2(0, 0), 1.0, 0), (Vector2(-30, 40), 0.5, 0), (Vector2(100, -20), 2.0, 30)):
+            scene.camera.position = position
+            scene.camera.zoom = zoom
+            scene.camera.rotation = rotation
+            scene.disable_culling()
+            expected = self.render(scene)
+            scene.enable_culling(cell_size=None)
+            linear = scene.get_visible_objects(100, 80)
+            self.assertEqual(self.render(scene), expected)
+            scene.enable_culling(cell_size=64)
+            self.assertEqual(scene.get_visible_objects(100, 80), linear)
+            self.assertEqual(self.render(scene), expected)
+            
+    def test_rotated_elongated_sprite_near_edge(self):
+        # Drawn at x - 50 after rotating to 4 px wide, so it shows up at the right edge
+        scene = Scene("Culling")
+        obj = GameObject(130, 40)
+        obj.sprite = Sprite(width=100, height=4, color=Color(0, 255, 0))
+        obj.rotation = 90
+        scene.add_object(obj)
+        expected = self.render(scene)
+        scene.enable_culling(cell_size=None)
+        self.assertEqual(scene.get_visible_objects(100, 80), [obj])
+        self.assertEqual(self.render(scene), expected)
+        
+        obj.position.x = 160
+        self.assertEqual(scene.get_visible_objects(100, 80), [])
+        
+    def test_custom_renderers_are_never_culled(self):
+        scene = self.build_scene()
+        scene.enable_culling()
+        marker = scene.game_objects[-1]
+        self.assertIn(marker, scene.get_visible_objects(100, 80))
+        
+        scene.remove_object(marker)
+        self.assertNotIn(marker, scene.get_visible_objects(100, 80))
+
+class TestDirtyRendering(unittest.TestCase):
+    def setUp(self):
+        self.scene = Scene("Dirty")
+        self.scene.background_color = Color(10, 20, 30)
+        self.objects = []
+        for i in range(30):
+            obj = GameObject(15 + (i % 6) * 30, 15 + (i // 6) * 30)
+            obj.sprite = Sprite(width=12, height=12, color=Color(200, i * 8, 0))
+            self.scene.add_object(obj)
+            self.objects.append(obj)
+        self.screen = pygame.Surface((200, 160))
+        self.scene.enable_dirty_rendering()
+        self.scene.render(self.screen)
+        
+    def full_render(self):
+        self.scene.dirty_rendering = False
+        screen = pygame.Surface((200, 160))
+        self.scene.render(screen)
+        self.scene.dirty_rendering = True
+        return pygame.image.tobytes(screen, "RGB")
+        
+    def test_only_damaged_regions_redrawn(self):
+        self.assertEqual(self.scene.damaged_rects, [self.screen.get_rect()])
+        self.scene.render(self.screen)
+        self.assertEqual(self.scene.damaged_rects, [])
+        
+        self.objects[7].position.x += 9
+        self.objects[20].visible = False
+        self.scene.render(self.screen)
+        self.assertEqual(len(self.scene.damaged_rects), 2)
+        self.assertLess(sum(r.width * r.height for r in self.scene.damaged_rects), 1000)
+        self.assertEqual(pygame.image.tobytes(self.screen, "RGB"), self.full_render())
+        
+    def test_removed_and_marked_objects(self):
+        self.scene.remove_object(self.objects[0])
+        self.objects[1].sprite.image.fill((0, 0, 255))
+        self.objects[1].mark_dirty()
+        self.scene.render(self.screen)
+        self.assertEqual(len(self.scene.damaged_rects), 2)
+        self.assertEqual(pygame.image.tobytes(self.screen, "RGB"), self.full_render())
+        
+    def test_camera_move_and_custom_render_redraw_everything(self):
+        self.scene.camera.position.x = 5
+        self.scene.render(self.screen)
+        self.assertEqual(self.scene.damaged_rects, [self.screen.get_rect()])
+        
+        self.scene.add_object(Marker(50, 50))
+        self.scene.render(self.screen)
+        self.scene.render(self.screen)
+        self.assertEqual(self.scene.damaged_rects, [self.screen.get_rect()])
+        self.assertEqual(pygame.image.tobytes(self.screen, "RGB"), self.full_render())
+        
+    def test_culled_batched_and_profiled(self):
+        self.scene.enable_culling(64)
+        self.scene.batch_rendering = True
+        profiler = self.scene.enable_object_profiling()
+        self.scene.update(0)
+        self.scene.render(self.screen)
+        self.assertEqual(self.scene.damaged_rects, [])
+        
+        self.objects[3].position.x = 1000
+        self.objects[8].position.x += 9
+        self.scene.update(0)
+        self.scene.render(self.screen)
+        self.assertEqual(self.scene.render_stats, {'drawn': 29, 'culled': 1})
+        self.assertEqual(len(self.scene.damaged_rects), 2)
+        self.assertIsNone(self.objects[3].screen_bounds)
+        names = {row['name'] for row in profiler.get_table()}
+        self.assertIn("Scene.render", names)
+        self.assertIn("GameObject.render", names)
+        
+        self.scene.disable_object_profiling()
+        self.objects[3].position.x = 15 + 3 * 30
+        self.scene.render(self.screen)
+        self.assertEqual(len(self.scene.damaged_rects), 1)
+        self.assertEqual(pygame.image.tobytes(self.screen, "RGB"), self.full_render())
+
+class Shot(GameObject):
+    created = 0
+    
+    def __init__(self, x=0, y=0, speed=0):
+        super().__init__(x, y)
+        self.speed = speed
+        Shot.created += 1
+        
+    def reset(self, x=0, y=0, speed=0):
+        super().reset(x, y)
+        self.speed = speed
+
+class TestObjectPool(unittest.TestCase):
+    def setUp(self):
+        Shot.created = 0
+        self.pool = ObjectPool(Shot, size=4)
+        self.scene = Scene("Pool")
+        
+    def test_preallocates(self):
+        self.assertEqual(Shot.created, 4)
+        self.assertEqual(self.pool.get_stats()['available'], 4)
+        
+    def test_scene_reuses_removed_objects(self):
+        shot = self.scene.spawn(self.pool, 10, 20, speed=5)
+        self.assertEqual((shot.position, shot.speed), (Vector2(10, 20), 5))
+        shot.rotation = 45
+        shot.visible = False
+        self.scene.remove_object(shot)
+        self.scene.remove_object(shot)
+        self.assertEqual(self.pool.in_use, 0)
+        
+        again = self.scene.spawn(self.pool, 1, 2)
+        self.assertIs(again, shot)
+        self.assertEqual((again.position, again.rotation, again.visible, again.speed), (Vector2(1, 2), 0, True, 0))
+        self.assertIn(again, self.scene.game_objects)
+        
+    def test_stats(self):
+        shots = [self.scene.spawn(self.pool) for _ in range(6)]
+        for shot in shots:
+            self.scene.remove_object(shot)
+        self.scene.spawn(self.pool)
+        stats = self.pool.get_stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['created']), (5, 2, 6))
+        self.assertEqual(stats['peak_in_use'], 6)
+        self.assertEqual(stats['in_use'], 1)
+        self.assertAlmostEqual(stats['hit_rate'], 5 / 7)
+        
+    def test_moving_between_scenes(self):
+        other = Scene("Other")
+        shot = self.scene.spawn(self.pool)
+        self.scene.remove_object(shot)
+        other.add_object(shot)
+        self.assertEqual(self.pool.in_use, 1)
+        self.assertNotIn(shot, self.pool.available)
+        
+        fresh = self.scene.spawn(self.pool)
+        self.assertIsNot(fresh, shot)
+        self.assertEqual(self.pool.in_use, 2)
+        other.remove_object(shot)
+        self.assertEqual(self.pool.in_use, 1)
+        
+    def test_reset_restores_fresh_state(self):
+        shot = self.scene.spawn(self.pool)
+        child = GameObject()
+        shot.add_child(child)
+        shot.layer = 3
+        shot.static = True
+        shot.rigid_body = RigidBody2D()
+        shot.rigid_body.set_velocity(Vector2(50, 0))
+        shot.collider = Collider2D(4, 4)
+        shot.collider.tile_position = (100, 100)
+        self.scene.remove_object(shot)
+        
+        again = self.scene.spawn(self.pool)
+        self.assertIs(again, shot)
+        self.assertEqual((again.children, again.layer, again.static), ([], 0, False))
+        self.assertIsNone(child.parent)
+        self.assertEqual(again.rigid_body.velocity, Vector2(0, 0))
+        self.assertIsNone(again.collider.tile_position)
+        
+    def test_reset_keeps_hierarchy_of_unpooled_objects(self):
+        parent = GameObject()
+        obj = GameObject(5, 5)
+        child = GameObject()
+        parent.add_child(obj)
+        obj.add_child(child)
+        obj.layer = 2
+        obj.rotation = 30
+        obj.reset(1, 2)
+        self.assertEqual(obj.children, [child])
+        self.assertIs(child.parent, obj)
+        self.assertIs(obj.parent, parent)
+        self.assertEqual(obj.layer, 2)
+        self.assertEqual((obj.position, obj.rotation), (Vector2(1, 2), 0.0))
+        
+    def test_max_size_and_foreign_objects(self):
+        pool = ObjectPool(Shot, max_size=1)
+        first, second = pool.acquire(), pool.acquire()
+        pool.release(first)
+        pool.release(second)
+        self.assertEqual(pool.available, [first])
+        self.assertIsNone(second.pool)
+        with self.assertRaises(ValueError):
+            pool.release(Shot())
+
+class TestCamera(unittest.TestCase):
+    def test_matrix_matches_vector_math(self):
+        camera = Camera(40, -25, zoom=1.5)
+        camera.rotation = 30
+        for point in (Vector2(0, 0), Vector2(100, 50), Vector2(-7.5, 300)):
+            expected = (point - camera.position).rotate(-camera.rotation) * camera.zoom
+            screen = camera.world_to_screen(point)
+            self.assertEqual(screen, expected)
+            self.assertEqual(camera.screen_to_world(screen), point)
+            
+    def test_matrix_rebuilt_only_on_change(self):
+        camera = Camera(10, 10)
+        for _ in range(5):
+            camera.world_to_screen(Vector2(1, 2))
+        self.assertEqual(camera.matrix_rebuilds, 1)
+        
+        camera.position.x += 5
+        self.assertEqual(camera.world_to_screen(Vector2(15, 10)), Vector2(0, 0))
+        camera.position = Vector2(0, 0)
+        camera.zoom = 2
+        self.assertEqual(camera.world_to_screen(Vector2(3, 4)), Vector2(6, 8))
+        camera.rotation = 90
+        self.assertEqual(camera.world_to_screen(Vector2(3, 4)), Vector2(8, -6))
+        self.assertEqual(camera.matrix_rebuilds, 4)
+
 if __name__ == '__main__':
     unittest.main()
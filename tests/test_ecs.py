@@ -0,0 +1,171 @@
+import unittest
+import pygame
+from py2d_game import (World, System, MovementSystem, SpriteRenderSystem, Scene, GameObject,
+                       Sprite, Color, Camera, Vector2)
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+class Recorder(System):
+    components = ("position",)
+    
+    def __init__(self, name, log, priority=0):
+        super().__init__(priority)
+        self.name = name
+        self.log = log
+        
+    def process(self, archetype, delta_time):
+        self.log.append(self.name)
+
+class Reaper(System):
+    components = ("health",)
+    
+    def process(self, archetype, delta_time):
+        for entity, health in zip(list(archetype.entities), archetype.column("health")):
+            if health <= 0:
+                self.world.destroy_entity(entity)
+                
+    def update(self, world, delta_time):
+        self.world = world
+        super().update(world, delta_time)
+
+class Walker(GameObject):
+    def update(self, delta_time):
+        self.position.x += 10 * delta_time
+
+@unittest.skipIf(numpy is None, "numpy is not installed")
+class TestWorld(unittest.TestCase):
+    def setUp(self):
+        self.world = World(capacity=2)
+        self.world.register_component("health", ("hp",))
+        
+    def test_entities_share_archetype_columns(self):
+        first = self.world.create_entity(position=Vector2(1, 2), velocity=(3, 4))
+        second = self.world.create_entity(position=(5, 6), velocity=(0, 0))
+        self.world.create_entity(position=(7, 8))
+        self.assertEqual(len(self.world.archetypes), 2)
+        
+        archetypes = self.world.query("position", "velocity")
+        self.assertEqual(len(archetypes), 1)
+        self.assertEqual(archetypes[0].entities, [first, second])
+        self.assertEqual(archetypes[0].column("position").tolist(), [[1, 2], [5, 6]])
+        self.assertEqual(archetypes[0].field("velocity", "y").tolist(), [4, 0])
+        self.assertEqual(len(self.world.query("position", exclude=("velocity",))), 1)
+        
+    def test_destroy_keeps_rows_consistent(self):
+        entities = [self.world.create_entity(position=(i, 0), health=i) for i in range(5)]
+        self.assertTrue(self.world.destroy_entity(entities[1]))
+        self.assertFalse(self.world.destroy_entity(entities[1]))
+        self.assertFalse(self.world.is_alive(entities[1]))
+        for entity in entities[2:]:
+            self.assertEqual(self.world.get_component(entity, "health"), entity)
+            self.assertEqual(self.world.get_component(entity, "position")[0], entity)
+        self.assertEqual(self.world.get_stats(), {'entities': 4, 'archetypes': 1, 'systems': 0})
+        
+    def test_adding_and_removing_components_moves_entity(self):
+        entity = self.world.create_entity(position=(1, 1), sprite="ship")
+        self.world.add_component(entity, "health", 3)
+        self.assertTrue(self.world.has_component(entity, "health"))
+        self.assertEqual(self.world.get_component(entity, "sprite"), "ship")
+        self.assertEqual(self.world.get_component(entity, "position").tolist(), [1, 1])
+        
+        self.world.remove_component(entity, "sprite")
+        self.assertFalse(self.world.has_component(entity, "sprite"))
+        self.assertEqual(self.world.get_component(entity, "health"), 3)
+        with self.assertRaises(ValueError):
+            self.world.get_component(entity, "sprite")
+        with self.assertRaises(ValueError):
+            self.world.create_entity(unknown=1)
+            
+    def test_bulk_creation_and_movement(self):
+        entities = self.world.create_entities(1000, position=(0, 0), velocity=(60, -30))
+        self.world.add_system(MovementSystem())
+        for _ in range(60):
+            self.world.update(1 / 60)
+        position = self.world.get_component(entities[999], "position")
+        self.assertAlmostEqual(position[0], 60)
+        self.assertAlmostEqual(position[1], -30)
+        self.assertEqual(len(self.world), 1000)
+        
+    def test_systems_run_by_priority(self):
+        log = []
+        self.world.create_entity(position=(0, 0))
+        self.world.add_system(Recorder("late", log, priority=5))
+        self.world.add_system(Recorder("early", log, priority=-5))
+        self.world.add_system(Recorder("middle", log))
+        self.world.update(0.1)
+        self.assertEqual(log, ["early", "middle", "late"])
+        
+    def test_structural_changes_are_deferred_during_systems(self):
+        self.world.create_entities(10, health=numpy.arange(10.0) - 4)
+        self.world.add_system(Reaper())
+        self.world.update(0.1)
+        remaining = sorted(self.world.query("health")[0].column("health").tolist())
+        self.assertEqual(remaining, [1, 2, 3, 4, 5])
+        
+    def test_sprite_render_system(self):
+        self.world.add_system(SpriteRenderSystem())
+        sprite = Sprite(width=4, height=4, color=Color(255, 0, 0))
+        self.world.create_entities(2, position=numpy.array([[10, 10], [-500, 10]]), sprite=sprite)
+        screen = pygame.Surface((40, 40))
+        self.world.render(screen, Camera())
+        self.assertEqual(screen.get_at((10, 10))[:3], (255, 0, 0))
+        self.assertEqual(screen.get_at((30, 30))[:3], (0, 0, 0))
+
+@unittest.skipIf(numpy is None, "numpy is not installed")
+class TestSceneBridge(unittest.TestCase):
+    def test_game_objects_run_on_world(self):
+        scene = Scene("ECS")
+        walker = Walker(0, 0)
+        scene.add_object(walker)
+        world = scene.enable_ecs()
+        self.assertIsNotNone(walker.entity)
+        
+        # Systems can move GameObjects in bulk alongside their own update()
+        world.add_component(walker.entity, "velocity", (0, 20))
+        world.add_system(MovementSystem())
+        scene.update(0.5)
+        self.assertEqual(walker.position, Vector2(5, 10))
+        
+        other = Walker(0, 0)
+        scene.add_object(other)
+        scene.update(0.5)
+        self.assertEqual(other.position, Vector2(5, 0))
+        self.assertEqual(len(world), 2)
+        
+        scene.remove_object(other)
+        self.assertIsNone(other.entity)
+        self.assertEqual(len(world), 1)
+        scene.disable_ecs()
+        self.assertEqual(len(world), 0)
+        scene.update(0.5)
+        self.assertEqual(walker.position, Vector2(15, 20))
+        
+    def test_dirty_rendering_tracks_system_sprites(self):
+        scene = Scene("ECS")
+        world = scene.enable_ecs()
+        world.add_system(MovementSystem())
+        world.add_system(SpriteRenderSystem())
+        sprite = Sprite(width=4, height=4, color=Color(255, 0, 0))
+        world.create_entity(position=(10, 10), sprite=sprite)
+        mover = world.create_entity(position=(50, 50), velocity=(20, 0), sprite=sprite)
+        scene.enable_dirty_rendering()
+        screen = pygame.Surface((200, 200))
+        scene.render(screen)
+        self.assertEqual(scene.damaged_rects, [screen.get_rect()])
+        
+        scene.render(screen)
+        self.assertEqual(scene.damaged_rects, [])
+        
+        scene.update(0.5)
+        scene.render(screen)
+        self.assertEqual(scene.damaged_rects, [pygame.Rect(48, 48, 4, 4), pygame.Rect(58, 48, 4, 4)])
+        self.assertEqual(screen.get_at((50, 49))[:3], (0, 0, 0))
+        self.assertEqual(screen.get_at((60, 49))[:3], (255, 0, 0))
+        self.assertEqual(screen.get_at((10, 10))[:3], (255, 0, 0))
+        self.assertEqual(world.get_component(mover, "position").tolist(), [60, 50])
+
+if __name__ == '__main__':
+    unittest.main()
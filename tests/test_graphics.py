@@ -0,0 +1,202 @@
+import unittest
+import pygame
+from py2d_game import Sprite, Shape, Color, Vector2, TransformCache, RotationAtlas, TileMap, Camera
+
+class TestTransformCache(unittest.TestCase):
+    def setUp(self):
+        self.surface = pygame.Surface((16, 8), pygame.SRCALPHA)
+        
+    def test_hits_after_first_transform(self):
+        cache = TransformCache()
+        first = cache.get(self.surface, 32, 16, 45)
+        second = cache.get(self.surface, 32, 16, 45.2)
+        self.assertIs(first, second)
+        self.assertEqual(cache.get_stats()["hits"], 1)
+        self.assertEqual(cache.get_stats()["misses"], 1)
+        
+        expected = pygame.transform.rotate(pygame.transform.scale(self.surface, (32, 16)), 45)
+        self.assertEqual(first.get_size(), expected.get_size())
+        
+    def test_evicts_least_recently_used(self):
+        entry_bytes = 32 * 16 * self.surface.get_bytesize()
+        cache = TransformCache(max_bytes=entry_bytes * 2, angle_step=0)
+        a = cache.get(self.surface, 32, 16)
+        cache.get(self.surface, 16, 32)
+        cache.get(self.surface, 32, 16)
+        cache.get(self.surface, 8, 64)
+        stats = cache.get_stats()
+        self.assertEqual(stats["evictions"], 1)
+        self.assertLessEqual(stats["bytes_used"], entry_bytes * 2)
+        self.assertIs(cache.get(self.surface, 32, 16), a)
+        
+    def test_invalidate(self):
+        cache = TransformCache()
+        cache.get(self.surface, 20, 20, 10)
+        cache.invalidate(self.surface)
+        self.assertEqual(cache.get_stats()["entries"], 0)
+        self.assertEqual(cache.bytes_used, 0)
+        
+    def test_sources_are_not_kept_alive(self):
+        cache = TransformCache()
+        surface = pygame.Surface((16, 8))
+        cache.get(surface, 32, 16)
+        cache.get(self.surface, 32, 16)
+        del surface
+        cache.get(self.surface, 32, 16)
+        self.assertEqual(cache.get_stats()["entries"], 1)
+        self.assertEqual(cache.bytes_used, 32 * 16 * self.surface.get_bytesize())
+        
+    def test_edited_sprite_is_retransformed(self):
+        cache = TransformCache()
+        sprite = Sprite(width=10, height=10, color=Color(255, 0, 0))
+        sprite.transform_cache = cache
+        sprite.enable_rotation_atlas(steps=8)
+        screen = pygame.Surface((40, 40))
+        sprite.render(screen, Vector2(20, 20), 0, Vector2(2, 2))
+        sprite.render(screen, Vector2(20, 20), 90)
+        self.assertEqual(screen.get_at((20, 20))[:3], (255, 0, 0))
+        
+        sprite.image.fill((0, 0, 255))
+        sprite.mark_dirty()
+        sprite.render(screen, Vector2(20, 20), 0, Vector2(2, 2))
+        self.assertEqual(screen.get_at((12, 12))[:3], (0, 0, 255))
+        screen.fill((0, 0, 0))
+        sprite.render(screen, Vector2(20, 20), 90)
+        self.assertEqual(screen.get_at((20, 20))[:3], (0, 0, 255))
+        
+        image = pygame.Surface((4, 6))
+        image.fill((0, 255, 0))
+        sprite.set_image(image)
+        self.assertEqual((sprite.width, sprite.height), (4, 6))
+        sprite.render(screen, Vector2(20, 20), 90)
+        self.assertEqual(screen.get_at((20, 20))[:3], (0, 255, 0))
+        
+    def test_sprite_and_shape_render_through_cache(self):
+        cache = TransformCache()
+        screen = pygame.Surface((100, 100))
+        sprite = Sprite(width=10, height=10, color=Color(255, 0, 0))
+        sprite.transform_cache = cache
+        shape = Shape("circle", 10, 10)
+        shape.transform_cache = cache
+        for _ in range(3):
+            sprite.render(screen, Vector2(50, 50), 30, Vector2(2, 2))
+            shape.render(screen, Vector2(50, 50), 30, Vector2(2, 2))
+        self.assertEqual(cache.misses, 2)
+        self.assertEqual(cache.hits, 4)
+
+class TestRotationAtlas(unittest.TestCase):
+    def setUp(self):
+        self.surface = pygame.Surface((12, 6), pygame.SRCALPHA)
+        
+    def test_picks_closest_frame(self):
+        atlas = RotationAtlas(self.surface, steps=8)
+        self.assertEqual(atlas.frame_index(44), 1)
+        self.assertEqual(atlas.frame_index(-45), 7)
+        self.assertEqual(atlas.frame_index(359), 0)
+        self.assertIs(atlas.get_frame(0), self.surface)
+        self.assertEqual(atlas.get_frame(90).get_size(), (6, 12))
+        
+    def test_lazy_and_background_build(self):
+        atlas = RotationAtlas(self.surface, steps=16)
+        atlas.get_frame(45)
+        self.assertEqual(sum(frame is not None for frame in atlas.frames), 2)
+        atlas.build_in_background().join()
+        self.assertTrue(atlas.is_complete)
+        
+    def test_render_during_background_build(self):
+        sprite = Sprite(width=256, height=256)
+        atlas = sprite.enable_rotation_atlas(steps=256, eager=True)
+        screen = pygame.Surface((300, 300))
+        rendered = 0
+        while not atlas.is_complete or rendered == 0:
+            sprite.render(screen, Vector2(150, 150))
+            rendered += 1
+        atlas.build_in_background().join()
+        self.assertGreater(rendered, 1)
+        
+    def test_shared_between_sprites(self):
+        sprite = Sprite(width=10, height=10)
+        other = Sprite(width=10, height=10)
+        other.image = sprite.image
+        atlas = sprite.enable_rotation_atlas(steps=32)
+        self.assertIs(other.enable_rotation_atlas(steps=32), atlas)
+        
+    def test_render_uses_atlas(self):
+        cache = TransformCache()
+        sprite = Sprite(width=10, height=10)
+        sprite.transform_cache = cache
+        atlas = sprite.enable_rotation_atlas(steps=64)
+        screen = pygame.Surface((50, 50))
+        sprite.render(screen, Vector2(25, 25), 90)
+        self.assertIsNotNone(atlas.frames[16])
+        self.assertEqual(cache.misses, 0)
+
+
+class TestTileMap(unittest.TestCase):
+    def setUp(self):
+        self.tilemap = TileMap(8, 8, 40, 30, chunk_size=4)
+        self.tilemap.add_tile_sprite(1, Sprite(width=8, height=8, color=Color(255, 0, 0)))
+        self.tilemap.add_tile_sprite(2, Sprite(width=4, height=4, color=Color(0, 0, 255)))
+        for x in range(40):
+            for y in range(30):
+                self.tilemap.set_tile(x, y, (x + y) % 3)
+        self.camera = Camera(13, 7)
+        
+    def reference(self, size):
+        screen = pygame.Surface(size, pygame.SRCALPHA)
+        for (x, y), tile_id in self.tilemap.tiles.items():
+            sprite = self.tilemap.tile_sprites.get(tile_id)
+            if sprite:
+                sprite.render(screen, Vector2(x * 8 + 4, y * 8 + 4), 0, Vector2(1, 1), self.camera)
+        return pygame.image.tobytes(screen, "RGBA")
+        
+    def render(self, size):
+        screen = pygame.Surface(size, pygame.SRCALPHA)
+        self.tilemap.render(screen, self.camera)
+        return pygame.image.tobytes(screen, "RGBA")
+        
+    def test_chunks_match_per_tile_rendering(self):
+        self.assertEqual(self.render((100, 60)), self.reference((100, 60)))
+        self.assertLessEqual(self.tilemap.get_stats()["cached_chunks"], 12)
+        
+    def test_set_tile_redraws_only_its_chunk(self):
+        self.render((100, 60))
+        redraws = self.tilemap.chunk_redraws
+        self.render((100, 60))
+        self.assertEqual(self.tilemap.chunk_redraws, redraws)
+        
+        self.tilemap.set_tile(3, 3, 2)
+        self.assertEqual(self.tilemap.dirty_chunks, {(0, 0)})
+        self.assertEqual(self.render((100, 60)), self.reference((100, 60)))
+        self.assertEqual(self.tilemap.chunk_redraws, redraws + 1)
+        
+    def test_oversized_tiles_cross_chunk_edges(self):
+        tilemap = TileMap(8, 8, 12, 12, chunk_size=4)
+        tilemap.add_tile_sprite(3, Sprite(width=20, height=13, color=Color(0, 255, 0)))
+        self.assertEqual(tilemap.get_stats()["chunk_padding"], (6, 3))
+        for x, y in ((3, 3), (4, 8), (8, 0), (7, 11)):
+            tilemap.set_tile(x, y, 3)
+        self.tilemap = tilemap
+        self.assertEqual(self.render((100, 90)), self.reference((100, 90)))
+        
+        # Chunks outside the view can still overhang into it
+        self.camera.position = Vector2(33, 20)
+        self.assertEqual(self.render((60, 60)), self.reference((60, 60)))
+        
+    def test_chunk_cache_is_bounded(self):
+        tilemap = TileMap(16, 16, 10000, 10000, max_cached_chunks=8)
+        tilemap.add_tile_sprite(1, Sprite(width=16, height=16, color=Color(0, 255, 0)))
+        tilemap.set_tile(9999, 9999, 1)
+        screen = pygame.Surface((320, 240))
+        camera = Camera(10000 * 16 - 320, 10000 * 16 - 240)
+        tilemap.render(screen, camera)
+        self.assertEqual(screen.get_at((319, 239))[:3], (0, 255, 0))
+        self.assertLessEqual(len(tilemap.chunks), 8)
+        
+        camera.zoom = 0.5
+        camera.rotation = 90
+        tilemap.render(screen, camera)
+        self.assertLessEqual(len(tilemap.chunks), 8)
+
+if __name__ == '__main__':
+    unittest.main()
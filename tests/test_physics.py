@@ -0,0 +1,352 @@
+import random
+import unittest
+from py2d_game import GameObject, Vector2, TileMap, Physics2D, Collider2D, RigidBody2D, BruteForceBroadPhase, SpatialHashBroadPhase, SweepAndPruneBroadPhase
+from py2d_game.physics import collider_bounds_array, aabb_overlaps
+
+def make_colliders(count, seed=1, world=800):
+    rng = random.Random(seed)
+    colliders = []
+    for _ in range(count):
+        obj = GameObject(rng.uniform(0, world), rng.uniform(0, world))
+        collider = Collider2D(rng.uniform(4, 60), rng.uniform(4, 60))
+        collider.game_object = obj
+        colliders.append(collider)
+    return colliders
+
+def colliding_pairs(broad_phase, colliders):
+    pairs = set()
+    for i, j in broad_phase.find_pairs(colliders):
+        c1, c2 = colliders[i], colliders[j]
+        if c1.check_collision(c2, c1.game_object.position, c2.game_object.position):
+            pairs.add((i, j))
+    return pairs
+
+class TestBroadPhase(unittest.TestCase):
+    def test_spatial_hash_matches_brute_force(self):
+        colliders = make_colliders(200)
+        expected = colliding_pairs(BruteForceBroadPhase(), colliders)
+        broad_phase = SpatialHashBroadPhase(cell_size=32)
+        self.assertEqual(colliding_pairs(broad_phase, colliders), expected)
+        
+        rng = random.Random(2)
+        for collider in colliders[::3]:
+            collider.game_object.position.x += rng.uniform(-40, 40)
+        expected = colliding_pairs(BruteForceBroadPhase(), colliders)
+        self.assertEqual(colliding_pairs(broad_phase, colliders), expected)
+        
+    def test_spatial_hash_only_relinks_moved_colliders(self):
+        colliders = make_colliders(50)
+        broad_phase = SpatialHashBroadPhase(cell_size=64)
+        list(broad_phase.find_pairs(colliders))
+        list(broad_phase.find_pairs(colliders))
+        self.assertEqual(broad_phase.relinked_count, 0)
+        
+        colliders[0].game_object.position.x += 1000
+        list(broad_phase.find_pairs(colliders))
+        self.assertEqual(broad_phase.relinked_count, 1)
+        
+    def test_removed_collider_leaves_grid(self):
+        colliders = make_colliders(10)
+        broad_phase = SpatialHashBroadPhase()
+        list(broad_phase.find_pairs(colliders))
+        removed = colliders.pop()
+        list(broad_phase.find_pairs(colliders))
+        self.assertNotIn(removed, broad_phase.grid)
+        
+    def test_sweep_and_prune_matches_brute_force(self):
+        colliders = make_colliders(200)
+        broad_phase = SweepAndPruneBroadPhase()
+        rng = random.Random(3)
+        for _ in range(3):
+            expected = colliding_pairs(BruteForceBroadPhase(), colliders)
+            self.assertEqual(colliding_pairs(broad_phase, colliders), expected)
+            for collider in colliders:
+                collider.game_object.position.x += rng.uniform(-5, 5)
+                
+    def test_sweep_and_prune_keeps_sorted_endpoints(self):
+        colliders = make_colliders(100)
+        broad_phase = SweepAndPruneBroadPhase()
+        broad_phase.find_pairs(colliders)
+        broad_phase.find_pairs(colliders)
+        self.assertEqual(broad_phase.swap_count, 0)
+        values = [endpoint[0] for endpoint in broad_phase.endpoints]
+        self.assertEqual(values, sorted(values))
+        
+        del colliders[10:20]
+        broad_phase.find_pairs(colliders)
+        self.assertEqual(len(broad_phase.endpoints), 2 * len(colliders))
+        
+    def test_physics_broad_phase_selection(self):
+        brute = Physics2D()
+        pruned = Physics2D(broad_phase=SweepAndPruneBroadPhase())
+        for collider in make_colliders(80):
+            brute.add_collider(collider)
+            pruned.add_collider(collider)
+        brute.check_collisions([])
+        pruned.check_collisions([])
+        self.assertEqual(brute.pairs_collided, pruned.pairs_collided)
+        self.assertLess(pruned.pairs_tested, brute.pairs_tested)
+        
+    def test_default_gravity_is_not_shared(self):
+        physics = Physics2D()
+        physics.gravity *= 2
+        self.assertEqual(physics.gravity, Vector2(0, 19.62))
+        self.assertEqual(Physics2D().gravity, Vector2(0, 9.81))
+        
+    def test_collision_stats(self):
+        physics = Physics2D(broad_phase=SpatialHashBroadPhase(cell_size=32))
+        for collider in make_colliders(100):
+            physics.add_collider(collider)
+        physics.check_collisions([])
+        stats = physics.get_collision_stats()
+        self.assertLess(stats["pairs_tested"], 100 * 99 // 2)
+        self.assertLessEqual(stats["pairs_collided"], stats["pairs_tested"])
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+def make_bodies(count, seed=4):
+    rng = random.Random(seed)
+    bodies = []
+    for _ in range(count):
+        body = RigidBody2D(mass=rng.uniform(0.5, 2), gravity_scale=rng.uniform(0, 2))
+        body.velocity = Vector2(rng.uniform(-100, 100), rng.uniform(-100, 100))
+        body.angular_velocity = rng.uniform(-10, 10)
+        body.drag = rng.uniform(0, 1)
+        body.angular_drag = rng.uniform(0, 1)
+        body.is_kinematic = rng.random() < 0.1
+        body.freeze_position_x = rng.random() < 0.2
+        body.freeze_position_y = rng.random() < 0.2
+        bodies.append(body)
+    return bodies
+
+@unittest.skipIf(numpy is None, "numpy is not installed")
+class TestBatchedIntegrator(unittest.TestCase):
+    def test_batched_step_matches_scalar(self):
+        scalar = Physics2D(Vector2(3, 500))
+        batched = Physics2D(Vector2(3, 500), batched=True)
+        scalar_bodies = make_bodies(100)
+        batched_bodies = make_bodies(100)
+        for body in scalar_bodies:
+            scalar.add_rigid_body(body)
+        for body in batched_bodies:
+            batched.add_rigid_body(body)
+            
+        for _ in range(10):
+            scalar.update(1 / 60, [])
+            batched.update(1 / 60, [])
+            
+        for expected, actual in zip(scalar_bodies, batched_bodies):
+            self.assertEqual(expected.velocity.x, actual.velocity.x)
+            self.assertEqual(expected.velocity.y, actual.velocity.y)
+            self.assertEqual(expected.angular_velocity, actual.angular_velocity)
+            
+    def test_body_is_a_view_onto_its_row(self):
+        physics = Physics2D(batched=True)
+        body = RigidBody2D()
+        physics.add_rigid_body(body)
+        body.velocity.x = 5
+        body.add_impulse(Vector2(1, 2))
+        self.assertEqual(physics.body_batch.velocity[body._row].tolist(), [6, 2])
+        
+    def test_unbatched_bodies_use_plain_attributes(self):
+        class Heavy(RigidBody2D):
+            pass
+            
+        self.assertNotIn("velocity", vars(RigidBody2D))
+        physics = Physics2D(batched=True)
+        body = Heavy()
+        physics.add_rigid_body(body)
+        self.assertIsInstance(body, Heavy)
+        body.drag = 0.5
+        physics.remove_rigid_body(body)
+        self.assertIs(type(body), Heavy)
+        self.assertEqual(vars(body)["drag"], 0.5)
+        
+    def test_remove_keeps_other_rows(self):
+        physics = Physics2D(batched=True)
+        bodies = make_bodies(5)
+        velocities = [(body.velocity.x, body.velocity.y) for body in bodies]
+        for body in bodies:
+            physics.add_rigid_body(body)
+        physics.remove_rigid_body(bodies[1])
+        
+        for body, velocity in zip(bodies, velocities):
+            self.assertEqual((body.velocity.x, body.velocity.y), velocity)
+        self.assertIsNone(bodies[1]._batch)
+        self.assertEqual(len(physics.body_batch), 4)
+
+@unittest.skipIf(numpy is None, "numpy is not installed")
+class TestBatchedNarrowPhase(unittest.TestCase):
+    def test_kernel_matches_scalar_path(self):
+        colliders = make_colliders(120, world=-200)
+        for collider in colliders[::4]:
+            collider.offset = Vector2(2.5, -1.5)
+        pairs = [(i, j) for i in range(len(colliders)) for j in range(i + 1, len(colliders))]
+        first = [i for i, _ in pairs]
+        second = [j for _, j in pairs]
+        overlaps, depths, normals = aabb_overlaps(collider_bounds_array(colliders), first, second)
+        
+        for k, (i, j) in enumerate(pairs):
+            c1, c2 = colliders[i], colliders[j]
+            pos1, pos2 = c1.game_object.position, c2.game_object.position
+            self.assertEqual(bool(overlaps[k]), c1.check_collision(c2, pos1, pos2))
+            b1, b2 = c1.get_bounds(pos1), c2.get_bounds(pos2)
+            self.assertEqual(depths[k, 0], min(b1.right, b2.right) - max(b1.left, b2.left))
+            self.assertEqual(depths[k, 1], min(b1.bottom, b2.bottom) - max(b1.top, b2.top))
+            normal = c1.get_collision_normal(c2, pos1, pos2)
+            self.assertEqual((normals[k, 0], normals[k, 1]), (normal.x, normal.y))
+            
+    def test_physics_batched_narrow_phase(self):
+        scalar = Physics2D()
+        batched = Physics2D(batched_narrow_phase=True)
+        for collider in make_colliders(80):
+            scalar.add_collider(collider)
+            batched.add_collider(collider)
+        scalar.check_collisions([])
+        batched.check_collisions([])
+        self.assertEqual(scalar.get_collision_stats(), batched.get_collision_stats())
+        
+    def test_responses_match_with_multiple_contacts(self):
+        # Dense, fast bodies: responses push objects into and out of later contacts
+        def build(physics):
+            rng = random.Random(7)
+            objects = []
+            for _ in range(60):
+                obj = GameObject(rng.uniform(0, 200), rng.uniform(0, 200))
+                obj.rigid_body = RigidBody2D()
+                obj.rigid_body.velocity = Vector2(rng.choice((-100, 100)), rng.uniform(-100, 100))
+                obj.on_ground = False
+                obj.collider = Collider2D(rng.uniform(10, 40), rng.uniform(10, 40))
+                obj.collider.game_object = obj
+                physics.add_collider(obj.collider)
+                objects.append(obj)
+            return objects
+            
+        scalar = Physics2D()
+        batched = Physics2D(batched_narrow_phase=True)
+        scalar_objects = build(scalar)
+        batched_objects = build(batched)
+        for _ in range(3):
+            scalar.check_collisions([])
+            batched.check_collisions([])
+            self.assertEqual(scalar.get_collision_stats(), batched.get_collision_stats())
+        for a, b in zip(scalar_objects, batched_objects):
+            self.assertEqual((a.position.x, a.position.y), (b.position.x, b.position.y))
+            self.assertEqual((a.rigid_body.velocity.x, a.rigid_body.velocity.y),
+                             (b.rigid_body.velocity.x, b.rigid_body.velocity.y))
+
+class Body(GameObject):
+    def __init__(self, x, y, width=16, height=16):
+        super().__init__(x, y)
+        self.rigid_body = RigidBody2D()
+        self.collider = Collider2D(width, height)
+        self.collider.game_object = self
+        self.on_ground = False
+        
+    def update(self, delta_time):
+        self.position += self.rigid_body.velocity * delta_time
+
+class TestTileCollision(unittest.TestCase):
+    def setUp(self):
+        self.tilemap = TileMap(16, 16, 200, 50)
+        for x in range(200):
+            self.tilemap.set_tile(x, 40, 1)
+            self.tilemap.set_tile(x, 41, 1)
+        for y in range(30, 40):
+            self.tilemap.set_tile(150, y, 2)
+        self.physics = Physics2D(Vector2(0, 500))
+        self.layer = self.physics.add_tilemap(self.tilemap)
+        
+    def simulate(self, body, frames):
+        self.physics.add_rigid_body(body.rigid_body)
+        self.physics.add_collider(body.collider)
+        for _ in range(frames):
+            body.update(1 / 60)
+            self.physics.update(1 / 60, [body])
+            
+    def test_adjacent_tiles_merge(self):
+        rects = self.layer.query(0, 0, 200 * 16, 50 * 16)
+        # Seven chunks of floor and a wall split at a chunk row
+        self.assertEqual(len(rects), 9)
+        self.assertIn((0.0, 640.0, 512.0, 672.0), rects)
+        self.assertIn((2400.0, 480.0, 2416.0, 512.0), rects)
+        
+        self.tilemap.set_tile(5, 40, 0)
+        self.assertEqual(len(self.layer.query(0, 600, 512, 700)), 3)
+        
+    def test_body_lands_on_tiles(self):
+        body = Body(100, 500)
+        self.simulate(body, 120)
+        self.assertTrue(body.on_ground)
+        self.assertEqual(body.position.y, 640 - 8)
+        self.assertLess(body.rigid_body.velocity.y, 10)
+        self.assertLess(self.physics.get_collision_stats()["tile_rects_tested"], 4)
+        
+    def test_sliding_does_not_snag_on_seams(self):
+        body = Body(20, 632)
+        body.rigid_body.velocity.x = 300
+        self.simulate(body, 60)
+        self.assertAlmostEqual(body.position.x, 320, places=3)
+        self.assertEqual(body.position.y, 632)
+        
+    def test_wall_stops_body(self):
+        normals = []
+        self.physics.add_tile_collision_callback(lambda collider, normal: normals.append(normal))
+        body = Body(2300, 632)
+        body.rigid_body.velocity.x = 600
+        self.simulate(body, 60)
+        self.assertEqual(body.position.x, 2400 - 8)
+        self.assertEqual(body.rigid_body.velocity.x, 0)
+        self.assertTrue(any(normal.x == -1 for normal in normals))
+        
+        self.physics.remove_tilemap(self.tilemap)
+        self.assertEqual(self.tilemap.change_callbacks, [])
+        
+    def test_fast_body_does_not_tunnel(self):
+        # 100 px per step against a 16 px wall, and 150 px per step into the floor
+        body = Body(2290, 632)
+        body.rigid_body.velocity.x = 6000
+        self.simulate(body, 3)
+        self.assertEqual(body.position.x, 2400 - 8)
+        
+        faller = Body(40, 400)
+        faller.rigid_body.velocity.y = 9000
+        self.simulate(faller, 3)
+        self.assertEqual(faller.position.y, 640 - 8)
+        self.assertTrue(faller.on_ground)
+        
+    def test_resting_on_fractional_floor(self):
+        # The body's bottom ends up a rounding error below the floor's top
+        tilemap = TileMap(16, 16, 20, 10)
+        for x in range(20):
+            tilemap.set_tile(x, 5, 1)
+        physics = Physics2D(Vector2(0, 500))
+        offset = -3.9326297813416478
+        height = 19.277095759732546
+        physics.add_tilemap(tilemap, offset=Vector2(0, offset))
+        body = Body(93.5, 80 + offset - height / 2, 16, height)
+        physics.add_rigid_body(body.rigid_body)
+        physics.add_collider(body.collider)
+        for _ in range(30):
+            body.update(1 / 60)
+            physics.update(1 / 60, [body])
+        self.assertEqual(body.position.x, 93.5)
+        self.assertAlmostEqual(body.position.y + height / 2, 80 + offset)
+        self.assertTrue(body.on_ground)
+        
+    def test_teleport_across_wall(self):
+        body = Body(2500, 632)
+        body.rigid_body.velocity.x = 60
+        self.simulate(body, 2)
+        body.position.x = 2300
+        body.collider.reset_tile_position()
+        for _ in range(2):
+            body.update(1 / 60)
+            self.physics.update(1 / 60, [body])
+        self.assertAlmostEqual(body.position.x, 2302)
+
+if __name__ == '__main__':
+    unittest.main()
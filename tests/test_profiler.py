@@ -0,0 +1,125 @@
+import json
+import os
+import tempfile
+import unittest
+import pygame
+from py2d_game import Py2DEngine, Scene, GameObject, FrameProfiler
+
+class Bullet(GameObject):
+    pass
+
+class Enemy(GameObject):
+    def update(self, delta_time):
+        super().update(delta_time)
+        sum(range(2000))
+
+class TestFrameProfiler(unittest.TestCase):
+    def test_percentiles(self):
+        profiler = FrameProfiler(window=100)
+        for i in range(1, 101):
+            profiler.record_frame({"update": i / 1000.0})
+        stats = profiler.get_stats()["update"]
+        self.assertAlmostEqual(stats["p50_ms"], 51)
+        self.assertAlmostEqual(stats["p95_ms"], 95)
+        self.assertAlmostEqual(stats["p99_ms"], 99)
+        self.assertEqual(stats["samples"], 100)
+        self.assertAlmostEqual(profiler.percentile("update", 95) * 1000.0, stats["p95_ms"])
+        self.assertEqual(profiler.percentile("missing", 50), 0.0)
+        
+    def test_rolling_window(self):
+        profiler = FrameProfiler(window=10)
+        for _ in range(50):
+            profiler.record_frame({"render": 0.002})
+        self.assertEqual(profiler.get_stats()["render"]["samples"], 10)
+        self.assertEqual(profiler.frames_recorded, 50)
+
+class TestEngineProfiling(unittest.TestCase):
+    def setUp(self):
+        self.engine = Py2DEngine(320, 240, "Profiled", headless=True)
+        scene = Scene("Main")
+        scene.add_object(GameObject(10, 10))
+        self.engine.add_scene(scene)
+        self.engine.set_scene("Main")
+        
+    def test_disabled_by_default(self):
+        self.engine.run_for(5)
+        self.assertIsNone(self.engine.profiler)
+        self.assertEqual(self.engine.get_frame_stats(), {})
+        
+    def test_records_engine_phases(self):
+        self.engine.enable_profiler(window=60, overlay=True)
+        self.engine.run_for(20)
+        stats = self.engine.get_frame_stats()
+        for phase in ("events", "input", "update", "render", "flip", "frame"):
+            self.assertEqual(stats[phase]["samples"], 20)
+
+class TestObjectProfiling(unittest.TestCase):
+    def setUp(self):
+        self.scene = Scene("Main")
+        for i in range(5):
+            self.scene.add_object(Bullet(i, 0))
+        self.scene.add_object(Enemy(0, 0))
+        self.screen = pygame.Surface((64, 64))
+        
+    def run_frames(self, count):
+        for _ in range(count):
+            self.scene.update(1 / 60)
+            self.scene.render(self.screen)
+            
+    def test_attributes_time_per_class(self):
+        profiler = self.scene.enable_object_profiling()
+        self.run_frames(3)
+        rows = {row["name"]: row for row in profiler.get_table()}
+        self.assertEqual(rows["Bullet.update"]["calls"], 15)
+        self.assertEqual(rows["Enemy.update"]["calls"], 3)
+        self.assertEqual(rows["Bullet.render"]["calls"], 15)
+        self.assertEqual(rows["Scene.render"]["calls"], 3)
+        
+        by_calls = profiler.get_table(sort_by="calls")
+        self.assertEqual(by_calls[0]["calls"], 15)
+        self.assertIn("Enemy.update", profiler.format_table())
+        with self.assertRaises(ValueError):
+            profiler.get_table(sort_by="bogus")
+            
+    def test_sampling_interval(self):
+        profiler = self.scene.enable_object_profiling(sample_every=4)
+        self.run_frames(8)
+        self.assertEqual(profiler.frames_sampled, 2)
+        self.assertEqual(profiler.get_table(sort_by="name", descending=False)[0]["name"], "Bullet.render")
+        
+    def test_substeps_share_the_frame_decision(self):
+        engine = Py2DEngine(64, 64, "Substeps", headless=True)
+        engine.add_scene(self.scene)
+        engine.set_scene("Main")
+        engine.set_fixed_timestep(120)
+        profiler = self.scene.enable_object_profiling(sample_every=2)
+        engine.run_for(4, 1 / 60)
+        self.assertEqual(profiler.frames_seen, 4)
+        self.assertEqual(profiler.frames_sampled, 2)
+        self.assertEqual(profiler.updates_sampled, 4)
+        rows = {row["name"]: row for row in profiler.get_table()}
+        self.assertEqual(rows["Bullet.update"]["calls"], 20)
+        self.assertEqual(rows["Bullet.render"]["calls"], 10)
+        
+        engine.render_enabled = False
+        engine.run_for(4, 1 / 60)
+        self.assertEqual(profiler.frames_seen, 8)
+        self.assertEqual(profiler.updates_sampled, 8)
+        
+    def test_chrome_trace_export(self):
+        profiler = self.scene.enable_object_profiling()
+        self.run_frames(2)
+        fd, path = tempfile.mkstemp(suffix=".json")
+        os.close(fd)
+        try:
+            profiler.export_chrome_trace(path)
+            with open(path, encoding="utf-8") as f:
+                trace = json.load(f)
+        finally:
+            os.remove(path)
+        events = trace["traceEvents"]
+        self.assertEqual(len(events), 2 * (6 + 6 + 2))
+        self.assertTrue(all(event["ph"] == "X" and event["dur"] >= 0 for event in events))
+
+if __name__ == '__main__':
+    unittest.main()
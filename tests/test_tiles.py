@@ -0,0 +1,82 @@
+import os
+import shutil
+import tempfile
+import unittest
+import pygame
+from py2d_game import (TileMap, Sprite, Color, Camera, DictTileStorage, DenseTileStorage,
+                       ChunkedTileStorage, MemoryMappedTileStorage)
+
+class TestTileStorage(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+        
+    def check_storage(self, storage):
+        storage.set_tile(0, 0, 7)
+        storage.set_tile(99, 49, 65535)
+        storage[(10, 20)] = 3
+        storage.set_tile(100, 0, 5)
+        self.assertEqual(storage.get_tile(0, 0), 7)
+        self.assertEqual(storage.get_tile(99, 49), 65535)
+        self.assertEqual(storage.get((10, 20), 0), 3)
+        self.assertEqual(storage.get_tile(100, 0), 0)
+        self.assertEqual(storage.get_tile(-1, 0), 0)
+        self.assertEqual(sorted(storage.items()), [((0, 0), 7), ((10, 20), 3), ((99, 49), 65535)])
+        
+    def test_backends_store_tiles(self):
+        self.check_storage(DenseTileStorage(100, 50))
+        self.check_storage(ChunkedTileStorage(100, 50, chunk_size=16))
+        with MemoryMappedTileStorage.create(os.path.join(self.directory, "map.tiles"), 100, 50) as storage:
+            self.check_storage(storage)
+            
+    def test_chunked_storage_frees_empty_chunks(self):
+        storage = ChunkedTileStorage(10000, 10000, chunk_size=32)
+        storage.set_tile(5000, 5000, 1)
+        storage.set_tile(5001, 5000, 2)
+        self.assertEqual(len(storage.chunks), 1)
+        self.assertEqual(len(storage), 2)
+        storage.set_tile(5000, 5000, 0)
+        storage.set_tile(5001, 5000, 0)
+        self.assertEqual(storage.chunks, {})
+        self.assertEqual(storage.get_memory_usage(), 0)
+        
+    def test_memory_mapped_round_trip(self):
+        path = os.path.join(self.directory, "world.tiles")
+        dense = DenseTileStorage(300, 200)
+        dense.set_tile(299, 199, 42)
+        dense.set_tile(1, 2, 9)
+        MemoryMappedTileStorage.from_storage(dense, path).close()
+        
+        with MemoryMappedTileStorage(path, writable=False) as storage:
+            self.assertEqual((storage.width, storage.height), (300, 200))
+            self.assertEqual(storage.get_tile(299, 199), 42)
+            self.assertEqual(storage.get_tile(1, 2), 9)
+            self.assertEqual(storage.as_array()[2, 1], 9)
+            
+    def test_rejects_other_files(self):
+        path = os.path.join(self.directory, "bad.tiles")
+        with open(path, "wb") as file:
+            file.write(b"not a map at all")
+        with self.assertRaises(ValueError):
+            MemoryMappedTileStorage(path)
+            
+    def test_tilemap_renders_from_any_backend(self):
+        screens = []
+        for storage in (DictTileStorage(), DenseTileStorage(40, 30), ChunkedTileStorage(40, 30, chunk_size=8)):
+            tilemap = TileMap(8, 8, 40, 30, storage=storage)
+            tilemap.add_tile_sprite(1, Sprite(width=8, height=8, color=Color(255, 0, 0)))
+            tilemap.add_tile_sprite(2, Sprite(width=8, height=8, color=Color(0, 0, 255)))
+            for x in range(0, 40, 3):
+                for y in range(30):
+                    tilemap.set_tile(x, y, 1 + (x + y) % 2)
+            self.assertEqual(tilemap.get_tile(3, 1), 1)
+            screen = pygame.Surface((160, 120))
+            tilemap.render(screen, Camera(5, 5))
+            screens.append(pygame.image.tobytes(screen, "RGB"))
+        self.assertEqual(screens[0], screens[1])
+        self.assertEqual(screens[0], screens[2])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+import unittest
+from py2d_game import Vector2, Vector2Array, Camera, RigidBody2D, RigidBodyBatch, GameObject
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+class TestVector2(unittest.TestCase):
+    def test_slots(self):
+        vector = Vector2(1, 2)
+        with self.assertRaises(AttributeError):
+            vector.z = 3
+            
+    def test_in_place_operators_keep_identity(self):
+        vector = Vector2(1, 2)
+        original = vector
+        vector += Vector2(2, 3)
+        vector -= Vector2(1, 1)
+        vector *= 4
+        vector /= 2
+        self.assertIs(vector, original)
+        self.assertEqual(vector, Vector2(4, 8))
+        
+    def test_add_scaled(self):
+        position = Vector2(10, 10)
+        self.assertIs(position.add_scaled(Vector2(1, -2), 0.5), position)
+        self.assertEqual(position, Vector2(10.5, 9))
+        self.assertEqual(position.copy().set(1, 2), Vector2(1, 2))
+        self.assertEqual(position, Vector2(10.5, 9))
+        self.assertAlmostEqual(Vector2(0, 0).distance_to(Vector2(3, 4)), 5)
+        
+    def test_camera_matches_vector_operators(self):
+        camera = Camera(30, -20, zoom=1.5)
+        camera.rotation = 37
+        point = Vector2(123, 45)
+        expected = (point - camera.position).rotate(-camera.rotation) * camera.zoom
+        self.assertEqual(camera.world_to_screen(point), expected)
+        self.assertEqual(camera.screen_to_world(expected), point)
+        
+    def test_set_velocity_copies(self):
+        body = RigidBody2D()
+        velocity = Vector2(3, 4)
+        body.set_velocity(velocity)
+        body.velocity *= 2
+        self.assertEqual(velocity, Vector2(3, 4))
+        self.assertEqual(body.velocity, Vector2(6, 8))
+
+@unittest.skipIf(numpy is None, "numpy is not installed")
+class TestVector2Array(unittest.TestCase):
+    def setUp(self):
+        self.vectors = [Vector2(3, 4), Vector2(-1, 2), Vector2(0, 0), Vector2(5, -7)]
+        self.array = Vector2Array(self.vectors)
+        
+    def assertMatches(self, array, vectors):
+        self.assertEqual(len(array), len(vectors))
+        for actual, expected in zip(array, vectors):
+            self.assertEqual(actual, expected)
+            
+    def test_matches_vector2(self):
+        other = Vector2(2, -3)
+        self.assertMatches(self.array + other, [v + other for v in self.vectors])
+        self.assertMatches(self.array - self.array, [Vector2(0, 0)] * 4)
+        self.assertMatches(self.array * 2.5, [v * 2.5 for v in self.vectors])
+        self.assertMatches(self.array.rotate(30), [v.rotate(30) for v in self.vectors])
+        self.assertMatches(self.array.normalized(), [v.normalized() for v in self.vectors])
+        numpy.testing.assert_allclose(self.array.magnitude(), [v.magnitude() for v in self.vectors])
+        numpy.testing.assert_allclose(self.array.dot(other), [v.dot(other) for v in self.vectors])
+        numpy.testing.assert_allclose(self.array.distance_to(other), [v.distance_to(other) for v in self.vectors])
+        
+    def test_per_element_scalars_and_in_place(self):
+        data = self.array.data
+        self.array.add_scaled(Vector2(1, 1), numpy.array([1.0, 2.0, 3.0, 4.0]))
+        self.array *= 2
+        self.assertIs(self.array.data, data)
+        self.assertEqual(self.array[3], Vector2(18, -6))
+        
+    def test_zero_copy_views(self):
+        raw = numpy.asarray(self.array)
+        self.assertIs(raw, self.array.data)
+        view = self.array[1:3]
+        view.x[:] = 9
+        self.assertEqual(self.array[1], Vector2(9, 2))
+        self.assertEqual(self.array[0], Vector2(3, 4))
+        
+    def test_batch_velocity_view(self):
+        batch = RigidBodyBatch()
+        bodies = [RigidBody2D() for _ in range(3)]
+        for body in bodies:
+            batch.add(body)
+        velocities = batch.velocity_array()
+        velocities += Vector2(1, -2)
+        self.assertEqual(bodies[2].velocity, Vector2(1, -2))
+        
+    def test_positions_and_camera(self):
+        objects = [GameObject(v.x, v.y) for v in self.vectors]
+        positions = Vector2Array.from_positions(objects)
+        positions.add_scaled(Vector2(10, 0), 0.5)
+        positions.write_positions(objects)
+        self.assertEqual(objects[1].position, Vector2(4, 2))
+        
+        camera = Camera(5, 5, zoom=2)
+        camera.rotation = 20
+        self.assertMatches(camera.world_to_screen_array(positions),
+                           [camera.world_to_screen(obj.position) for obj in objects])
+        self.assertMatches(camera.world_to_screen_array(positions.data),
+                           [camera.world_to_screen(obj.position) for obj in objects])
+
+if __name__ == '__main__':
+    unittest.main()